@@ -5,16 +5,19 @@ Main entry point for the application.
 import os
 from flask import Flask, redirect, url_for
 from config import config
-from extensions import db, login_manager, init_extensions
+from extensions import db, login_manager, csrf, init_extensions
 
 
-def create_app(config_name=None):
+def create_app(config_name=None, serve=True):
     """
     Application factory pattern.
     Creates and configures the Flask application.
 
     Args:
         config_name: Configuration to use ('development', 'production', 'testing')
+        serve: Set up everything needed to serve requests. Maintenance tools
+            (manage.py) pass False to skip the route modules, error pages,
+            CLI registration and Flask-Migrate, and start much faster.
 
     Returns:
         Configured Flask application instance
@@ -29,7 +32,7 @@ def create_app(config_name=None):
     app.config.from_object(config[config_name])
 
     # Initialize extensions
-    init_extensions(app)
+    init_extensions(app, migrations=serve)
 
     # Register Flask-Login user loader
     from models.user import User
@@ -39,6 +42,20 @@ def create_app(config_name=None):
         """Load user by ID for Flask-Login."""
         return User.query.get(int(user_id))
 
+    if not serve:
+        return app
+
+    # Behind PROXY_HOPS reverse proxies, take the client address, scheme and
+    # host from their X-Forwarded-* headers (rate limits key on the address)
+    if app.config['PROXY_HOPS']:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        hops = app.config['PROXY_HOPS']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops, x_host=hops)
+
+    # Send the reads of GET requests to the replica, if configured
+    from services.replica import init_replica
+    init_replica(app)
+
     # Register blueprints
     register_blueprints(app)
 
@@ -48,6 +65,10 @@ def create_app(config_name=None):
     # Register context processors
     register_context_processors(app)
 
+    # Register CLI commands
+    from commands import register_commands
+    register_commands(app)
+
     # Create upload directory if it doesn't exist
     upload_folder = app.config.get('UPLOAD_FOLDER')
     if upload_folder and not os.path.exists(upload_folder):
@@ -68,6 +89,7 @@ def register_blueprints(app):
     from routes.curator import curator_bp
     from routes.admin import admin_bp
     from routes.api import api_bp
+    from routes.residuos import residuos_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(producer_bp)
@@ -75,6 +97,10 @@ def register_blueprints(app):
     app.register_blueprint(admin_bp)
     app.register_blueprint(api_bp)
 
+    # JWT API: bearer tokens, not session cookies, so no CSRF token
+    csrf.exempt(residuos_bp)
+    app.register_blueprint(residuos_bp)
+
     # Root route - redirect to login
     @app.route('/')
     def index():
@@ -120,10 +146,17 @@ def register_context_processors(app):
         }
 
 
-# Create application instance
-app = create_app()
+def __getattr__(name):
+    """
+    Build the module-level `app` on first access (`app:app` for WSGI servers,
+    `flask` CLI discovery), so importing create_app does not build an app.
+    """
+    if name == 'app':
+        globals()['app'] = create_app()
+        return globals()['app']
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 if __name__ == '__main__':
     # Run development server (localhost only for security)
-    app.run(host='127.0.0.1', port=5000, debug=True)
+    create_app().run(host='127.0.0.1', port=5000, debug=True)
@@ -0,0 +1,56 @@
+"""
+Commands package initialization.
+Flask CLI commands for maintenance tasks, run as `flask <group> <command>`,
+or as `python manage.py <group> <command>` without loading the web app.
+"""
+import importlib
+import click
+
+# Command group name -> 'module:attribute' defining it
+COMMAND_GROUPS = {
+    'archive': 'commands.archive:archive_cli',
+    'bench': 'commands.bench:bench_cli',
+    'changes': 'commands.changes:changes_cli',
+    'export': 'commands.exports:export_cli',
+    'idempotency': 'commands.idempotency:idempotency_cli',
+    'import': 'commands.imports:import_cli',
+    'inspect': 'commands.inspect:inspect_cli',
+    'jobs': 'commands.jobs:jobs_cli',
+    'notifications': 'commands.notifications:notifications_cli',
+    'photos': 'commands.photos:photos_cli',
+    'points': 'commands.points:points_cli',
+    'quantities': 'commands.quantities:quantities_cli',
+    'ratelimit': 'commands.rate_limit:ratelimit_cli',
+    'replica': 'commands.replica:replica_cli',
+    'rollups': 'commands.rollups:rollups_cli',
+    'schema': 'commands.schema:schema_cli',
+    'seed': 'commands.seed:seed_cli',
+    'spaces': 'commands.spaces:spaces_cli',
+}
+
+
+def load_group(name):
+    """Import and return a command group by name."""
+    module, attribute = COMMAND_GROUPS[name].split(':')
+    return getattr(importlib.import_module(module), attribute)
+
+
+class LazyGroup(click.Group):
+    """Command group that imports a group's module only when it is used."""
+
+    def list_commands(self, ctx):
+        return sorted(COMMAND_GROUPS)
+
+    def get_command(self, ctx, name):
+        return load_group(name) if name in COMMAND_GROUPS else None
+
+
+def register_commands(app):
+    """
+    Register all CLI command groups.
+
+    Args:
+        app: Flask application instance
+    """
+    for name in COMMAND_GROUPS:
+        app.cli.add_command(load_group(name))
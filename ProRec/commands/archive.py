@@ -0,0 +1,34 @@
+"""
+Archive commands - Moving old rows out of the hot tables.
+"""
+from datetime import timedelta
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from services.archive import BATCH_SIZE, archive, archive_stats
+
+archive_cli = AppGroup('archive', help='Hot/cold archive commands.')
+
+
+@archive_cli.command('run')
+@click.option('--older-than-days', type=int,
+              help='Archive rows older than this (default: ARCHIVE_AFTER_DAYS).')
+@click.option('--batch-size', default=BATCH_SIZE, show_default=True,
+              help='Rows moved per transaction.')
+def run(older_than_days, batch_size):
+    """Move reviewed materials, collections and read notifications to the archive."""
+    days = older_than_days or current_app.config['ARCHIVE_AFTER_DAYS']
+    try:
+        moved = archive(timedelta(days=days), batch_size)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    for name, count in moved.items():
+        click.echo(f'{name}: {count} row(s) archived')
+
+
+@archive_cli.command('stats')
+def stats():
+    """Show hot and archived row counts per table."""
+    for name, row in archive_stats().items():
+        click.echo(f'{name}: {row["hot"]} hot, {row["archived"]} archived, '
+                   f'watermark {row["watermark"] or "-"}')
@@ -0,0 +1,227 @@
+"""
+Benchmark commands - Per-row cost of the list serializers, the startup
+cost of maintenance commands and the throughput of the web server.
+"""
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+import tracemalloc
+from datetime import datetime, timedelta
+import click
+from flask.cli import AppGroup
+from extensions import db
+from models.user import User, TipoUsuario, StatusUsuario
+from models.material import Material, StatusMaterial
+from models.achievement import Collection
+from models.space import Space
+from models.event import Event
+from serializers import MATERIAL_ROWS, COLLECTION_ROWS, SPACE_ROWS, EVENT_ROWS, USER_ROWS
+
+bench_cli = AppGroup('bench', help='Performance benchmarks.')
+
+# Import time allowed for `python manage.py` to build its app, in ms under
+# `-X importtime` (which adds its own overhead); measured at ~500 ms
+STARTUP_BUDGET_MS = 650
+
+# Modules the maintenance app must not import
+STARTUP_FORBIDDEN = ('routes', 'flask_migrate', 'alembic')
+
+_STARTUP_SCRIPT = 'import manage; manage.create_tooling_app()'
+
+CASES = (
+    ('Material', Material, MATERIAL_ROWS),
+    ('Event', Event, EVENT_ROWS),
+    ('Space', Space, SPACE_ROWS),
+    ('Collection', Collection, COLLECTION_ROWS),
+    ('User', User, USER_ROWS),
+)
+
+
+def _seed(rows):
+    """Add `rows` synthetic rows of every benchmarked model (never committed)."""
+    now = datetime.utcnow()
+    users = []
+    for i in range(rows):
+        user = User(username=f'bench{i}@bench', email=f'bench{i}@bench', first_name='Bench',
+                    last_name=str(i), password_hash='-', tipo=TipoUsuario.PRODUCER.value,
+                    status=StatusUsuario.ATIVO.value, pontos=i)
+        users.append(user)
+    db.session.add_all(users)
+    db.session.flush()
+
+    spaces = [Space(nome=f'Bench {i}', endereco='Rua', horario='Seg-Sex: 8h-18h')
+              for i in range(rows)]
+    db.session.add_all(spaces)
+    db.session.flush()
+
+    for i in range(rows):
+        db.session.add(Material(nome=f'Bench {i}', categoria='papel', descricao='d',
+                                localizacao='l', quantidade='5 kg', produtor_id=users[i].id,
+                                status=StatusMaterial.APPROVED.value, revisado_em=now))
+        db.session.add(Collection(material_nome=f'Bench {i}', categoria='vidro',
+                                  quantidade='10 unidades', pontos=i, produtor_id=users[i].id))
+        db.session.add(Event(titulo=f'Bench {i}', tipo='coleta',
+                             data_inicio=now + timedelta(days=i % 30),
+                             espaco_id=spaces[i].id if i % 2 else None))
+    db.session.flush()
+
+
+def _measure(fn, repeat):
+    """Best wall time of `repeat` runs, and peak allocated bytes of one run."""
+    best = float('inf')
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+
+    db.session.expunge_all()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+@bench_cli.command('serializers')
+@click.option('--rows', default=2000, show_default=True, help='Synthetic rows per model.')
+@click.option('--repeat', default=5, show_default=True, help='Timed runs per path (best kept).')
+def serializers(rows, repeat):
+    """Compare ORM to_dict() with the row serializers (all data is rolled back)."""
+    try:
+        _seed(rows)
+        click.echo(f'{"model":<11} {"path":<10} {"us/row":>8} {"peak B/row":>11}')
+        for name, model, serializer in CASES:
+            query = model.query.order_by(model.id)
+            count = query.count()
+
+            orm, orm_time, orm_peak = _measure(
+                lambda: [obj.to_dict() for obj in query.all()], repeat)
+            rows_out, row_time, row_peak = _measure(lambda: serializer.all(query), repeat)
+
+            for path, elapsed, peak in (('to_dict', orm_time, orm_peak),
+                                        ('rows', row_time, row_peak)):
+                click.echo(f'{name:<11} {path:<10} {elapsed / count * 1e6:>8.1f} '
+                           f'{peak / count:>11.0f}')
+
+            identical = json.dumps(orm, sort_keys=True) == json.dumps(rows_out, sort_keys=True)
+            click.echo(f'{name:<11} output {"identical" if identical else "DIFFERS"}, '
+                       f'{orm_time / row_time:.1f}x faster')
+    finally:
+        db.session.rollback()
+
+
+def _import_times(stderr):
+    """(cumulative us, module) of each top-level import in `-X importtime` output."""
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if cumulative.strip().isdigit() and not name[1:].startswith(' '):
+            times.append((int(cumulative), name.strip()))
+    return times
+
+
+@bench_cli.command('startup', with_appcontext=False)
+@click.option('--top', default=10, show_default=True, help='Slowest imports listed.')
+def startup(top):
+    """Check the import time of the maintenance app against its budget."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', _STARTUP_SCRIPT],
+                            cwd=root, capture_output=True, text=True)
+    if result.returncode:
+        raise click.ClickException(result.stderr.strip().splitlines()[-1])
+
+    lines = result.stderr.splitlines()
+    times = _import_times(result.stderr)
+    total_ms = sum(cumulative for cumulative, _ in times) / 1000
+    for cumulative, name in sorted(times, reverse=True)[:top]:
+        click.echo(f'{cumulative / 1000:>8.1f} ms  {name}')
+
+    imported = {line.split('|')[-1].strip() for line in lines if line.startswith('import time:')}
+    forbidden = sorted(name for name in imported
+                       if name.split('.')[0] in STARTUP_FORBIDDEN)
+    click.echo(f'total {total_ms:.1f} ms (budget {STARTUP_BUDGET_MS} ms)')
+    if forbidden:
+        raise click.ClickException(f'Imported at startup: {", ".join(forbidden)}')
+    if total_ms > STARTUP_BUDGET_MS:
+        raise click.ClickException('Startup over budget')
+
+
+def _load(url, paths, headers, deadline, results):
+    """One client: keep-alive requests cycling over `paths` until the deadline."""
+    parts = urlsplit(url)
+    connection = None
+    latencies, errors, statuses = [], 0, {}
+    n = 0
+    while time.monotonic() < deadline:
+        path = paths[n % len(paths)]
+        n += 1
+        start = time.perf_counter()
+        try:
+            if connection is None:
+                connection = http.client.HTTPConnection(parts.hostname, parts.port or 80,
+                                                        timeout=30)
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection = None
+            continue
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+        if response.will_close:
+            connection = None
+    results.append((latencies, errors, statuses))
+
+
+@bench_cli.command('http', with_appcontext=False)
+@click.option('--url', default='http://127.0.0.1:8000', show_default=True,
+              help='Server to load (e.g. gunicorn -c gunicorn.conf.py wsgi:application).')
+@click.option('--path', 'paths', multiple=True, default=('/api/status',), show_default=True,
+              help='Path requested (repeatable; clients cycle over them).')
+@click.option('--header', '-H', 'headers', multiple=True,
+              help='Request header, e.g. "Cookie: session=..." (repeatable).')
+@click.option('--concurrency', '-c', default=16, show_default=True, help='Concurrent clients.')
+@click.option('--duration', '-d', default=10.0, show_default=True, help='Seconds of load.')
+@click.option('--cores', default=1, show_default=True,
+              help='CPU cores the server runs on; throughput is also reported per core.')
+def http_load(url, paths, headers, concurrency, duration, cores):
+    """Measure requests per second (and per core) of a running server."""
+    sent = dict(header.split(':', 1) for header in headers)
+    sent = {name.strip(): value.strip() for name, value in sent.items()}
+    results = []
+    deadline = time.monotonic() + duration
+    clients = [threading.Thread(target=_load, args=(url, paths, sent, deadline, results))
+               for _ in range(concurrency)]
+    start = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    errors = sum(result[1] for result in results)
+    statuses = {}
+    for result in results:
+        for status, count in result[2].items():
+            statuses[status] = statuses.get(status, 0) + count
+    if not latencies:
+        raise click.ClickException(f'No responses from {url} ({errors} errors)')
+
+    rps = len(latencies) / elapsed
+    click.echo(f'{len(latencies)} responses in {elapsed:.1f} s, {errors} errors, '
+               f'status {", ".join(f"{status}: {count}" for status, count in sorted(statuses.items()))}')
+    click.echo(f'{rps:.0f} req/s, {rps / cores:.0f} req/s per core ({cores} cores)')
+    click.echo('latency ms: ' + ', '.join(
+        f'p{p} {latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000:.1f}'
+        for p in (50, 90, 99)
+    ))
@@ -0,0 +1,20 @@
+"""
+Change log commands - Compaction of the change-data-capture log.
+"""
+from datetime import timedelta
+import click
+from flask.cli import AppGroup
+from extensions import db
+from services.changes import RETENTION, compact_change_log
+
+changes_cli = AppGroup('changes', help='Change log maintenance commands.')
+
+
+@changes_cli.command('compact')
+@click.option('--max-age-days', type=int, default=RETENTION.days, show_default=True,
+              help='Drop entries older than this many days.')
+def compact(max_age_days):
+    """Keep the newest entry per row and truncate old entries."""
+    compacted, truncated = compact_change_log(timedelta(days=max_age_days))
+    db.session.commit()
+    click.echo(f'{compacted} entries compacted, {truncated} truncated')
@@ -0,0 +1,52 @@
+"""
+Export commands - Streaming dumps of collections, materials and users.
+"""
+from datetime import timedelta
+import click
+from flask.cli import AppGroup
+from services.exports import DATASETS, FORMATS, export
+
+export_cli = AppGroup('export', help='Data export commands.')
+
+
+@export_cli.command('run')
+@click.argument('dataset', type=click.Choice(tuple(DATASETS)))
+@click.option('--format', 'fmt', type=click.Choice(FORMATS),
+              help='Output format (default: from the output extension, else csv).')
+@click.option('--output', '-o', type=click.Path(dir_okay=False, writable=True),
+              help='Output file (default: standard output).')
+@click.option('--from', 'start', type=click.DateTime(formats=['%Y-%m-%d']),
+              help='Only rows dated on or after this day (YYYY-MM-DD).')
+@click.option('--to', 'end', type=click.DateTime(formats=['%Y-%m-%d']),
+              help='Only rows dated up to this day, inclusive (YYYY-MM-DD).')
+@click.option('--status', help='Status filter (materials, users).')
+@click.option('--category', help='Category filter (collections, materials).')
+@click.option('--producer-id', type=int, help='Producer filter (collections, materials).')
+@click.option('--type', 'tipo', type=int, help='User type filter (1 admin, 2 curator, 3 producer).')
+def run(dataset, fmt, output, start, end, status, category, producer_id, tipo):
+    """Write a dataset as CSV or XLSX without loading it into memory."""
+    if fmt is None:
+        fmt = 'xlsx' if output and output.lower().endswith('.xlsx') else 'csv'
+    if end is not None:
+        end += timedelta(days=1)  # Inclusive day, exclusive bound
+
+    given = {'status': status, 'category': category, 'producer_id': producer_id, 'type': tipo}
+    filters = {name: value for name, value in given.items() if value is not None}
+    try:
+        chunks = export(dataset, fmt, start, end, **filters)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    if output is None:
+        stream = click.get_binary_stream('stdout')
+        for chunk in chunks:
+            stream.write(chunk)
+        stream.flush()
+        return
+
+    size = 0
+    with open(output, 'wb') as stream:
+        for chunk in chunks:
+            stream.write(chunk)
+            size += len(chunk)
+    click.echo(f'{size} bytes written to {output}', err=True)
@@ -0,0 +1,17 @@
+"""
+Idempotency commands - Cleanup of stored Idempotency-Key responses.
+"""
+import click
+from flask.cli import AppGroup
+from extensions import db
+from services.idempotency import purge_expired
+
+idempotency_cli = AppGroup('idempotency', help='Idempotency key commands.')
+
+
+@idempotency_cli.command('purge')
+def purge():
+    """Delete the expired idempotency keys."""
+    count = purge_expired()
+    db.session.commit()
+    click.echo(f'{count} key(s) deleted')
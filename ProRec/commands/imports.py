@@ -0,0 +1,30 @@
+"""
+Import commands - Bulk load of spaces and events from files.
+"""
+import click
+from flask.cli import AppGroup
+from services.imports import KINDS, CHUNK_SIZE, iter_csv, iter_ndjson, import_rows
+
+import_cli = AppGroup('import', help='Bulk import commands.')
+
+
+@import_cli.command('run')
+@click.argument('kind', type=click.Choice(KINDS))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']),
+              help='Input format (default: from the file extension).')
+@click.option('--chunk-size', default=CHUNK_SIZE, show_default=True, help='Rows per transaction.')
+def run(kind, path, fmt, chunk_size):
+    """Create or update spaces/events from a CSV or NDJSON file."""
+    if fmt is None:
+        fmt = 'ndjson' if path.lower().endswith(('.ndjson', '.jsonl')) else 'csv'
+
+    with open(path, 'rb') as stream:
+        rows = iter_csv(stream) if fmt == 'csv' else iter_ndjson(stream)
+        report = import_rows(kind, rows, chunk_size)
+
+    click.echo(f'{report.created} created, {report.updated} updated, {report.failed} failed')
+    for error in report.errors:
+        click.echo(f'  line {error["line"]}: {error["error"]}')
+    if report.failed > len(report.errors):
+        click.echo(f'  ... {report.failed - len(report.errors)} more')
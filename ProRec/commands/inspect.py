@@ -0,0 +1,104 @@
+"""
+Inspect commands - Table sizes, indexes and paged row browsing.
+"""
+import json
+from itertools import chain
+import click
+from flask.cli import AppGroup
+from services.inspector import (
+    OPERATORS, index_list, iter_rows, parse_where, reflect, sample_rows, table_stats
+)
+
+inspect_cli = AppGroup('inspect', help='Database inspection commands.')
+
+# Characters of a value shown by `inspect rows` before it is cut
+VALUE_WIDTH = 40
+
+
+def _size(size):
+    """Bytes as B/KB/MB/GB, '-' when unknown."""
+    if size is None:
+        return '-'
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GB'
+
+
+def _cut(value, width):
+    text = str(value)
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+
+@inspect_cli.command('tables')
+def tables():
+    """Rows, size on disk and index count of every table."""
+    click.echo(f'{"table":<28} {"rows":>10} {"size":>10} {"index size":>10} {"indexes":>7}')
+    for stats in table_stats():
+        click.echo(f'{stats["name"]:<28} {stats["rows"]:>10} {_size(stats["bytes"]):>10} '
+                   f'{_size(stats["index_bytes"]):>10} {stats["indexes"]:>7}')
+
+
+@inspect_cli.command('indexes')
+@click.argument('table')
+def indexes(table):
+    """Indexes of a table with their columns and size."""
+    try:
+        found = index_list(table)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    if not found:
+        click.echo(f'{table} has no indexes')
+    for index in found:
+        unique = ' unique' if index['unique'] else ''
+        click.echo(f'{index["name"]:<48} {_size(index["bytes"]):>10}{unique}  '
+                   f'({", ".join(index["columns"])})')
+
+
+@inspect_cli.command('rows')
+@click.argument('table')
+@click.option('--column', '-c', 'columns', multiple=True, help='Column to show (repeatable).')
+@click.option('--where', '-w', 'conditions', multiple=True,
+              help=f'Filter as column<op>value, op one of {" ".join(OPERATORS)} '
+                   '(~ is LIKE; repeatable).')
+@click.option('--after', help='Start after this key (before it with --desc).')
+@click.option('--limit', '-n', default=20, show_default=True, help='Rows per page.')
+@click.option('--all', 'everything', is_flag=True, help='Every matching row (ignores --limit).')
+@click.option('--desc', 'descending', is_flag=True, help='Highest key first.')
+@click.option('--sample', type=int, help='About this many random rows instead of a page.')
+@click.option('--json', 'as_json', is_flag=True, help='One JSON object per row.')
+def rows(table, columns, conditions, after, limit, everything, descending, sample, as_json):
+    """Browse a table by primary key (rowid when it has none), page by page."""
+    try:
+        reflected = reflect(table)
+        where = parse_where(reflected, conditions)
+        if after is not None and after.lstrip('-').isdigit():
+            after = int(after)
+        if sample:
+            found = sample_rows(reflected, sample, columns, where)
+        else:
+            found = iter_rows(reflected, columns, where, after,
+                              None if everything else limit, descending)
+        found = iter(found)
+        first = next(found, None)  # Bad columns and conditions raise here
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    if first is None:
+        click.echo('No rows', err=True)
+        return
+
+    shown = 0
+    last = None
+    for last, row in chain([first], found):
+        shown += 1
+        if as_json:
+            click.echo(json.dumps(row, default=str, ensure_ascii=False))
+        else:
+            values = '  '.join(f'{name}={_cut(value, VALUE_WIDTH)}'
+                               for name, value in row.items())
+            click.echo(f'[{last}] {values}')
+
+    if not sample and not everything and shown == limit:
+        click.echo(f'-- next page: --after {last}', err=True)
@@ -0,0 +1,62 @@
+"""
+Job commands - Standalone workers and maintenance of the background queue.
+"""
+import signal
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from extensions import db
+from services import photos, reviews  # noqa: F401 - register their job handlers
+from services.jobs import (
+    WorkerPool, queue_stats, requeue_stale, purge_finished, retry, run_pending
+)
+
+jobs_cli = AppGroup('jobs', help='Background job queue commands.')
+
+
+@jobs_cli.command('work')
+@click.option('--workers', default=2, show_default=True, help='Worker threads.')
+@click.option('--once', is_flag=True, help='Run the available jobs and exit.')
+def work(workers, once):
+    """Run job workers in the foreground until interrupted."""
+    requeue_stale()
+    db.session.commit()
+
+    if once:
+        click.echo(f'{run_pending()} job(s) run')
+        return
+
+    workers_pool = WorkerPool()
+    signal.signal(signal.SIGTERM, lambda *args: workers_pool.stop())
+    workers_pool.ensure_started(current_app._get_current_object(), workers)
+    click.echo(f'{workers} worker(s) running, Ctrl+C to stop')
+    try:
+        workers_pool.join()
+    except KeyboardInterrupt:
+        workers_pool.stop()
+        workers_pool.join()
+
+
+@jobs_cli.command('stats')
+def stats():
+    """Show queue depth and lag."""
+    for key, value in queue_stats().items():
+        click.echo(f'{key}: {value}')
+
+
+@jobs_cli.command('retry')
+@click.argument('job_id', type=int, required=False)
+def retry_command(job_id):
+    """Requeue one dead-lettered job, or all of them."""
+    count = retry(job_id)
+    db.session.commit()
+    click.echo(f'{count} job(s) requeued')
+
+
+@jobs_cli.command('purge')
+def purge():
+    """Requeue stale jobs and delete old completed ones."""
+    released = requeue_stale()
+    purged = purge_finished()
+    db.session.commit()
+    click.echo(f'{released} stale job(s) released, {purged} finished job(s) deleted')
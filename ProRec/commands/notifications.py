@@ -0,0 +1,18 @@
+"""
+Notification commands - Maintenance of user inboxes.
+"""
+import click
+from flask.cli import AppGroup
+from extensions import db
+from services.notifications import recount_unread
+
+notifications_cli = AppGroup('notifications', help='Notification maintenance commands.')
+
+
+@notifications_cli.command('recount')
+@click.option('--user-id', type=int, help='Only repair this user.')
+def recount(user_id):
+    """Recompute the cached unread counters from the notifications table."""
+    fixed = recount_unread(user_id)
+    db.session.commit()
+    click.echo(f'{fixed} counter(s) corrected')
@@ -0,0 +1,21 @@
+"""
+Photo commands - Upkeep of the stored material photos.
+"""
+import click
+from flask.cli import AppGroup
+from extensions import db
+from models.material import Material
+from models.archive import ArchivedMaterial
+from services.photos import collect_garbage
+
+photos_cli = AppGroup('photos', help='Material photo commands.')
+
+
+@photos_cli.command('gc')
+def gc():
+    """Delete stored photos no material (hot or archived) refers to."""
+    referenced = set()
+    for M in (Material, ArchivedMaterial):
+        referenced.update(digest for digest, in db.session.query(M.foto_hash)
+                          .filter(M.foto_hash.isnot(None)).distinct())
+    click.echo(f'{collect_garbage(referenced)} photo(s) deleted')
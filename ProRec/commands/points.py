@@ -0,0 +1,34 @@
+"""
+Points commands - Consistency between User.pontos and the points ledger.
+"""
+import click
+from flask.cli import AppGroup
+from extensions import db
+from services.leaderboard import invalidate_boards
+from services.points import reconcile, open_balances
+
+points_cli = AppGroup('points', help='Points ledger maintenance commands.')
+
+
+@points_cli.command('reconcile')
+@click.option('--fix', is_flag=True, help='Set User.pontos to the ledger sum where they differ.')
+def reconcile_command(fix):
+    """Report users whose balance differs from their ledger sum."""
+    drift = reconcile(fix=fix)
+    for user_id, pontos, ledger_total in drift:
+        click.echo(f'user {user_id}: balance {pontos}, ledger {ledger_total}')
+
+    if fix and drift:
+        db.session.commit()
+        invalidate_boards()
+        click.echo(f'{len(drift)} balance(s) corrected')
+    else:
+        click.echo(f'{len(drift)} balance(s) out of sync')
+
+
+@points_cli.command('open-balances')
+def open_balances_command():
+    """Give users created before the ledger an opening entry."""
+    created = open_balances()
+    db.session.commit()
+    click.echo(f'{created} opening entr(ies) created')
@@ -0,0 +1,22 @@
+"""
+Quantity commands - Backfill of the numeric quantity columns.
+"""
+import click
+from flask.cli import AppGroup
+from models.achievement import Collection
+from models.material import Material
+from services.quantities import backfill_table
+
+quantities_cli = AppGroup('quantities', help='Quantity normalization commands.')
+
+
+@quantities_cli.command('backfill')
+@click.option('--overwrite', is_flag=True, help='Re-parse rows that already have a unit.')
+@click.option('--batch-size', default=1000, show_default=True, help='Rows per UPDATE batch.')
+def backfill(overwrite, batch_size):
+    """Fill quantidade_valor/unidade of materials and collections from their text."""
+    for model in (Material, Collection):
+        updated, unparsed = backfill_table(model, overwrite, batch_size)
+        click.echo(f'{model.__tablename__}: {updated} row(s) parsed')
+        for quantidade in sorted(unparsed):
+            click.echo(f'  not understood: {quantidade!r}')
@@ -0,0 +1,29 @@
+"""
+Rate limit commands - Rejection counts and upkeep of the shared buckets.
+"""
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from services.rate_limit import purge, rejections, reset_rejections
+
+ratelimit_cli = AppGroup('ratelimit', help='Rate limit commands.')
+
+
+@ratelimit_cli.command('stats')
+@click.option('--reset', is_flag=True, help='Zero the counters after showing them.')
+def stats(reset):
+    """Show the requests rejected per route."""
+    path = current_app.config['RATE_LIMIT_STORAGE']
+    counts = rejections(path)
+    for rota, count in counts.items():
+        click.echo(f'{rota}: {count}')
+    if not counts:
+        click.echo('no rejected requests')
+    if reset:
+        reset_rejections(path)
+
+
+@ratelimit_cli.command('purge')
+def purge_command():
+    """Delete the buckets that have refilled."""
+    click.echo(f'{purge(current_app.config["RATE_LIMIT_STORAGE"])} bucket(s) deleted')
@@ -0,0 +1,29 @@
+"""
+Replica commands - Refresh the read-only replica from the primary database.
+"""
+import time
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from services.replica import sync
+
+replica_cli = AppGroup('replica', help='Read replica commands.')
+
+
+@replica_cli.command('sync')
+@click.option('--interval', type=float,
+              help='Keep syncing every this many seconds (default: sync once).')
+def sync_command(interval):
+    """Copy the primary database to REPLICA_DATABASE_URL with the backup API."""
+    replica_url = current_app.config.get('REPLICA_DATABASE_URL')
+    if not replica_url:
+        raise click.UsageError('REPLICA_DATABASE_URL is not set')
+    primary_url = current_app.config['SQLALCHEMY_DATABASE_URI']
+
+    while True:
+        start = time.perf_counter()
+        pages = sync(primary_url, replica_url)
+        click.echo(f'{pages} pages copied in {time.perf_counter() - start:.2f} s')
+        if interval is None:
+            return
+        time.sleep(interval)
@@ -0,0 +1,19 @@
+"""
+Rollup commands - Backfill of the collection analytics rollups.
+"""
+import click
+from flask.cli import AppGroup
+from extensions import db
+from services.analytics import rebuild_rollups
+
+rollups_cli = AppGroup('rollups', help='Collection analytics rollup commands.')
+
+
+@rollups_cli.command('rebuild')
+@click.option('--since', type=click.DateTime(formats=['%Y-%m-%d']),
+              help='Only rebuild days from this date on (YYYY-MM-DD).')
+def rebuild(since):
+    """Recompute the daily rollups from the collections table."""
+    written = rebuild_rollups(since.date() if since else None)
+    db.session.commit()
+    click.echo(f'{written} rollup row(s) written')
@@ -0,0 +1,24 @@
+"""
+Schema commands - Upgrade of databases made by earlier versions.
+"""
+import click
+from flask.cli import AppGroup
+from services.schema import missing_columns, upgrade
+
+schema_cli = AppGroup('schema', help='Database schema commands.')
+
+
+@schema_cli.command('upgrade')
+@click.option('--dry-run', is_flag=True, help='Only list the columns that are missing.')
+def upgrade_command(dry_run):
+    """Create missing tables, columns and indexes, and fill the new columns."""
+    if dry_run:
+        missing = missing_columns()
+        for column in missing:
+            click.echo(f'  missing: {column}')
+        click.echo(f'{len(missing)} column(s) missing')
+        return
+    added = upgrade()
+    for column in added:
+        click.echo(f'  added: {column}')
+    click.echo(f'{len(added)} column(s) added; schema up to date')
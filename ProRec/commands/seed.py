@@ -0,0 +1,606 @@
+"""
+Seed commands - Demo data for development databases.
+"""
+from datetime import datetime, timedelta
+import random
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from werkzeug.security import generate_password_hash
+from extensions import db
+from models.user import User, TipoUsuario, StatusUsuario
+from models.material import Material, StatusMaterial
+from models.space import Space, TipoEspaco
+from models.event import Event, TipoEvento, StatusEvento
+from models.achievement import Achievement, Collection
+from models.points import MotivoPontos
+from models.residuo import Usuario, Residuo, PerfilUsuario
+from services.points import conceder_pontos
+from services.schema import upgrade
+
+seed_cli = AppGroup('seed', help='Demo data commands.')
+
+
+def seed_database():
+    """Create the tables and the demo users and data, unless users exist."""
+    # Show the database location for debugging
+    db_uri = current_app.config.get('SQLALCHEMY_DATABASE_URI', '')
+    click.echo(f"Database location: {db_uri.replace('sqlite:///', '')}")
+    click.echo("Creating database tables...")
+    for column in upgrade():
+        click.echo(f"  added column {column}")
+
+    # Check if users already exist
+    if User.query.count() > 0:
+        click.echo("Database already initialized. Skipping seed data.")
+        return
+
+    click.echo("Creating test users...")
+
+    # Create Admin user
+    admin = User(
+        username='admin@reciclo.com',
+        email='admin@reciclo.com',
+        first_name='Administrador',
+        last_name='Sistema',
+        tipo=TipoUsuario.ADMIN.value,
+        status=StatusUsuario.ATIVO.value,
+        is_active=True,
+        is_staff=True,
+        is_superuser=True
+    )
+    admin.set_password('senha123')
+    db.session.add(admin)
+
+    # Create Curator user
+    curator = User(
+        username='curador@reciclo.com',
+        email='curador@reciclo.com',
+        first_name='Curador',
+        last_name='Teste',
+        tipo=TipoUsuario.CURATOR.value,
+        status=StatusUsuario.ATIVO.value,
+        is_active=True
+    )
+    curator.set_password('senha123')
+    db.session.add(curator)
+
+    # Create Producer user
+    producer = User(
+        username='produtor@reciclo.com',
+        email='produtor@reciclo.com',
+        first_name='Produtor',
+        last_name='Teste',
+        tipo=TipoUsuario.PRODUCER.value,
+        status=StatusUsuario.ATIVO.value,
+        pontos=0,  # credited below through the ledger, one entry per collection
+        is_active=True
+    )
+    producer.set_password('senha123')
+    db.session.add(producer)
+
+    # Create pending users for admin approval
+    pending_user1 = User(
+        username='joao@email.com',
+        email='joao@email.com',
+        first_name='João',
+        last_name='Silva',
+        tipo=TipoUsuario.PRODUCER.value,
+        status=StatusUsuario.PENDENTE.value,
+        is_active=True
+    )
+    pending_user1.set_password('senha123')
+    db.session.add(pending_user1)
+
+    pending_user2 = User(
+        username='maria@email.com',
+        email='maria@email.com',
+        first_name='Maria',
+        last_name='Santos',
+        tipo=TipoUsuario.PRODUCER.value,
+        status=StatusUsuario.PENDENTE.value,
+        is_active=True
+    )
+    pending_user2.set_password('senha123')
+    db.session.add(pending_user2)
+
+    # Commit users first to get IDs
+    db.session.commit()
+
+    click.echo("Creating achievements...")
+    achievements = [
+        Achievement(nome='Primeira Coleta', descricao='Realizou sua primeira coleta', icone='🌱', pontos_necessarios=0, ordem=1),
+        Achievement(nome='Eco Warrior', descricao='Acumulou 100 pontos', icone='⚡', pontos_necessarios=100, ordem=2),
+        Achievement(nome='Guardião Verde', descricao='Acumulou 500 pontos', icone='🌳', pontos_necessarios=500, ordem=3),
+        Achievement(nome='Mestre da Reciclagem', descricao='Acumulou 1000 pontos', icone='👑', pontos_necessarios=1000, ordem=4),
+    ]
+    for achievement in achievements:
+        db.session.add(achievement)
+
+    click.echo("Creating spaces...")
+    spaces = [
+        Space(
+            nome='EcoPonto Centro',
+            tipo=TipoEspaco.COLETA.value,
+            endereco='Rua das Flores, 123 - Centro',
+            horario='Seg-Sex: 8h-18h'
+        ),
+        Space(
+            nome='Reciclagem Bairro Norte',
+            tipo=TipoEspaco.COLETA.value,
+            endereco='Av. Principal, 456 - Norte',
+            horario='Seg-Sáb: 7h-19h'
+        ),
+        Space(
+            nome='Centro de Coleta Sul',
+            tipo=TipoEspaco.COLETA.value,
+            endereco='Rua do Parque, 789 - Sul',
+            horario='Seg-Sex: 9h-17h'
+        ),
+        Space(
+            nome='Auditório Sustentabilidade',
+            tipo=TipoEspaco.EVENTO.value,
+            endereco='Rua das Flores, 500',
+            horario='Agendamento prévio'
+        ),
+        Space(
+            nome='Centro de Treinamento',
+            tipo=TipoEspaco.CURSO.value,
+            endereco='Av. Educação, 300',
+            horario='Seg-Sáb: 9h-17h'
+        ),
+    ]
+    for space in spaces:
+        db.session.add(space)
+
+    db.session.commit()
+
+    click.echo("Creating events...")
+    today = datetime.now()
+    events = [
+        Event(
+            titulo='Coleta de Eletrônicos',
+            descricao='Coleta especial de equipamentos eletrônicos',
+            tipo=TipoEvento.COLETA.value,
+            status=StatusEvento.AGENDADO.value,
+            data_inicio=today + timedelta(days=3),
+            horario='9:00 - 16:00',
+            localizacao_custom='Centro Comunitário'
+        ),
+        Event(
+            titulo='Workshop de Compostagem',
+            descricao='Aprenda a fazer compostagem em casa',
+            tipo=TipoEvento.WORKSHOP.value,
+            status=StatusEvento.AGENDADO.value,
+            data_inicio=today + timedelta(days=7),
+            horario='14:00 - 17:00',
+            localizacao_custom='Praça Central'
+        ),
+        Event(
+            titulo='Feira de Sustentabilidade',
+            descricao='Feira com produtos sustentáveis e palestras',
+            tipo=TipoEvento.EVENTO.value,
+            status=StatusEvento.AGENDADO.value,
+            data_inicio=today + timedelta(days=14),
+            horario='10:00 - 18:00',
+            localizacao_custom='Parque Municipal'
+        ),
+    ]
+    for event in events:
+        db.session.add(event)
+
+    click.echo("Creating sample materials...")
+    # Get producer ID
+    producer = User.query.filter_by(email='produtor@reciclo.com').first()
+    curator = User.query.filter_by(email='curador@reciclo.com').first()
+
+    materials = [
+        Material(
+            nome='Lote de plástico',
+            categoria='plastico',
+            descricao='10 garrafas PET limpas',
+            localizacao='Minha localização',
+            quantidade='10 unidades',
+            status=StatusMaterial.APPROVED.value,
+            produtor_id=producer.id,
+            curador_id=curator.id,
+            pontos_concedidos=50,
+            feedback='Material em excelente estado!',
+            revisado_em=datetime.utcnow() - timedelta(days=3)
+        ),
+        Material(
+            nome='Papelão',
+            categoria='papel',
+            descricao='Caixas desmontadas',
+            localizacao='Minha localização',
+            quantidade='5kg',
+            status=StatusMaterial.PENDING.value,
+            produtor_id=producer.id
+        ),
+        Material(
+            nome='Eletrônicos Antigos',
+            categoria='eletronicos',
+            descricao='Celulares e tablets usados',
+            localizacao='Centro da cidade',
+            status=StatusMaterial.REJECTED.value,
+            produtor_id=producer.id,
+            curador_id=curator.id,
+            feedback='Por favor, forneça mais detalhes sobre o estado dos aparelhos.',
+            revisado_em=datetime.utcnow() - timedelta(days=5)
+        ),
+    ]
+    for material in materials:
+        db.session.add(material)
+
+    click.echo("Creating sample collections...")
+    collections = [
+        Collection(
+            material_nome='Garrafas PET',
+            categoria='plastico',
+            quantidade='50 unidades',
+            pontos=150,
+            feedback='Excelente qualidade! Material bem separado.',
+            produtor_id=producer.id,
+            data_coleta=datetime.utcnow() - timedelta(days=10)
+        ),
+        Collection(
+            material_nome='Papelão',
+            categoria='papel',
+            quantidade='20kg',
+            pontos=100,
+            feedback='Material em bom estado.',
+            produtor_id=producer.id,
+            data_coleta=datetime.utcnow() - timedelta(days=15)
+        ),
+        Collection(
+            material_nome='Latas de Alumínio',
+            categoria='metal',
+            quantidade='30 unidades',
+            pontos=120,
+            feedback='Ótima contribuição!',
+            produtor_id=producer.id,
+            data_coleta=datetime.utcnow() - timedelta(days=20)
+        ),
+    ]
+    for collection in collections:
+        db.session.add(collection)
+
+    # Oldest first, so each ledger entry carries the running balance
+    for collection in sorted(collections, key=lambda c: c.data_coleta):
+        conceder_pontos(producer, collection.pontos, MotivoPontos.COLETA.value,
+                        quando=collection.data_coleta)
+
+    # Commit all data
+    db.session.commit()
+
+    click.echo("\n[SUCCESS] Database initialized successfully!")
+    click.echo("\nTest Users Created:")
+    click.echo("  Admin:    admin@reciclo.com / senha123")
+    click.echo("  Curator:  curador@reciclo.com / senha123")
+    click.echo("  Producer: produtor@reciclo.com / senha123")
+    click.echo("\nSeed Data Created:")
+    click.echo("  - 4 Achievements")
+    click.echo("  - 5 Spaces (collection points)")
+    click.echo("  - 3 Events")
+    click.echo("  - 3 Materials (1 approved, 1 pending, 1 rejected)")
+    click.echo("  - 3 Collections (history)")
+    click.echo("  - 2 Pending users for approval")
+
+
+
+def add_mock_users(count=5):
+    """Add mock producer users."""
+    click.echo(f"Adding {count} mock users...")
+
+    first_names = ['Ana', 'Carlos', 'Beatriz', 'Diego', 'Elena', 'Fernando', 'Gabriela', 'Hugo', 'Isabel', 'Jorge']
+    last_names = ['Oliveira', 'Santos', 'Pereira', 'Costa', 'Ferreira', 'Almeida', 'Souza', 'Lima', 'Gomes', 'Ribeiro']
+
+    users_created = 0
+    for i in range(count):
+        first_name = random.choice(first_names)
+        last_name = random.choice(last_names)
+        email = f"{first_name.lower()}.{last_name.lower()}{random.randint(1, 999)}@email.com"
+
+        # Check if email already exists
+        if User.query.filter_by(email=email).first():
+            continue
+
+        user = User(
+            username=email,
+            email=email,
+            first_name=first_name,
+            last_name=last_name,
+            tipo=TipoUsuario.PRODUCER.value,
+            status=random.choice([StatusUsuario.ATIVO.value, StatusUsuario.PENDENTE.value]),
+            is_active=True
+        )
+        user.set_password('senha123')
+        db.session.add(user)
+        conceder_pontos(user, random.randint(0, 500), MotivoPontos.SALDO_INICIAL.value)
+        users_created += 1
+
+    db.session.commit()
+    click.echo(f"  Created {users_created} users")
+    return users_created
+
+
+def add_mock_materials(count=10):
+    """Add mock materials from random producers."""
+    click.echo(f"Adding {count} mock materials...")
+
+    producers = User.query.filter_by(tipo=TipoUsuario.PRODUCER.value, status=StatusUsuario.ATIVO.value).all()
+    curators = User.query.filter_by(tipo=TipoUsuario.CURATOR.value).all()
+
+    if not producers:
+        click.echo("  No active producers found!")
+        return 0
+
+    material_templates = [
+        ('Garrafas PET', 'plastico', 'Garrafas plásticas limpas e sem rótulo'),
+        ('Papelão', 'papel', 'Caixas de papelão desmontadas'),
+        ('Latas de Alumínio', 'metal', 'Latas de refrigerante e cerveja'),
+        ('Garrafas de Vidro', 'vidro', 'Garrafas de vidro limpas'),
+        ('Jornais e Revistas', 'papel', 'Jornais e revistas antigos'),
+        ('Embalagens Plásticas', 'plastico', 'Embalagens de produtos diversos'),
+        ('Celulares Antigos', 'eletronicos', 'Celulares que não funcionam mais'),
+        ('Pilhas e Baterias', 'eletronicos', 'Pilhas e baterias usadas'),
+        ('Restos de Comida', 'organico', 'Restos orgânicos para compostagem'),
+        ('Tampinhas Plásticas', 'plastico', 'Tampinhas de garrafas PET'),
+        ('Latas de Conserva', 'metal', 'Latas de alimentos enlatados'),
+        ('Potes de Vidro', 'vidro', 'Potes de conserva e geleias'),
+    ]
+
+    locations = [
+        'Centro, próximo à praça',
+        'Bairro Norte, Rua das Palmeiras',
+        'Zona Sul, Av. Principal',
+        'Condomínio Verde',
+        'Empresa XYZ, sala 101',
+        'Residência, Bairro Jardim',
+        'Shopping Center',
+        'Universidade Federal',
+    ]
+
+    quantities = ['5 unidades', '10 unidades', '20 unidades', '5kg', '10kg', '15kg', '1 sacola', '2 sacolas']
+
+    feedbacks_approved = [
+        'Material em excelente estado!',
+        'Muito bem separado, parabéns!',
+        'Qualidade excepcional.',
+        'Material pronto para reciclagem.',
+        '',
+    ]
+
+    feedbacks_rejected = [
+        'Material contaminado, por favor limpar antes de enviar.',
+        'Mistura de categorias não permitida.',
+        'Por favor, forneça mais detalhes sobre o material.',
+        'Material muito danificado para reciclagem.',
+        'Quantidade insuficiente para coleta.',
+    ]
+
+    materials_created = 0
+    for i in range(count):
+        template = random.choice(material_templates)
+        producer = random.choice(producers)
+        status = random.choice([StatusMaterial.PENDING.value, StatusMaterial.APPROVED.value, StatusMaterial.REJECTED.value])
+
+        material = Material(
+            nome=template[0],
+            categoria=template[1],
+            descricao=template[2],
+            localizacao=random.choice(locations),
+            quantidade=random.choice(quantities),
+            status=status,
+            produtor_id=producer.id,
+            criado_em=datetime.utcnow() - timedelta(days=random.randint(1, 30))
+        )
+
+        if status in [StatusMaterial.APPROVED.value, StatusMaterial.REJECTED.value] and curators:
+            material.curador_id = random.choice(curators).id
+            material.revisado_em = datetime.utcnow() - timedelta(days=random.randint(0, 7))
+
+            if status == StatusMaterial.APPROVED.value:
+                material.feedback = random.choice(feedbacks_approved)
+                material.pontos_concedidos = random.randint(30, 100)
+            else:
+                material.feedback = random.choice(feedbacks_rejected)
+
+        db.session.add(material)
+        materials_created += 1
+
+    db.session.commit()
+    click.echo(f"  Created {materials_created} materials")
+    return materials_created
+
+
+def add_mock_collections(count=10):
+    """Add mock collection history for producers."""
+    click.echo(f"Adding {count} mock collections...")
+
+    producers = User.query.filter_by(tipo=TipoUsuario.PRODUCER.value, status=StatusUsuario.ATIVO.value).all()
+
+    if not producers:
+        click.echo("  No active producers found!")
+        return 0
+
+    material_names = [
+        ('Garrafas PET', 'plastico'),
+        ('Papelão', 'papel'),
+        ('Latas de Alumínio', 'metal'),
+        ('Vidros', 'vidro'),
+        ('Eletrônicos', 'eletronicos'),
+        ('Orgânicos', 'organico'),
+    ]
+
+    feedbacks = [
+        'Excelente qualidade!',
+        'Material bem separado.',
+        'Ótima contribuição!',
+        'Muito bom, continue assim!',
+        'Perfeito estado para reciclagem.',
+        '',
+    ]
+
+    quantities = ['10 unidades', '20 unidades', '50 unidades', '5kg', '10kg', '15kg', '25kg']
+
+    collections_created = 0
+    for i in range(count):
+        producer = random.choice(producers)
+        material = random.choice(material_names)
+
+        collection = Collection(
+            material_nome=material[0],
+            categoria=material[1],
+            quantidade=random.choice(quantities),
+            pontos=random.randint(20, 200),
+            feedback=random.choice(feedbacks),
+            produtor_id=producer.id,
+            data_coleta=datetime.utcnow() - timedelta(days=random.randint(1, 60))
+        )
+
+        db.session.add(collection)
+        collections_created += 1
+
+    db.session.commit()
+    click.echo(f"  Created {collections_created} collections")
+    return collections_created
+
+
+def add_mock_events(count=5):
+    """Add mock future events."""
+    click.echo(f"Adding {count} mock events...")
+
+    event_templates = [
+        ('Coleta de Eletrônicos', TipoEvento.COLETA.value, 'Coleta especial de equipamentos eletrônicos'),
+        ('Workshop de Reciclagem', TipoEvento.WORKSHOP.value, 'Aprenda técnicas de reciclagem doméstica'),
+        ('Feira Verde', TipoEvento.EVENTO.value, 'Feira de produtos sustentáveis'),
+        ('Curso de Compostagem', TipoEvento.CURSO.value, 'Curso prático de compostagem'),
+        ('Mutirão de Limpeza', TipoEvento.EVENTO.value, 'Mutirão comunitário de limpeza'),
+        ('Palestra Sustentabilidade', TipoEvento.EVENTO.value, 'Palestra sobre práticas sustentáveis'),
+        ('Coleta de Óleo', TipoEvento.COLETA.value, 'Coleta de óleo de cozinha usado'),
+        ('Workshop de Artesanato', TipoEvento.WORKSHOP.value, 'Transforme resíduos em arte'),
+    ]
+
+    locations = [
+        'Centro Comunitário',
+        'Praça Central',
+        'Parque Municipal',
+        'Escola Municipal',
+        'Clube de Bairro',
+        'Shopping Center',
+    ]
+
+    times = ['9:00 - 12:00', '14:00 - 17:00', '10:00 - 16:00', '8:00 - 18:00']
+
+    events_created = 0
+    for i in range(count):
+        template = random.choice(event_templates)
+
+        event = Event(
+            titulo=template[0],
+            tipo=template[1],
+            descricao=template[2],
+            status=StatusEvento.AGENDADO.value,
+            data_inicio=datetime.now() + timedelta(days=random.randint(1, 60)),
+            horario=random.choice(times),
+            localizacao_custom=random.choice(locations)
+        )
+
+        db.session.add(event)
+        events_created += 1
+
+    db.session.commit()
+    click.echo(f"  Created {events_created} events")
+    return events_created
+
+
+def add_mock_spaces(count=3):
+    """Add mock collection points/spaces."""
+    click.echo(f"Adding {count} mock spaces...")
+
+    space_templates = [
+        ('Ecoponto', TipoEspaco.COLETA.value, 'Ponto de coleta de recicláveis'),
+        ('Centro de Reciclagem', TipoEspaco.COLETA.value, 'Centro completo de reciclagem'),
+        ('Sala de Eventos', TipoEspaco.EVENTO.value, 'Espaço para eventos e palestras'),
+        ('Centro de Treinamento', TipoEspaco.CURSO.value, 'Local para cursos e workshops'),
+    ]
+
+    neighborhoods = ['Centro', 'Norte', 'Sul', 'Leste', 'Oeste', 'Jardim', 'Vila Nova']
+    streets = ['Rua das Flores', 'Av. Principal', 'Rua do Parque', 'Av. Brasil', 'Rua Verde']
+    hours = ['Seg-Sex: 8h-18h', 'Seg-Sáb: 7h-19h', 'Todos os dias: 9h-17h', 'Seg-Sex: 9h-17h']
+
+    spaces_created = 0
+    for i in range(count):
+        template = random.choice(space_templates)
+        neighborhood = random.choice(neighborhoods)
+
+        space = Space(
+            nome=f"{template[0]} {neighborhood}",
+            tipo=template[1],
+            endereco=f"{random.choice(streets)}, {random.randint(100, 999)} - {neighborhood}",
+            horario=random.choice(hours),
+            descricao=template[2],
+            ativo=True
+        )
+
+        db.session.add(space)
+        spaces_created += 1
+
+    db.session.commit()
+    click.echo(f"  Created {spaces_created} spaces")
+    return spaces_created
+
+
+def seed_residuos():
+    """Add the JWT API's sample accounts and wastes, unless accounts exist."""
+    if Usuario.query.count() > 0:
+        return
+
+    click.echo("Creating residuos API accounts and wastes...")
+    senha_funcionario = generate_password_hash('admin123')
+    senha_cliente = generate_password_hash('cliente123')
+    db.session.add_all([
+        Usuario(nome='Admin reciclo', email='admin@email.com', senha=senha_funcionario,
+                perfil=PerfilUsuario.FUNCIONARIO.value, telefone='81987654321'),
+        Usuario(nome='Maria Silva', email='maria@email.com', senha=senha_cliente,
+                perfil=PerfilUsuario.CLIENTE.value, telefone='81912345678'),
+        Usuario(nome='João Santos', email='joao@email.com', senha=senha_cliente,
+                perfil=PerfilUsuario.CLIENTE.value, telefone='81998765432'),
+        Residuo(categoria='aluminio', nome_residuo='latas', descricao='latas de refrigerante',
+                quantidade_total=20, quantidade_disponivel=20),
+        Residuo(categoria='Plastico', nome_residuo='Garrafas', descricao='garrafa pet',
+                quantidade_total=2, quantidade_disponivel=1)
+    ])
+    db.session.commit()
+
+
+@seed_cli.command('init')
+def init():
+    """Create the tables and seed the test users and sample data."""
+    seed_database()
+    seed_residuos()
+
+
+@seed_cli.command('mock')
+@click.option('--users', default=5, show_default=True, help='Producers to add.')
+@click.option('--materials', default=15, show_default=True, help='Materials to add.')
+@click.option('--collections', default=10, show_default=True, help='Collections to add.')
+@click.option('--events', default=5, show_default=True, help='Events to add.')
+@click.option('--spaces', default=3, show_default=True, help='Spaces to add.')
+def mock(users, materials, collections, events, spaces):
+    """Add random mock data to an existing database (0 skips a table)."""
+    created = {
+        'Users': add_mock_users(users) if users else 0,
+        'Materials': add_mock_materials(materials) if materials else 0,
+        'Collections': add_mock_collections(collections) if collections else 0,
+        'Events': add_mock_events(events) if events else 0,
+        'Spaces': add_mock_spaces(spaces) if spaces else 0
+    }
+
+    click.echo("\n" + "=" * 50)
+    click.echo("SUMMARY")
+    click.echo("=" * 50)
+    for name, count in created.items():
+        click.echo(f"  {name} created: {count}")
+    click.echo("\n[SUCCESS] Mock data added successfully!\n")
@@ -0,0 +1,20 @@
+"""
+Space commands - Maintenance tasks for collection points and event spaces.
+"""
+import click
+from flask.cli import AppGroup
+from services.opening_hours import parse_space_hours
+
+spaces_cli = AppGroup('spaces', help='Space maintenance commands.')
+
+
+@spaces_cli.command('parse-hours')
+@click.option('--overwrite', is_flag=True,
+              help='Re-parse spaces that already have structured hours.')
+@click.option('--dry-run', is_flag=True, help='Report the result without saving.')
+def parse_hours(overwrite, dry_run):
+    """Fill the weekly hours mask from the free-text hours of each space."""
+    parsed, unparsed = parse_space_hours(overwrite, dry_run)
+    click.echo(f'{parsed} space(s) parsed' + (' (dry run)' if dry_run else ''))
+    for space_id, nome, horario in unparsed:
+        click.echo(f'  not understood: #{space_id} {nome}: {horario!r}')
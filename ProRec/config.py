@@ -17,6 +17,9 @@ class Config:
     # Security
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
 
+    # Signs the residuos API's bearer tokens (routes/residuos.py)
+    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or SECRET_KEY
+
     # Database - uses absolute path to ensure consistency regardless of CWD
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + DB_PATH
@@ -37,6 +40,41 @@ class Config:
     UPLOAD_FOLDER = os.path.join(basedir, 'static', 'uploads')
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
 
+    # Processes per web/worker process resizing photos (services/photos.py)
+    PHOTO_PROCESSES = int(os.environ.get('PHOTO_PROCESSES', 2))
+
+    # Background jobs: worker threads started in each web process on first
+    # enqueue (0 to rely on `flask jobs work` processes only)
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+
+    # Reviewed materials, collections and read notifications older than this
+    # are moved to the archive tables by `flask archive run`
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 365))
+
+    # Read-only replica serving GET requests (see services/replica.py), e.g.
+    # sqlite:///file:/path/replica.db?mode=ro&uri=true; unset: primary only
+    REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL')
+    SQLALCHEMY_BINDS = {'replica': REPLICA_DATABASE_URL} if REPLICA_DATABASE_URL else {}
+
+    # Seconds a client keeps reading from the primary after a write, so the
+    # replica has caught up before it reads from it again
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+
+    # Reverse proxies in front of the app (e.g. nginx before gunicorn's
+    # 127.0.0.1 bind) whose X-Forwarded-For/-Proto/-Host are trusted; 0 when
+    # clients connect directly, or anyone could forge their address
+    PROXY_HOPS = int(os.environ.get('PROXY_HOPS', 0))
+
+    # Per-route request limits (decorators/rate_limit.py); the buckets live
+    # in this SQLite file, shared by the worker processes of a host
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', '1') != '0'
+    RATE_LIMIT_STORAGE = os.environ.get('RATE_LIMIT_STORAGE') or \
+        os.path.join(basedir, 'ratelimit.db')
+
+    # Hours a response stored for Idempotency-Key retries is kept
+    # (decorators/idempotency.py)
+    IDEMPOTENCY_TTL_HOURS = int(os.environ.get('IDEMPOTENCY_TTL_HOURS', 24))
+
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -56,6 +94,10 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    JOB_WORKERS = 0  # an in-memory database is not shared with worker threads
+    REPLICA_DATABASE_URL = None
+    SQLALCHEMY_BINDS = {}
+    RATE_LIMIT_ENABLED = False
 
 
 # Configuration dictionary
@@ -8,11 +8,20 @@ from decorators.auth import (
     producer_required,
     active_user_required
 )
+from decorators.token import token_required, funcionario_required
+from decorators.rate_limit import rate_limit, client_key, ip_key
+from decorators.idempotency import idempotent
 
 __all__ = [
     'user_type_required',
     'admin_required',
     'curator_required',
     'producer_required',
-    'active_user_required'
+    'active_user_required',
+    'token_required',
+    'funcionario_required',
+    'rate_limit',
+    'client_key',
+    'ip_key',
+    'idempotent'
 ]
@@ -0,0 +1,73 @@
+"""
+Idempotency decorators - Safe retries of POST endpoints.
+Clients send an `Idempotency-Key` header (see services/idempotency.py).
+"""
+from datetime import timedelta
+from functools import wraps
+from flask import Response, current_app, jsonify, make_response, request
+from decorators.rate_limit import client_key
+from models.idempotency import StatusIdempotencia
+from services.idempotency import MAX_KEY_LENGTH, RETRY_AFTER, claim, complete, release, request_hash
+
+
+def _replay(record):
+    response = Response(record.corpo, status=record.status_code, mimetype=record.mimetype)
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(f):
+    """
+    Decorator to run a request at most once per `Idempotency-Key`.
+
+    Requests without the header run as usual. A duplicate of a finished
+    request gets the stored response (with `Idempotent-Replayed: true`);
+    a duplicate of one still running gets 409 with Retry-After at once.
+    Keys are per client and endpoint. Place it below the authentication
+    decorators, so only authorized requests claim keys.
+
+    Usage:
+        @api_bp.route('/producer/materials', methods=['POST'])
+        @login_required
+        @producer_required
+        @idempotent
+        def producer_create_material():
+            pass
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        chave = request.headers.get('Idempotency-Key')
+        if chave is None:
+            return f(*args, **kwargs)
+        if not chave.strip() or len(chave) > MAX_KEY_LENGTH:
+            return jsonify({'error': f'Idempotency-Key must have 1 to {MAX_KEY_LENGTH} characters'}), 400
+
+        config = current_app.config
+        escopo = f'{request.endpoint}:{client_key()}'
+        digest = request_hash(request)
+        ttl = timedelta(hours=config['IDEMPOTENCY_TTL_HOURS'])
+
+        record, owner = claim(escopo, chave, digest, ttl)
+        if not owner:
+            if record is not None and record.request_hash != digest:
+                return jsonify({'error': 'Idempotency-Key already used for a different request'}), 422
+            # None: the first request released the key while this one looked
+            if record is None or record.status == StatusIdempotencia.EM_ANDAMENTO.value:
+                response = jsonify({'error': 'A request with this Idempotency-Key is in progress'})
+                response.headers['Retry-After'] = str(RETRY_AFTER)
+                return response, 409
+            return _replay(record)
+
+        record_id = record.id
+        try:
+            response = make_response(f(*args, **kwargs))
+        except Exception:
+            release(record_id)
+            raise
+
+        if response.status_code >= 500 or response.status_code == 429 or response.is_streamed:
+            release(record_id)
+        else:
+            complete(record_id, response)
+        return response
+    return decorated_function
@@ -0,0 +1,78 @@
+"""
+Rate limit decorators - Per-route request limits by client.
+Buckets are shared across worker processes (see services/rate_limit.py).
+"""
+import sqlite3
+from functools import wraps
+import jwt
+from flask import current_app, jsonify, request
+from flask_login import current_user
+from services.rate_limit import take
+
+
+def client_key():
+    """
+    Who a request counts against: the dashboard user, the subject of a
+    valid residuos API token, or else the client IP.
+    """
+    if current_user.is_authenticated:
+        return f'user:{current_user.id}'
+
+    token = request.headers.get('Authorization', '')
+    if token.startswith('Bearer '):
+        try:
+            claims = jwt.decode(token[7:], current_app.config['JWT_SECRET_KEY'],
+                                algorithms=['HS256'])
+            return f'token:{claims["id"]}'
+        except (jwt.InvalidTokenError, KeyError):
+            pass
+
+    return f'ip:{request.remote_addr}'
+
+
+def ip_key():
+    """The client IP, for routes used before logging in."""
+    return f'ip:{request.remote_addr}'
+
+
+def rate_limit(limit, per=60, key=client_key, methods=None):
+    """
+    Decorator to allow `limit` requests per `per` seconds per client, with
+    bursts up to `limit`; excess requests get 429 with Retry-After.
+
+    Args:
+        limit: Requests allowed per period (and the burst size)
+        per: Period in seconds
+        key: Function returning the client a request counts against
+        methods: Only limit these HTTP methods (default: all)
+
+    Usage:
+        @api_bp.route('/producer/materials', methods=['POST'])
+        @rate_limit(20, per=60)
+        @login_required
+        def producer_create_material():
+            pass
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            config = current_app.config
+            if not config['RATE_LIMIT_ENABLED'] or (methods and request.method not in methods):
+                return f(*args, **kwargs)
+
+            rota = request.endpoint
+            try:
+                allowed, retry_after = take(config['RATE_LIMIT_STORAGE'],
+                                            f'{rota}:{key()}', rota, limit, per)
+            except sqlite3.Error as e:
+                # Fail open: a busy counter file must not take the site down
+                current_app.logger.warning('Rate limit storage unavailable: %s', e)
+                allowed = True
+
+            if not allowed:
+                response = jsonify({'error': 'Too many requests', 'retry_after': retry_after})
+                response.headers['Retry-After'] = str(retry_after)
+                return response, 429
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
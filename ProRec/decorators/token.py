@@ -0,0 +1,54 @@
+"""
+Token decorators - Bearer JWT authentication of the residuos API.
+The decorated view receives the token claims as its first argument.
+"""
+from functools import wraps
+import jwt
+from flask import current_app, jsonify, request
+from models.residuo import PerfilUsuario
+
+
+def token_required(f):
+    """
+    Decorator for views that need a valid `Authorization: Bearer <token>`.
+
+    Usage:
+        @token_required
+        def some_view(current_user):
+            pass
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        token = request.headers.get('Authorization')
+        if not token:
+            return jsonify({'mensagem': 'Token não fornecido'}), 401
+
+        if token.startswith('Bearer '):
+            token = token[7:]
+
+        try:
+            current_user = jwt.decode(token, current_app.config['JWT_SECRET_KEY'],
+                                      algorithms=['HS256'])
+        except jwt.InvalidTokenError:
+            return jsonify({'mensagem': 'Token inválido'}), 401
+
+        return f(current_user, *args, **kwargs)
+    return decorated_function
+
+
+def funcionario_required(f):
+    """
+    Decorator for staff-only views (perfil 'funcionario').
+
+    Usage:
+        @funcionario_required
+        def some_view(current_user):
+            pass
+    """
+    @wraps(f)
+    @token_required
+    def decorated_function(current_user, *args, **kwargs):
+        if current_user.get('perfil') != PerfilUsuario.FUNCIONARIO.value:
+            return jsonify({'mensagem': 'Acesso negado. Apenas funcionários podem acessar'}), 403
+        return f(current_user, *args, **kwargs)
+    return decorated_function
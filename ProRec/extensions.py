@@ -2,30 +2,75 @@
 Flask extensions initialization.
 Extensions are initialized here and then imported by the application factory.
 """
+import sqlite3
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect
-from flask_migrate import Migrate
+
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from the 'replica' bind while `info['replica']` is set.
+
+    services.replica sets the flag for GET requests. Flushes and DML
+    statements always use the primary, and once the session has written,
+    its later reads do too, so a request sees its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if self._flushing or getattr(clause, 'is_dml', False):
+            self.info['wrote'] = True
+        elif bind is None and self.info.get('replica') and not self.info.get('wrote'):
+            replica = self._db.engines.get('replica')
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper, clause, bind, **kwargs)
+
 
 # Initialize extensions (without app binding)
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 login_manager = LoginManager()
 csrf = CSRFProtect()
-migrate = Migrate()
 
 
-def init_extensions(app):
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection.
+
+    WAL lets readers (dashboards, the live updates poller) run while a write
+    is in progress, and busy_timeout makes concurrent writers wait for the
+    lock instead of failing with "database is locked".
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA busy_timeout=5000')
+    cursor.close()
+
+
+def init_extensions(app, migrations=True):
     """
     Initialize Flask extensions with the app instance.
 
     Args:
         app: Flask application instance
+        migrations: Set up Flask-Migrate (`flask db`); imported here because
+            Alembic alone takes longer to import than the rest of the app
     """
     # Initialize SQLAlchemy
     db.init_app(app)
 
     # Initialize Flask-Migrate
-    migrate.init_app(app, db)
+    if migrations:
+        from flask_migrate import Migrate
+        Migrate(app, db)
 
     # Initialize Flask-Login
     login_manager.init_app(app)
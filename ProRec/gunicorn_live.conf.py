@@ -0,0 +1,35 @@
+"""
+Gunicorn settings for live updates: `gunicorn -c gunicorn_live.conf.py wsgi:application`.
+
+Serves /api/stream next to the main server (gunicorn.conf.py); the reverse
+proxy routes that path here. An SSE connection stays open as long as the
+dashboard does, which would hold a gthread worker thread each. gevent
+workers hold a greenlet per connection instead, so a worker keeps up to
+LIVE_CONNECTIONS streams open while the hub's poller fans new events out
+to all of them from a single greenlet.
+
+The app is not preloaded: gevent patches threading, sockets and time in
+each worker before the app is imported, so the hub's locks and poller are
+cooperative from the start.
+
+Open streams never finish on their own, so on SIGTERM workers wait only
+LIVE_GRACEFUL_TIMEOUT seconds; clients reconnect and resume after
+Last-Event-ID.
+"""
+import os
+from flask.cli import load_dotenv
+
+load_dotenv()
+
+bind = os.environ.get('LIVE_BIND', '127.0.0.1:8001')
+workers = int(os.environ.get('LIVE_CONCURRENCY', 1))
+worker_class = 'gevent'
+worker_connections = int(os.environ.get('LIVE_CONNECTIONS', 1000))
+preload_app = False
+
+timeout = int(os.environ.get('WEB_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('LIVE_GRACEFUL_TIMEOUT', 5))
+keepalive = 5
+
+accesslog = os.environ.get('ACCESS_LOG') or None
+errorlog = '-'
@@ -0,0 +1,29 @@
+"""
+Maintenance entry point: `python manage.py <group> <command>`.
+
+Runs the same command groups as `flask <group> <command>`, but builds the
+app once, without route modules, error pages or Flask-Migrate, and imports
+only the invoked group's module. Use it for cron jobs, e.g.
+`python manage.py archive run`; `flask db ...` and `flask run` still go
+through the full app.
+"""
+from flask.cli import ScriptInfo, load_dotenv
+from commands import LazyGroup
+
+
+def create_tooling_app():
+    """The app as maintenance commands need it (see create_app(serve=False))."""
+    from app import create_app
+    return create_app(serve=False)
+
+
+cli = LazyGroup(help='ProRec maintenance commands.')
+
+
+def main():
+    load_dotenv()
+    cli(obj=ScriptInfo(create_app=create_tooling_app))
+
+
+if __name__ == '__main__':
+    main()
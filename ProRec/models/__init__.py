@@ -4,14 +4,31 @@ Import all models here for easier access.
 """
 from models.user import User, TipoUsuario, StatusUsuario, Notificacao, TipoNotificacao
 from models.material import Material, StatusMaterial, CategoriaMaterial
-from models.space import Space, TipoEspaco
-from models.event import Event, TipoEvento, StatusEvento
+from models.space import Space, SpaceHoursException, TipoEspaco
+from models.event import Event, EventException, TipoEvento, StatusEvento
 from models.achievement import Achievement, Collection
+from models.points import PointsLedger, MotivoPontos
+from models.rollup import CollectionRollup
+from models.job import Job, StatusJob
+from models.stream import StreamEvent
+from models.change_log import ChangeLog, ChangeLogWatermark, OperacaoChange
+from models.archive import (
+    ArchiveWatermark, ArchivedMaterial, ArchivedCollection, ArchivedNotificacao
+)
+from models.residuo import (
+    Usuario, Residuo, ReservaResiduo, FilaEsperaResiduo, PerfilUsuario, StatusReserva
+)
+from models.idempotency import IdempotencyKey, StatusIdempotencia
 
 __all__ = [
     'User', 'TipoUsuario', 'StatusUsuario', 'Notificacao', 'TipoNotificacao',
     'Material', 'StatusMaterial', 'CategoriaMaterial',
-    'Space', 'TipoEspaco',
-    'Event', 'TipoEvento', 'StatusEvento',
-    'Achievement', 'Collection'
+    'Space', 'SpaceHoursException', 'TipoEspaco',
+    'Event', 'EventException', 'TipoEvento', 'StatusEvento',
+    'Achievement', 'Collection',
+    'PointsLedger', 'MotivoPontos', 'CollectionRollup', 'Job', 'StatusJob',
+    'StreamEvent', 'ChangeLog', 'ChangeLogWatermark', 'OperacaoChange',
+    'ArchiveWatermark', 'ArchivedMaterial', 'ArchivedCollection', 'ArchivedNotificacao',
+    'Usuario', 'Residuo', 'ReservaResiduo', 'FilaEsperaResiduo', 'PerfilUsuario', 'StatusReserva',
+    'IdempotencyKey', 'StatusIdempotencia'
 ]
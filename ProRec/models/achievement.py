@@ -2,7 +2,10 @@
 Achievement model - Gamification achievements for producers.
 """
 from datetime import datetime
+from sqlalchemy.orm import validates
 from extensions import db
+from models.material import CATEGORIA_DISPLAY
+from models.quantities import parse_quantidade
 
 
 class Achievement(db.Model):
@@ -41,11 +44,18 @@ class Collection(db.Model):
     Collection model - records of completed material collections.
     """
     __tablename__ = 'collections'
+    __table_args__ = (
+        # Quantity totals by category and unit in a period (covering)
+        db.Index('ix_collections_data_categoria_unidade_valor',
+                 'data_coleta', 'categoria', 'unidade', 'quantidade_valor'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     material_nome = db.Column(db.String(200), nullable=False)
     categoria = db.Column(db.String(50), nullable=False)
     quantidade = db.Column(db.String(100), nullable=True)
+    quantidade_valor = db.Column(db.Float, nullable=True)  # in the canonical unit below
+    unidade = db.Column(db.String(5), nullable=True)  # 'kg', 'l' or 'un'
     pontos = db.Column(db.Integer, default=0, nullable=False)
     feedback = db.Column(db.Text, nullable=True)
 
@@ -65,15 +75,13 @@ class Collection(db.Model):
 
     def get_categoria_display(self):
         """Return human-readable category name."""
-        categoria_map = {
-            'plastico': 'Plástico',
-            'vidro': 'Vidro',
-            'papel': 'Papel',
-            'metal': 'Metal',
-            'eletronicos': 'Eletrônicos',
-            'organico': 'Orgânico'
-        }
-        return categoria_map.get(self.categoria, self.categoria.capitalize())
+        return CATEGORIA_DISPLAY.get(self.categoria, self.categoria.capitalize())
+
+    @validates('quantidade')
+    def _sync_quantidade_valor(self, key, quantidade):
+        """Keep the numeric quantity in sync with the free-text one."""
+        self.quantidade_valor, self.unidade = parse_quantidade(quantidade) or (None, None)
+        return quantidade
 
     def to_dict(self):
         """Convert collection to dictionary for JSON serialization."""
@@ -83,6 +91,8 @@ class Collection(db.Model):
             'category': self.get_categoria_display(),
             'category_value': self.categoria,
             'quantity': self.quantidade,
+            'quantity_value': self.quantidade_valor,
+            'quantity_unit': self.unidade,
             'points': self.pontos,
             'feedback': self.feedback,
             'date': self.data_coleta.strftime('%Y-%m-%d') if self.data_coleta else None
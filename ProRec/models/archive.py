@@ -0,0 +1,62 @@
+"""
+Archive models - Cold storage for old reviewed materials, collections and
+read notifications.
+
+Each *_archive table has the columns of its hot table (without foreign
+keys or defaults) and only the indexes the fall-through reads need. The
+Archived* aliases map the hot models onto them, so archive queries are
+written with the same attributes; rows loaded through them are read-only.
+"""
+from sqlalchemy.orm import aliased
+from extensions import db
+from models.material import Material
+from models.achievement import Collection
+from models.user import Notificacao
+
+
+def _archive_table(model, *indexes):
+    """Table with the same columns as a model's table, named <table>_archive."""
+    columns = [db.Column(column.name, column.type, primary_key=column.primary_key,
+                         nullable=column.nullable)
+               for column in model.__table__.columns]
+    return db.Table(f'{model.__tablename__}_archive', db.metadata, *columns, *indexes)
+
+
+materials_archive = _archive_table(
+    Material,
+    db.Index('ix_materials_archive_produtor_criado', 'produtor_id', 'criado_em'),
+    db.Index('ix_materials_archive_curador_revisado', 'curador_id', 'revisado_em'),
+    db.Index('ix_materials_archive_criado_em', 'criado_em')
+)
+
+collections_archive = _archive_table(
+    Collection,
+    db.Index('ix_collections_archive_produtor_data', 'produtor_id', 'data_coleta'),
+    db.Index('ix_collections_archive_data_categoria_unidade_valor',
+             'data_coleta', 'categoria', 'unidade', 'quantidade_valor')
+)
+
+notificacoes_archive = _archive_table(
+    Notificacao,
+    db.Index('ix_notificacoes_archive_usuario_criada', 'usuario_id', 'criada_em')
+)
+
+ArchivedMaterial = aliased(Material, materials_archive, adapt_on_names=True)
+ArchivedCollection = aliased(Collection, collections_archive, adapt_on_names=True)
+ArchivedNotificacao = aliased(Notificacao, notificacoes_archive, adapt_on_names=True)
+
+
+class ArchiveWatermark(db.Model):
+    """
+    ArchiveWatermark model - how far back a table has been archived.
+
+    Every archived row is dated before `ate`, so reads that stay after it
+    never need the archive.
+    """
+    __tablename__ = 'archive_watermarks'
+
+    tabela = db.Column(db.String(50), primary_key=True)
+    ate = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<ArchiveWatermark {self.tabela} {self.ate}>'
@@ -0,0 +1,149 @@
+"""
+Change log model - Change-data-capture feed for incremental client sync.
+"""
+from datetime import datetime
+from enum import Enum
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from extensions import db
+
+# Tables that are infrastructure or derived data, not synced entities; the
+# JWT API's tables, whose accounts dashboard users must not see; and each
+# user's notifications and points ledger, which are private to the user
+# (read through the inbox and points history APIs) and must not reach the
+# admin feed
+UNTRACKED_TABLES = {
+    'change_log', 'change_log_watermark', 'stream_events', 'collection_rollups', 'jobs',
+    'archive_watermarks', 'usuarios', 'residuos', 'reservas_residuo', 'fila_espera_residuo',
+    'idempotency_keys', 'notificacoes', 'points_ledger'
+}
+
+
+class OperacaoChange(str, Enum):
+    """Change operation enumeration."""
+    INSERT = 'insert'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    ARCHIVE = 'archive'  # moved to the archive table (services.archive); still readable
+
+
+class ChangeLog(db.Model):
+    """
+    ChangeLog model - one insert/update/delete of a tracked row.
+
+    seq is monotonically increasing (AUTOINCREMENT, never reused), so
+    clients can ask for everything after the last seq they have seen.
+    """
+    __tablename__ = 'change_log'
+    __table_args__ = (
+        db.Index('ix_change_log_entidade_seq', 'entidade', 'entidade_id', 'seq'),
+        {'sqlite_autoincrement': True}
+    )
+
+    seq = db.Column(db.Integer, primary_key=True)
+    entidade = db.Column(db.String(50), nullable=False)  # table name, e.g. 'spaces'
+    entidade_id = db.Column(db.Integer, nullable=False)
+    operacao = db.Column(db.String(10), nullable=False)
+    criado_em = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<ChangeLog {self.seq} {self.operacao} {self.entidade}#{self.entidade_id}>'
+
+    def to_dict(self):
+        """Convert change to dictionary for JSON serialization."""
+        return {
+            'seq': self.seq,
+            'type': self.entidade,
+            'id': self.entidade_id,
+            'op': self.operacao
+        }
+
+
+class ChangeLogWatermark(db.Model):
+    """
+    ChangeLogWatermark model - single row with the highest seq removed by
+    age truncation. Clients behind it must reload instead of syncing.
+    """
+    __tablename__ = 'change_log_watermark'
+
+    id = db.Column(db.Integer, primary_key=True)
+    seq = db.Column(db.Integer, default=0, nullable=False)
+
+
+def log_changes(session, table, ids, operacao):
+    """
+    Append ChangeLog rows for rows a Core statement on a Table wrote.
+
+    Neither listener below sees those statements, so their callers log
+    them, in the same transaction.
+    """
+    if table in UNTRACKED_TABLES or not ids:
+        return
+    now = datetime.utcnow()
+    session.execute(ChangeLog.__table__.insert(), [
+        {'entidade': table, 'entidade_id': entidade_id, 'operacao': operacao, 'criado_em': now}
+        for entidade_id in ids
+    ])
+
+
+@event.listens_for(Session, 'after_flush')
+def record_changes(session, flush_context):
+    """
+    Append a ChangeLog row for every tracked row the flush wrote.
+
+    Runs inside the flush, so the log commits or rolls back together with
+    the change. Bulk statements bypass the unit of work; see
+    record_bulk_changes and log_changes.
+    """
+    now = datetime.utcnow()
+    rows = []
+    for operacao, instances in ((OperacaoChange.INSERT.value, session.new),
+                                (OperacaoChange.UPDATE.value, session.dirty),
+                                (OperacaoChange.DELETE.value, session.deleted)):
+        for instance in instances:
+            table = getattr(instance, '__tablename__', None)
+            if table is None or table in UNTRACKED_TABLES:
+                continue
+            if operacao == OperacaoChange.UPDATE.value and \
+                    not session.is_modified(instance, include_collections=False):
+                continue
+            rows.append({'entidade': table, 'entidade_id': instance.id,
+                         'operacao': operacao, 'criado_em': now})
+
+    if rows:
+        session.connection().execute(ChangeLog.__table__.insert(), rows)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def record_bulk_changes(state):
+    """
+    Append ChangeLog rows for the rows an ORM bulk UPDATE or DELETE wrote.
+
+    Covers session.execute(update(Model)...), including bulk updates by
+    primary key, and query.update()/delete(). The matched ids are read
+    before the statement runs, in its transaction. Statements executed with
+    execution_options(change_log=False) are not logged.
+    """
+    if not (state.is_update or state.is_delete) or not state.is_orm_statement:
+        return None
+    table = state.statement.table
+    mapper = state.bind_mapper
+    if mapper is None or mapper.local_table.name != table.name or table.name in UNTRACKED_TABLES:
+        return None  # e.g. an Archived* alias, or an untracked model
+    if not state.execution_options.get('change_log', True):
+        return None
+
+    if isinstance(state.parameters, list):
+        # Bulk UPDATE by primary key: one parameter set per row
+        ids = [params['id'] for params in state.parameters]
+    else:
+        matched = select(table.c.id)
+        if state.statement.whereclause is not None:
+            matched = matched.where(state.statement.whereclause)
+        connection = state.session.connection(bind_arguments=state.bind_arguments)
+        ids = connection.execute(matched).scalars().all()
+
+    result = state.invoke_statement()
+    operacao = OperacaoChange.UPDATE.value if state.is_update else OperacaoChange.DELETE.value
+    log_changes(state.session, table.name, ids, operacao)
+    return result
@@ -4,6 +4,7 @@ Event model - Events and activities related to recycling.
 from datetime import datetime
 from enum import Enum
 from extensions import db
+from models.recurrence import parse_rrule, series_end
 
 
 class TipoEvento(str, Enum):
@@ -22,11 +23,34 @@ class StatusEvento(str, Enum):
     CANCELADO = 'cancelado'
 
 
+TIPO_DISPLAY = {
+    TipoEvento.COLETA.value: 'Coleta',
+    TipoEvento.EVENTO.value: 'Evento',
+    TipoEvento.CURSO.value: 'Curso',
+    TipoEvento.WORKSHOP.value: 'Workshop'
+}
+
+STATUS_DISPLAY = {
+    StatusEvento.AGENDADO.value: 'Programado',
+    StatusEvento.EM_ANDAMENTO.value: 'Em andamento',
+    StatusEvento.CONCLUIDO.value: 'Concluído',
+    StatusEvento.CANCELADO.value: 'Cancelado'
+}
+
+
 class Event(db.Model):
     """
     Event model - represents scheduled recycling events and activities.
     """
     __tablename__ = 'events'
+    __table_args__ = (
+        # Calendar range queries filter by start date and status
+        db.Index('ix_events_data_inicio_status', 'data_inicio', 'status'),
+        # Only recurring series have recorrencia_fim set
+        db.Index('ix_events_recorrencia_fim', 'recorrencia_fim'),
+        # Space booking conflict checks scan a bounded start range per space
+        db.Index('ix_events_espaco_id_data_inicio', 'espaco_id', 'data_inicio'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     titulo = db.Column(db.String(200), nullable=False)
@@ -39,6 +63,10 @@ class Event(db.Model):
     data_fim = db.Column(db.DateTime, nullable=True)
     horario = db.Column(db.String(50), nullable=True)
 
+    # Recurrence (RRULE subset, see models/recurrence.py)
+    recorrencia = db.Column(db.String(200), nullable=True)
+    recorrencia_fim = db.Column(db.DateTime, nullable=True)  # End of the last occurrence
+
     # Location (can be linked to a space or have custom location)
     espaco_id = db.Column(db.Integer, db.ForeignKey('spaces.id'), nullable=True)
     localizacao_custom = db.Column(db.String(300), nullable=True)
@@ -48,29 +76,19 @@ class Event(db.Model):
 
     # Relationships
     espaco = db.relationship('Space', back_populates='eventos')
+    excecoes = db.relationship('EventException', back_populates='evento',
+                               lazy='dynamic', cascade='all, delete-orphan')
 
     def __repr__(self):
         return f'<Event {self.titulo} ({self.tipo})>'
 
     def get_tipo_display(self):
         """Return human-readable type name."""
-        tipo_map = {
-            TipoEvento.COLETA.value: 'Coleta',
-            TipoEvento.EVENTO.value: 'Evento',
-            TipoEvento.CURSO.value: 'Curso',
-            TipoEvento.WORKSHOP.value: 'Workshop'
-        }
-        return tipo_map.get(self.tipo, 'Desconhecido')
-
-    def get_status_display(self):
-        """Return human-readable status name."""
-        status_map = {
-            StatusEvento.AGENDADO.value: 'Programado',
-            StatusEvento.EM_ANDAMENTO.value: 'Em andamento',
-            StatusEvento.CONCLUIDO.value: 'Concluído',
-            StatusEvento.CANCELADO.value: 'Cancelado'
-        }
-        return status_map.get(self.status, 'Desconhecido')
+        return TIPO_DISPLAY.get(self.tipo, 'Desconhecido')
+
+    def get_status_display(self, status=None):
+        """Return human-readable status name (of status, or of this event)."""
+        return STATUS_DISPLAY.get(status or self.status, 'Desconhecido')
 
     def get_localizacao(self):
         """Return event location (from space or custom)."""
@@ -78,6 +96,23 @@ class Event(db.Model):
             return self.espaco.nome
         return self.localizacao_custom or 'Local não definido'
 
+    def set_recorrencia(self, rule):
+        """
+        Set (or clear) the recurrence rule of this event.
+
+        Raises:
+            ValueError: if the rule is invalid
+        """
+        if not rule:
+            self.recorrencia = None
+            self.recorrencia_fim = None
+            return
+
+        parse_rrule(rule)
+        duration = self.data_fim - self.data_inicio if self.data_fim else None
+        self.recorrencia = rule.upper().replace('RRULE:', '')
+        self.recorrencia_fim = series_end(self.recorrencia, self.data_inicio, duration)
+
     def to_dict(self):
         """Convert event to dictionary for JSON serialization."""
         return {
@@ -92,5 +127,53 @@ class Event(db.Model):
             'date_iso': self.data_inicio.isoformat() if self.data_inicio else None,
             'time': self.horario,
             'location': self.get_localizacao(),
-            'space_id': self.espaco_id
+            'space_id': self.espaco_id,
+            'recurrence': self.recorrencia
+        }
+
+
+class EventException(db.Model):
+    """
+    EventException model - cancels or overrides one occurrence of a recurring event.
+    """
+    __tablename__ = 'event_exceptions'
+    __table_args__ = (
+        db.UniqueConstraint('evento_id', 'data_original', name='uq_event_exceptions_occurrence'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    evento_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
+    data_original = db.Column(db.DateTime, nullable=False)  # Start the rule generated
+    cancelada = db.Column(db.Boolean, default=False, nullable=False)
+
+    # Overrides (None keeps the series value)
+    titulo = db.Column(db.String(200), nullable=True)
+    descricao = db.Column(db.Text, nullable=True)
+    data_inicio = db.Column(db.DateTime, nullable=True, index=True)
+    data_fim = db.Column(db.DateTime, nullable=True)
+    horario = db.Column(db.String(50), nullable=True)
+    status = db.Column(db.String(20), nullable=True)
+
+    # Timestamps
+    criado_em = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    evento = db.relationship('Event', back_populates='excecoes')
+
+    def __repr__(self):
+        return f'<EventException {self.evento_id} @ {self.data_original}>'
+
+    def to_dict(self):
+        """Convert exception to dictionary for JSON serialization."""
+        return {
+            'id': self.id,
+            'event_id': self.evento_id,
+            'occurrence_date': self.data_original.isoformat(),
+            'cancelled': self.cancelada,
+            'title': self.titulo,
+            'description': self.descricao,
+            'date_iso': self.data_inicio.isoformat() if self.data_inicio else None,
+            'end_iso': self.data_fim.isoformat() if self.data_fim else None,
+            'time': self.horario,
+            'status': self.status
         }
@@ -0,0 +1,42 @@
+"""
+Idempotency model - Stored responses of POSTs sent with an Idempotency-Key.
+"""
+from datetime import datetime
+from enum import Enum
+from extensions import db
+
+
+class StatusIdempotencia(str, Enum):
+    """Idempotency key status enumeration."""
+    EM_ANDAMENTO = 'em_andamento'  # first request still running
+    CONCLUIDA = 'concluida'        # response stored, replayed to duplicates
+
+
+class IdempotencyKey(db.Model):
+    """
+    IdempotencyKey model - one key sent by one client to one endpoint.
+
+    The unique (escopo, chave) pair is the lock: the request whose INSERT
+    commits first runs the view, the others get its stored response.
+    """
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (
+        db.UniqueConstraint('escopo', 'chave'),
+        db.Index('ix_idempotency_keys_expira_em', 'expira_em'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    escopo = db.Column(db.String(200), nullable=False)  # endpoint and client
+    chave = db.Column(db.String(255), nullable=False)
+    request_hash = db.Column(db.String(64), nullable=False)  # sha256 of method, path and body
+
+    status = db.Column(db.String(15), default=StatusIdempotencia.EM_ANDAMENTO.value, nullable=False)
+    status_code = db.Column(db.Integer, nullable=True)
+    corpo = db.Column(db.LargeBinary, nullable=True)
+    mimetype = db.Column(db.String(100), nullable=True)
+
+    criado_em = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expira_em = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<IdempotencyKey {self.escopo} {self.chave} ({self.status})>'
@@ -0,0 +1,63 @@
+"""
+Job model - Durable queue of background side effects.
+"""
+from datetime import datetime
+from enum import Enum
+from extensions import db
+
+
+class StatusJob(str, Enum):
+    """Job status enumeration."""
+    PENDENTE = 'pendente'
+    EXECUTANDO = 'executando'
+    CONCLUIDO = 'concluido'
+    FALHOU = 'falhou'  # dead letter: out of attempts, kept for inspection
+
+
+class Job(db.Model):
+    """
+    Job model - one unit of background work.
+
+    Workers claim a job with a single conditional UPDATE, so two workers
+    never run the same job. A job whose worker died is claimable again
+    once its lock is older than the lock timeout.
+    """
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        # Next claimable job
+        db.Index('ix_jobs_status_disponivel', 'status', 'disponivel_em'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    tipo = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON
+    chave = db.Column(db.String(200), unique=True, nullable=True)  # idempotency key
+
+    status = db.Column(db.String(15), default=StatusJob.PENDENTE.value, nullable=False)
+    tentativas = db.Column(db.Integer, default=0, nullable=False)
+    max_tentativas = db.Column(db.Integer, default=5, nullable=False)
+    ultimo_erro = db.Column(db.Text, nullable=True)
+
+    disponivel_em = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    travado_por = db.Column(db.String(100), nullable=True)
+    travado_em = db.Column(db.DateTime, nullable=True)
+    criado_em = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    concluido_em = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<Job {self.id} {self.tipo} ({self.status})>'
+
+    def to_dict(self):
+        """Convert job to dictionary for JSON serialization."""
+        return {
+            'id': self.id,
+            'type': self.tipo,
+            'key': self.chave,
+            'status': self.status,
+            'attempts': self.tentativas,
+            'max_attempts': self.max_tentativas,
+            'last_error': self.ultimo_erro,
+            'available_at': self.disponivel_em.isoformat() if self.disponivel_em else None,
+            'created_at': self.criado_em.isoformat() if self.criado_em else None,
+            'finished_at': self.concluido_em.isoformat() if self.concluido_em else None
+        }
@@ -3,7 +3,9 @@ Material model - Waste materials published by producers for recycling.
 """
 from datetime import datetime
 from enum import Enum
+from sqlalchemy.orm import validates
 from extensions import db
+from models.quantities import parse_quantidade
 
 
 class StatusMaterial(str, Enum):
@@ -23,11 +25,48 @@ class CategoriaMaterial(str, Enum):
     ORGANICO = 'organico'
 
 
+CATEGORIA_DISPLAY = {
+    CategoriaMaterial.PLASTICO.value: 'Plástico',
+    CategoriaMaterial.VIDRO.value: 'Vidro',
+    CategoriaMaterial.PAPEL.value: 'Papel',
+    CategoriaMaterial.METAL.value: 'Metal',
+    CategoriaMaterial.ELETRONICOS.value: 'Eletrônicos',
+    CategoriaMaterial.ORGANICO.value: 'Orgânico'
+}
+
+STATUS_DISPLAY = {
+    StatusMaterial.PENDING.value: 'Aguardando',
+    StatusMaterial.APPROVED.value: 'Aprovado',
+    StatusMaterial.REJECTED.value: 'Reprovado'
+}
+
+# Served by api.material_photo (files stored by services/photos.py)
+PHOTO_URL = '/api/photos'
+
+
+def foto_dict(foto_hash, formato, largura, altura):
+    """Photo size and URLs of a material, or None if it has no photo."""
+    if not foto_hash:
+        return None
+    return {
+        'hash': foto_hash,
+        'width': largura,
+        'height': altura,
+        'url': f'{PHOTO_URL}/original/{foto_hash}.{formato}',
+        'review_url': f'{PHOTO_URL}/review/{foto_hash}.jpg',
+        'thumbnail_url': f'{PHOTO_URL}/thumb/{foto_hash}.jpg'
+    }
+
+
 class Material(db.Model):
     """
     Material model - represents waste materials published by producers.
     """
     __tablename__ = 'materials'
+    __table_args__ = (
+        # Exports read materials in creation order, optionally by date range
+        db.Index('ix_materials_criado_em', 'criado_em'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     nome = db.Column(db.String(200), nullable=False)
@@ -35,12 +74,20 @@ class Material(db.Model):
     descricao = db.Column(db.Text, nullable=True)
     localizacao = db.Column(db.String(300), nullable=False)
     quantidade = db.Column(db.String(100), nullable=True)
+    quantidade_valor = db.Column(db.Float, nullable=True)  # in the canonical unit below
+    unidade = db.Column(db.String(5), nullable=True)  # 'kg', 'l' or 'un'
 
     # Status and review
     status = db.Column(db.String(20), default=StatusMaterial.PENDING.value, nullable=False)
     feedback = db.Column(db.Text, nullable=True)
     pontos_concedidos = db.Column(db.Integer, default=0, nullable=False)
 
+    # Photo: sha256 of the stored original, its format and size in pixels
+    foto_hash = db.Column(db.String(64), nullable=True)
+    foto_formato = db.Column(db.String(4), nullable=True)  # 'jpg', 'png' or 'gif'
+    foto_largura = db.Column(db.Integer, nullable=True)
+    foto_altura = db.Column(db.Integer, nullable=True)
+
     # Relationships
     produtor_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     curador_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
@@ -58,24 +105,17 @@ class Material(db.Model):
 
     def get_categoria_display(self):
         """Return human-readable category name."""
-        categoria_map = {
-            CategoriaMaterial.PLASTICO.value: 'Plástico',
-            CategoriaMaterial.VIDRO.value: 'Vidro',
-            CategoriaMaterial.PAPEL.value: 'Papel',
-            CategoriaMaterial.METAL.value: 'Metal',
-            CategoriaMaterial.ELETRONICOS.value: 'Eletrônicos',
-            CategoriaMaterial.ORGANICO.value: 'Orgânico'
-        }
-        return categoria_map.get(self.categoria, self.categoria.capitalize())
+        return CATEGORIA_DISPLAY.get(self.categoria, self.categoria.capitalize())
 
     def get_status_display(self):
         """Return human-readable status name."""
-        status_map = {
-            StatusMaterial.PENDING.value: 'Aguardando',
-            StatusMaterial.APPROVED.value: 'Aprovado',
-            StatusMaterial.REJECTED.value: 'Reprovado'
-        }
-        return status_map.get(self.status, 'Desconhecido')
+        return STATUS_DISPLAY.get(self.status, 'Desconhecido')
+
+    @validates('quantidade')
+    def _sync_quantidade_valor(self, key, quantidade):
+        """Keep the numeric quantity in sync with the free-text one."""
+        self.quantidade_valor, self.unidade = parse_quantidade(quantidade) or (None, None)
+        return quantidade
 
     def to_dict(self):
         """Convert material to dictionary for JSON serialization."""
@@ -87,6 +127,8 @@ class Material(db.Model):
             'description': self.descricao,
             'location': self.localizacao,
             'quantity': self.quantidade,
+            'quantity_value': self.quantidade_valor,
+            'quantity_unit': self.unidade,
             'status': self.status,
             'status_display': self.get_status_display(),
             'feedback': self.feedback,
@@ -95,5 +137,6 @@ class Material(db.Model):
             'producer_id': self.produtor_id,
             'curator_id': self.curador_id,
             'date': self.criado_em.strftime('%d/%m/%Y') if self.criado_em else None,
-            'reviewed_date': self.revisado_em.strftime('%d/%m/%Y') if self.revisado_em else None
+            'reviewed_date': self.revisado_em.strftime('%d/%m/%Y') if self.revisado_em else None,
+            'photo': foto_dict(self.foto_hash, self.foto_formato, self.foto_largura, self.foto_altura)
         }
@@ -0,0 +1,197 @@
+"""
+Opening hours - Weekly hour bitmaps parsed from free-text hours.
+
+A space's weekly hours are a 168-bit mask: bit (weekday * 24 + hour) is set
+when the space is open during that hour, Monday 00h being bit 0. Holiday
+exceptions replace a whole day with a 24-bit day mask. Space parses its
+hours on assignment, so the parser lives with the model; the "open now"
+index is in services/opening_hours.py.
+"""
+import re
+import unicodedata
+
+HOURS_PER_DAY = 24
+HOURS_PER_WEEK = 7 * HOURS_PER_DAY
+DAY_MASK = (1 << HOURS_PER_DAY) - 1
+WEEKEND_HOURS = range(5 * HOURS_PER_DAY, HOURS_PER_WEEK)
+MASK_BYTES = HOURS_PER_WEEK // 8
+
+DAY_NAMES = ('seg', 'ter', 'qua', 'qui', 'sex', 'sab', 'dom')
+
+_DAY_ALIASES = {
+    'seg': 0, 'segunda': 0,
+    'ter': 1, 'terca': 1,
+    'qua': 2, 'quarta': 2,
+    'qui': 3, 'quinta': 3,
+    'sex': 4, 'sexta': 4,
+    'sab': 5, 'sabado': 5,
+    'dom': 6, 'domingo': 6,
+}
+
+_DAY = r'(seg|ter|qua|qui|sex|sab|dom)[a-z]*(?:-feira)?'
+_DAYS_RE = re.compile(
+    r'(todos os dias|diariamente|' + _DAY + r'(?:\s*(?:-|a|ate|,|e)\s*' + _DAY + r')*)'
+)
+_HOURS_RE = re.compile(
+    r'(\d{1,2})(?:[:h](\d{2}))?h?\s*(?:-|as|a|ate)\s*(\d{1,2})(?:[:h](\d{2}))?h?'
+)
+
+
+def _normalize(text):
+    """Lowercase and strip accents ('Sáb' -> 'sab')."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def _parse_days(text):
+    """Parse a day expression like 'seg-sex', 'seg, qua e sex' or 'todos os dias'."""
+    if text.startswith(('todos', 'diariamente')):
+        return list(range(7))
+
+    tokens = re.findall(r'[a-z]+(?:-feira)?|-|,', text)
+    days = []
+    pending_range = False
+    for token in tokens:
+        if token in ('-', 'a', 'ate'):
+            pending_range = True
+            continue
+        if token in (',', 'e'):
+            continue
+        day = _DAY_ALIASES.get(token.replace('-feira', ''))
+        if day is None:
+            day = _DAY_ALIASES.get(token[:3])
+        if day is None:
+            continue
+        if pending_range and days:
+            first = days[-1]
+            span = (day - first) % 7
+            days.extend((first + offset) % 7 for offset in range(1, span + 1))
+        else:
+            days.append(day)
+        pending_range = False
+    return days
+
+
+def _hour_bits(start_hour, start_minute, end_hour, end_minute):
+    """Hours of the day touched by [start, end), spilling past midnight if needed."""
+    start = start_hour
+    end = end_hour + (1 if end_minute else 0)
+    if end <= start:
+        end += HOURS_PER_DAY
+    return range(start, min(end, start + HOURS_PER_DAY))
+
+
+def parse_horario(text):
+    """
+    Parse free-text opening hours into a weekly mask.
+
+    Understands the formats used in this project, e.g. 'Seg-Sex: 8h-18h',
+    'Seg-Sáb: 7h-19h', 'Todos os dias: 9h-17h' and several segments such as
+    'Seg-Sex: 8h-18h, Sáb: 8h-12h'. Partial hours are rounded outwards to
+    whole hours.
+
+    Returns:
+        int mask, or None when the text has no recognizable schedule
+    """
+    if not text:
+        return None
+
+    normalized = _normalize(text)
+    if '24h' in normalized.replace(' ', '') and not _HOURS_RE.search(normalized):
+        days_match = _DAYS_RE.search(normalized)
+        days = _parse_days(days_match.group(0)) if days_match else list(range(7))
+        return sum(DAY_MASK << (day * HOURS_PER_DAY) for day in days) or None
+
+    mask = 0
+    previous_end = 0
+    days = list(range(7))
+    for hours_match in _HOURS_RE.finditer(normalized):
+        # Days are written before their hours; a range without days reuses the last ones
+        days_match = _DAYS_RE.search(normalized, previous_end, hours_match.start())
+        if days_match:
+            days = _parse_days(days_match.group(0))
+        previous_end = hours_match.end()
+
+        start_hour, start_minute, end_hour, end_minute = (
+            int(value) if value else 0 for value in hours_match.groups()
+        )
+        if start_hour > 24 or end_hour > 24:
+            continue
+
+        for day in days:
+            for hour in _hour_bits(start_hour, start_minute, end_hour, end_minute):
+                mask |= 1 << ((day * HOURS_PER_DAY + hour) % HOURS_PER_WEEK)
+
+    return mask or None
+
+
+def parse_day_hours(text):
+    """
+    Parse the hours of a single day, e.g. '8h-12h' for a holiday exception.
+
+    Returns:
+        24-bit day mask, or None when the text has no recognizable hours
+    """
+    mask = parse_horario(text)
+    if mask is None:
+        return None
+    daily = 0
+    for weekday in range(7):
+        daily |= day_mask(mask, weekday)
+    return daily
+
+
+def mask_to_bytes(mask):
+    """Serialize a weekly mask for storage."""
+    return None if mask is None else mask.to_bytes(MASK_BYTES, 'little')
+
+
+def mask_from_bytes(value):
+    """Deserialize a stored weekly mask."""
+    return None if value is None else int.from_bytes(value, 'little')
+
+
+def hour_of_week(moment):
+    """Bit index of a datetime inside the weekly mask."""
+    return moment.weekday() * HOURS_PER_DAY + moment.hour
+
+
+def day_mask(mask, weekday):
+    """Extract the 24-bit mask of one weekday."""
+    return (mask >> (weekday * HOURS_PER_DAY)) & DAY_MASK
+
+
+def day_open_ranges(daily):
+    """
+    Turn a 24-bit day mask into contiguous (start_hour, end_hour) ranges.
+
+    Example: 8h-12h and 14h-18h -> [(8, 12), (14, 18)]
+    """
+    ranges = []
+    hour = 0
+    while hour < HOURS_PER_DAY:
+        if daily >> hour & 1:
+            start = hour
+            while hour < HOURS_PER_DAY and daily >> hour & 1:
+                hour += 1
+            ranges.append((start, hour))
+        else:
+            hour += 1
+    return ranges
+
+
+def describe_mask(mask):
+    """
+    Structured view of a weekly mask for JSON output.
+
+    Returns:
+        Dict like {'seg': ['08:00-18:00'], ...} with only open days, or None
+    """
+    if mask is None:
+        return None
+    result = {}
+    for weekday, name in enumerate(DAY_NAMES):
+        ranges = day_open_ranges(day_mask(mask, weekday))
+        if ranges:
+            result[name] = [f'{start:02d}:00-{end:02d}:00' for start, end in ranges]
+    return result
@@ -0,0 +1,67 @@
+"""
+Points ledger model - Append-only history of every points change.
+"""
+from datetime import datetime
+from enum import Enum
+from extensions import db
+
+
+class MotivoPontos(str, Enum):
+    """Reason of a ledger entry."""
+    SALDO_INICIAL = 'saldo_inicial'
+    MATERIAL_APROVADO = 'material_aprovado'
+    COLETA = 'coleta'
+    AJUSTE = 'ajuste'
+    ESTORNO = 'estorno'
+
+
+class PointsLedger(db.Model):
+    """
+    PointsLedger model - one award or reversal of points.
+
+    Rows are never updated or deleted. saldo is the user's balance right
+    after the entry, so every row doubles as a balance snapshot.
+    """
+    __tablename__ = 'points_ledger'
+    __table_args__ = (
+        # Balance at a point in time
+        db.Index('ix_points_ledger_usuario_criado', 'usuario_id', 'criado_em'),
+        # Per-user history, newest first
+        db.Index('ix_points_ledger_usuario_id', 'usuario_id', 'id'),
+        # Points earned per producer in a period (weekly/monthly leaderboards, covering)
+        db.Index('ix_points_ledger_criado_em', 'criado_em', 'usuario_id', 'delta'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    usuario_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    delta = db.Column(db.Integer, nullable=False)
+    saldo = db.Column(db.Integer, nullable=False)
+    motivo = db.Column(db.String(30), nullable=False)
+    referencia_id = db.Column(db.Integer, nullable=True)  # e.g. material id
+    criado_em = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<PointsLedger {self.usuario_id} {self.delta:+d} = {self.saldo}>'
+
+    def get_motivo_display(self):
+        """Return human-readable reason."""
+        motivo_map = {
+            MotivoPontos.SALDO_INICIAL.value: 'Saldo inicial',
+            MotivoPontos.MATERIAL_APROVADO.value: 'Material aprovado',
+            MotivoPontos.COLETA.value: 'Coleta',
+            MotivoPontos.AJUSTE.value: 'Ajuste',
+            MotivoPontos.ESTORNO.value: 'Estorno'
+        }
+        return motivo_map.get(self.motivo, 'Desconhecido')
+
+    def to_dict(self):
+        """Convert entry to dictionary for JSON serialization."""
+        return {
+            'id': self.id,
+            'delta': self.delta,
+            'balance': self.saldo,
+            'reason': self.motivo,
+            'reason_display': self.get_motivo_display(),
+            'reference_id': self.referencia_id,
+            'date': self.criado_em.isoformat()
+        }
@@ -0,0 +1,85 @@
+"""
+Quantity parsing - Normalization of free-text quantities ("10 unidades", "2,5 kg").
+
+Quantities are stored as text for display plus a numeric value in a
+canonical unit (kg, l or un), so totals by category are a plain SQL SUM.
+Material and Collection parse on assignment, so the parser lives with them.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+UNIDADE_KG = 'kg'
+UNIDADE_LITRO = 'l'
+UNIDADE_UNIDADE = 'un'
+
+UNIDADES = (UNIDADE_KG, UNIDADE_LITRO, UNIDADE_UNIDADE)
+
+# Written unit -> (canonical unit, factor to the canonical unit)
+CONVERSOES = {
+    'kg': (UNIDADE_KG, 1), 'kgs': (UNIDADE_KG, 1), 'quilo': (UNIDADE_KG, 1),
+    'kilo': (UNIDADE_KG, 1), 'quilograma': (UNIDADE_KG, 1), 'kilograma': (UNIDADE_KG, 1),
+    'g': (UNIDADE_KG, 0.001), 'gr': (UNIDADE_KG, 0.001), 'grama': (UNIDADE_KG, 0.001),
+    't': (UNIDADE_KG, 1000), 'ton': (UNIDADE_KG, 1000), 'tonelada': (UNIDADE_KG, 1000),
+    'l': (UNIDADE_LITRO, 1), 'lt': (UNIDADE_LITRO, 1), 'litro': (UNIDADE_LITRO, 1),
+    'ml': (UNIDADE_LITRO, 0.001), 'mililitro': (UNIDADE_LITRO, 0.001),
+    'un': (UNIDADE_UNIDADE, 1), 'und': (UNIDADE_UNIDADE, 1), 'unid': (UNIDADE_UNIDADE, 1),
+    'unidade': (UNIDADE_UNIDADE, 1), 'peca': (UNIDADE_UNIDADE, 1), 'pc': (UNIDADE_UNIDADE, 1),
+    'item': (UNIDADE_UNIDADE, 1), 'itens': (UNIDADE_UNIDADE, 1),
+    # Counted containers
+    'garrafa': (UNIDADE_UNIDADE, 1), 'lata': (UNIDADE_UNIDADE, 1),
+    'saco': (UNIDADE_UNIDADE, 1), 'sacola': (UNIDADE_UNIDADE, 1),
+    'caixa': (UNIDADE_UNIDADE, 1), 'fardo': (UNIDADE_UNIDADE, 1),
+    'aparelho': (UNIDADE_UNIDADE, 1),
+}
+
+# '1.500,5' (pt-BR thousands dots), '2,5', '2.5' or '10', then an optional word
+_THOUSANDS = r'\d{1,3}(?:\.\d{3})+(?:,\d+)?'
+_QUANTITY_RE = re.compile(r'(' + _THOUSANDS + r'|\d+(?:[.,]\d+)?)\s*([a-z]*)')
+_THOUSANDS_RE = re.compile(_THOUSANDS)
+
+
+def _normalize(text):
+    """Lowercase and strip accents ('Peças' -> 'pecas')."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def _number(text):
+    if _THOUSANDS_RE.fullmatch(text):
+        text = text.replace('.', '')
+    return float(text.replace(',', '.'))
+
+
+def _unit(word):
+    """Canonical unit and factor of a written unit, trying the singular too."""
+    if not word:
+        return UNIDADE_UNIDADE, 1  # a bare number counts items
+    conversion = CONVERSOES.get(word)
+    if conversion is None and word.endswith('s'):
+        conversion = CONVERSOES.get(word[:-1])
+    return conversion
+
+
+@lru_cache(maxsize=4096)
+def parse_quantidade(text):
+    """
+    Parse a free-text quantity.
+
+    Args:
+        text: e.g. '10 unidades', '5kg', '2,5 toneladas', 'aprox. 500 g'
+
+    Returns:
+        Tuple (value, unit) in a canonical unit of UNIDADES, or None if the
+        text has no number or an unknown unit
+    """
+    if not text:
+        return None
+    match = _QUANTITY_RE.search(_normalize(text))
+    if match is None:
+        return None
+    conversion = _unit(match.group(2))
+    if conversion is None:
+        return None
+    unidade, factor = conversion
+    return round(_number(match.group(1)) * factor, 6), unidade
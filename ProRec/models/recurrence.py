@@ -0,0 +1,191 @@
+"""
+Recurrence rules - RRULE subset parsing and occurrence generation.
+
+Supported rule parts (RFC 5545 subset):
+    FREQ=DAILY|WEEKLY|MONTHLY, INTERVAL, COUNT, UNTIL,
+    BYDAY (weekly rules) and BYMONTHDAY (monthly rules)
+
+Event validates and bounds its series on assignment, so the rule logic
+lives with the model; expansion into query windows is in
+services/recurrence.py.
+"""
+from calendar import monthrange
+from datetime import datetime, timedelta
+from itertools import islice
+from math import lcm
+
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY')
+
+# Upper bound for COUNT, keeps finite series cheap to walk
+MAX_COUNT = 1000
+
+# Months after which the Gregorian calendar repeats itself
+GREGORIAN_CYCLE_MONTHS = 400 * 12
+
+# Stored as Event.recorrencia_fim for series without COUNT or UNTIL
+SERIES_OPEN_END = datetime(9999, 12, 31)
+
+
+def parse_rrule(rule):
+    """
+    Parse an RRULE string into a normalized, hashable tuple.
+
+    Args:
+        rule: e.g. 'FREQ=WEEKLY;BYDAY=MO,TH;UNTIL=20271231'
+
+    Returns:
+        Tuple (freq, interval, count, until, byday, bymonthday)
+
+    Raises:
+        ValueError: if the rule is malformed or uses unsupported parts
+    """
+    if rule.upper().startswith('RRULE:'):
+        rule = rule[6:]
+
+    parts = {}
+    for item in rule.strip().split(';'):
+        if not item:
+            continue
+        key, sep, value = item.partition('=')
+        if not sep or not value:
+            raise ValueError(f'Invalid rule part: {item}')
+        parts[key.strip().upper()] = value.strip().upper()
+
+    freq = parts.pop('FREQ', None)
+    if freq not in FREQUENCIES:
+        raise ValueError('FREQ must be one of ' + ', '.join(FREQUENCIES))
+
+    interval = int(parts.pop('INTERVAL', '1'))
+    if interval < 1:
+        raise ValueError('INTERVAL must be positive')
+
+    count = parts.pop('COUNT', None)
+    if count is not None:
+        count = int(count)
+        if not 1 <= count <= MAX_COUNT:
+            raise ValueError(f'COUNT must be between 1 and {MAX_COUNT}')
+
+    until = parts.pop('UNTIL', None)
+    if until is not None:
+        until = _parse_until(until)
+
+    if count is not None and until is not None:
+        raise ValueError('COUNT and UNTIL cannot be combined')
+
+    byday = parts.pop('BYDAY', None)
+    if byday is not None:
+        if freq != 'WEEKLY':
+            raise ValueError('BYDAY is only supported for WEEKLY rules')
+        try:
+            byday = tuple(sorted({WEEKDAYS.index(day) for day in byday.split(',')}))
+        except ValueError:
+            raise ValueError('BYDAY must list weekdays like MO,WE,FR')
+
+    bymonthday = parts.pop('BYMONTHDAY', None)
+    if bymonthday is not None:
+        if freq != 'MONTHLY':
+            raise ValueError('BYMONTHDAY is only supported for MONTHLY rules')
+        bymonthday = int(bymonthday)
+        if not 1 <= bymonthday <= 31:
+            raise ValueError('BYMONTHDAY must be between 1 and 31')
+
+    if parts:
+        raise ValueError('Unsupported rule parts: ' + ', '.join(sorted(parts)))
+
+    return freq, interval, count, until, byday, bymonthday
+
+
+def _parse_until(value):
+    """Parse an UNTIL value; a bare date covers the whole day."""
+    value = value.rstrip('Z')
+    if 'T' in value:
+        return datetime.strptime(value, '%Y%m%dT%H%M%S')
+    return datetime.strptime(value, '%Y%m%d') + timedelta(days=1) - timedelta(microseconds=1)
+
+
+def _iter_starts(parsed, dtstart, window_start=None):
+    """
+    Lazily yield occurrence starts in chronological order.
+
+    When the rule has no COUNT, whole periods before window_start are skipped
+    arithmetically instead of being generated.
+    """
+    freq, interval, count, until, byday, bymonthday = parsed
+    skip = window_start is not None and count is None and window_start > dtstart
+
+    if freq == 'DAILY':
+        step = timedelta(days=interval)
+        periods = (window_start - dtstart).days // interval if skip else 0
+        current = dtstart + step * periods
+        while True:
+            yield current
+            current += step
+
+    elif freq == 'WEEKLY':
+        days = byday or (dtstart.weekday(),)
+        week = dtstart - timedelta(days=dtstart.weekday())
+        step = timedelta(weeks=interval)
+        if skip:
+            week += step * max(0, (window_start - week).days // (7 * interval))
+        while True:
+            for weekday in days:
+                current = week + timedelta(days=weekday)
+                if current >= dtstart:
+                    yield current
+            week += step
+
+    else:  # MONTHLY
+        day = bymonthday or dtstart.day
+        # The months that have the day repeat every `period` months, so a
+        # series with no occurrence in a whole period has none left, e.g.
+        # yearly on 30 February, or every 24 months on 29 February from an
+        # odd year
+        period = lcm(interval, GREGORIAN_CYCLE_MONTHS)
+        months = 0
+        if skip:
+            elapsed = (window_start.year - dtstart.year) * 12 + window_start.month - dtstart.month
+            months = max(0, elapsed // interval - 1) * interval
+        last_hit = months
+        while months - last_hit <= period:
+            year, month = divmod(dtstart.month - 1 + months, 12)
+            year += dtstart.year
+            month += 1
+            if day <= monthrange(year, month)[1]:
+                current = dtstart.replace(year=year, month=month, day=day)
+                if current >= dtstart:
+                    last_hit = months
+                    yield current
+            months += interval
+
+
+def iter_occurrences(parsed, dtstart, window_start=None):
+    """Yield occurrence starts honouring COUNT and UNTIL."""
+    count, until = parsed[2], parsed[3]
+    starts = _iter_starts(parsed, dtstart, window_start)
+    if count is not None:
+        starts = islice(starts, count)
+    for current in starts:
+        if until is not None and current > until:
+            return
+        yield current
+
+
+def series_end(rule, dtstart, duration=None):
+    """
+    Compute when the last occurrence of a series ends.
+
+    Returns:
+        datetime, or SERIES_OPEN_END for unbounded series
+    """
+    parsed = parse_rrule(rule)
+    count, until = parsed[2], parsed[3]
+    if count is None and until is None:
+        return SERIES_OPEN_END
+
+    last = None
+    for last in iter_occurrences(parsed, dtstart):
+        pass
+    if last is None:
+        return dtstart
+    return last + (duration or timedelta(0))
@@ -0,0 +1,145 @@
+"""
+Residuo models - Accounts, waste stock, reservations and waiting lists of
+the JWT API (routes/residuos.py).
+
+These tables predate the dashboard models and keep their schema: API
+accounts (usuarios) are separate from dashboard users, and timestamps are
+stored as 'YYYY-MM-DD HH:MM:SS' text, as the API has always returned them.
+"""
+from datetime import datetime
+from enum import Enum
+from sqlalchemy.dialects import sqlite
+from extensions import db
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# DateTime stored without microseconds on SQLite, like CURRENT_TIMESTAMP
+Timestamp = db.DateTime().with_variant(
+    sqlite.DATETIME(storage_format='%(year)04d-%(month)02d-%(day)02d '
+                                   '%(hour)02d:%(minute)02d:%(second)02d'),
+    'sqlite'
+)
+
+
+def now():
+    """Local time, to the second, as stored in the timestamp columns."""
+    return datetime.now().replace(microsecond=0)
+
+
+class PerfilUsuario(str, Enum):
+    """API account profile enumeration."""
+    FUNCIONARIO = 'funcionario'
+    CLIENTE = 'cliente'
+
+
+class StatusReserva(str, Enum):
+    """Reservation status enumeration."""
+    ATIVA = 'ativa'
+    DEVOLVIDA = 'devolvida'
+
+
+class Usuario(db.Model):
+    """Usuario model - account of the JWT API (staff or client)."""
+    __tablename__ = 'usuarios'
+    __table_args__ = (
+        db.CheckConstraint("perfil IN ('funcionario', 'cliente')"),
+        {'sqlite_autoincrement': True}
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.Text, nullable=False)
+    email = db.Column(db.Text, unique=True, nullable=False)
+    senha = db.Column(db.Text, nullable=False)  # password hash
+    perfil = db.Column(db.Text, nullable=False)
+    telefone = db.Column(db.Text)
+    data_cadastro = db.Column(Timestamp, server_default=db.func.current_timestamp())
+
+    def __repr__(self):
+        return f'<Usuario {self.email}>'
+
+    def to_dict(self):
+        """Convert account to dictionary for JSON serialization (no password)."""
+        return {
+            'id': self.id,
+            'nome': self.nome,
+            'email': self.email,
+            'perfil': self.perfil,
+            'telefone': self.telefone,
+            'data_cadastro': self.data_cadastro.strftime(TIMESTAMP_FORMAT)
+            if self.data_cadastro else None
+        }
+
+
+class Residuo(db.Model):
+    """
+    Residuo model - a kind of waste in stock.
+
+    quantidade_disponivel is what can still be reserved; reservations take
+    one unit with a conditional UPDATE, so it never goes below zero.
+    """
+    __tablename__ = 'residuos'
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    categoria = db.Column(db.Text, nullable=False)
+    nome_residuo = db.Column(db.Text, nullable=False)
+    descricao = db.Column(db.Text)
+    quantidade_total = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    quantidade_disponivel = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    data_cadastro = db.Column(Timestamp, server_default=db.func.current_timestamp())
+
+    def __repr__(self):
+        return f'<Residuo {self.nome_residuo}>'
+
+    def to_dict(self):
+        """Convert waste to dictionary for JSON serialization."""
+        return {
+            'id': self.id,
+            'categoria': self.categoria,
+            'nome_residuo': self.nome_residuo,
+            'descricao': self.descricao,
+            'quantidade_total': self.quantidade_total,
+            'quantidade_disponivel': self.quantidade_disponivel
+        }
+
+
+class ReservaResiduo(db.Model):
+    """ReservaResiduo model - one unit of a waste reserved by an account."""
+    __tablename__ = 'reservas_residuo'
+    __table_args__ = (
+        db.CheckConstraint("status IN ('ativa', 'devolvida')"),
+        {'sqlite_autoincrement': True}
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    usuario_id = db.Column(db.Integer, db.ForeignKey('usuarios.id'), nullable=False)
+    residuos_id = db.Column(db.Integer, db.ForeignKey('residuos.id'), nullable=False)
+    data_retirada = db.Column(Timestamp, nullable=False)
+    data_devolucao = db.Column(Timestamp)
+    status = db.Column(db.Text, nullable=False)
+
+    def __repr__(self):
+        return f'<ReservaResiduo {self.usuario_id} {self.residuos_id} {self.status}>'
+
+
+class FilaEsperaResiduo(db.Model):
+    """
+    FilaEsperaResiduo model - an account waiting for an out-of-stock waste.
+
+    The head of a waste's queue is the oldest entry (ties by id), read from
+    the (residuos_id, enfileirado_em) index.
+    """
+    __tablename__ = 'fila_espera_residuo'
+    __table_args__ = (
+        db.UniqueConstraint('usuario_id', 'residuos_id'),
+        db.Index('idx_fila_espera_residuo_ordem', 'residuos_id', 'enfileirado_em'),
+        {'sqlite_autoincrement': True}
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    usuario_id = db.Column(db.Integer, db.ForeignKey('usuarios.id'), nullable=False)
+    residuos_id = db.Column(db.Integer, db.ForeignKey('residuos.id'), nullable=False)
+    enfileirado_em = db.Column(Timestamp, nullable=False)
+
+    def __repr__(self):
+        return f'<FilaEsperaResiduo {self.usuario_id} {self.residuos_id}>'
@@ -0,0 +1,76 @@
+"""
+Rollup model - Daily collection totals per category and producer.
+"""
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from extensions import db
+from models.achievement import Collection
+
+
+class CollectionRollup(db.Model):
+    """
+    CollectionRollup model - collections and points of one producer in one
+    category on one day.
+
+    The primary key starts with the day, so a report over a date range is
+    a range scan that reads one row per (day, category, producer) instead
+    of every collection.
+    """
+    __tablename__ = 'collection_rollups'
+
+    dia = db.Column(db.Date, primary_key=True)
+    categoria = db.Column(db.String(50), primary_key=True)
+    produtor_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    coletas = db.Column(db.Integer, default=0, nullable=False)
+    pontos = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f'<CollectionRollup {self.dia} {self.categoria} #{self.produtor_id}>'
+
+
+def upsert_rollups(connection, deltas):
+    """
+    Add (coletas, pontos) deltas to rollup rows, creating missing rows.
+
+    Args:
+        connection: Connection of the current transaction
+        deltas: Dict (dia, categoria, produtor_id) -> [coletas, pontos]
+    """
+    if not deltas:
+        return
+    statement = insert(CollectionRollup.__table__)
+    statement = statement.on_conflict_do_update(
+        index_elements=['dia', 'categoria', 'produtor_id'],
+        set_={
+            'coletas': CollectionRollup.__table__.c.coletas + statement.excluded.coletas,
+            'pontos': CollectionRollup.__table__.c.pontos + statement.excluded.pontos
+        }
+    )
+    connection.execute(statement, [
+        {'dia': dia, 'categoria': categoria, 'produtor_id': produtor_id,
+         'coletas': coletas, 'pontos': pontos}
+        for (dia, categoria, produtor_id), (coletas, pontos) in deltas.items()
+    ])
+
+
+@event.listens_for(Session, 'after_flush')
+def roll_up_collections(session, flush_context):
+    """
+    Apply the collections inserted or deleted by a flush to the rollups.
+
+    Runs inside the flush, so rollups commit or roll back together with the
+    collections. Edits to an existing collection's date, category or points
+    are not tracked; run `flask rollups rebuild` after changing those.
+    """
+    deltas = {}
+    for sign, instances in ((1, session.new), (-1, session.deleted)):
+        for instance in instances:
+            if not isinstance(instance, Collection):
+                continue
+            key = (instance.data_coleta.date(), instance.categoria, instance.produtor_id)
+            totals = deltas.setdefault(key, [0, 0])
+            totals[0] += sign
+            totals[1] += sign * (instance.pontos or 0)
+
+    upsert_rollups(session.connection(), deltas)
@@ -3,7 +3,11 @@ Space model - Physical spaces for collection points and events.
 """
 from datetime import datetime
 from enum import Enum
+from sqlalchemy.orm import validates
 from extensions import db
+from models.opening_hours import (
+    parse_horario, mask_to_bytes, mask_from_bytes, describe_mask, day_open_ranges
+)
 
 
 class TipoEspaco(str, Enum):
@@ -13,17 +17,29 @@ class TipoEspaco(str, Enum):
     CURSO = 'curso'
 
 
+TIPO_DISPLAY = {
+    TipoEspaco.COLETA.value: 'Coleta',
+    TipoEspaco.EVENTO.value: 'Evento',
+    TipoEspaco.CURSO.value: 'Curso'
+}
+
+
 class Space(db.Model):
     """
     Space model - represents physical collection points and event venues.
     """
     __tablename__ = 'spaces'
+    __table_args__ = (
+        # Natural key used by bulk imports
+        db.Index('ix_spaces_nome_endereco', 'nome', 'endereco'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     nome = db.Column(db.String(200), nullable=False)
     tipo = db.Column(db.String(20), default=TipoEspaco.COLETA.value, nullable=False)
     endereco = db.Column(db.String(300), nullable=False)
     horario = db.Column(db.String(100), nullable=True)
+    horario_semanal = db.Column(db.LargeBinary(21), nullable=True)  # 168-bit hour-of-week mask
     descricao = db.Column(db.Text, nullable=True)
     ativo = db.Column(db.Boolean, default=True, nullable=False)
 
@@ -37,18 +53,25 @@ class Space(db.Model):
 
     # Relationships
     eventos = db.relationship('Event', back_populates='espaco', lazy='dynamic')
+    excecoes_horario = db.relationship('SpaceHoursException', back_populates='espaco',
+                                       lazy='dynamic', cascade='all, delete-orphan')
 
     def __repr__(self):
         return f'<Space {self.nome} ({self.tipo})>'
 
     def get_tipo_display(self):
         """Return human-readable type name."""
-        tipo_map = {
-            TipoEspaco.COLETA.value: 'Coleta',
-            TipoEspaco.EVENTO.value: 'Evento',
-            TipoEspaco.CURSO.value: 'Curso'
-        }
-        return tipo_map.get(self.tipo, 'Desconhecido')
+        return TIPO_DISPLAY.get(self.tipo, 'Desconhecido')
+
+    @validates('horario')
+    def _sync_horario_semanal(self, key, horario):
+        """Keep the structured weekly mask in sync with the free-text hours."""
+        self.horario_semanal = mask_to_bytes(parse_horario(horario))
+        return horario
+
+    def get_horario_semanal(self):
+        """Return the weekly hours mask as an int, or None if unknown."""
+        return mask_from_bytes(self.horario_semanal)
 
     def to_dict(self):
         """Convert space to dictionary for JSON serialization."""
@@ -59,8 +82,43 @@ class Space(db.Model):
             'type_display': self.get_tipo_display(),
             'address': self.endereco,
             'hours': self.horario,
+            'weekly_hours': describe_mask(self.get_horario_semanal()),
             'description': self.descricao,
             'active': self.ativo,
             'latitude': self.latitude,
             'longitude': self.longitude
         }
+
+
+class SpaceHoursException(db.Model):
+    """
+    SpaceHoursException model - holiday or special hours for a given date.
+    A row without espaco_id applies to every space.
+    """
+    __tablename__ = 'space_hours_exceptions'
+    __table_args__ = (
+        db.UniqueConstraint('espaco_id', 'data', name='uq_space_hours_exceptions_day'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    espaco_id = db.Column(db.Integer, db.ForeignKey('spaces.id'), nullable=True)
+    data = db.Column(db.Date, nullable=False, index=True)
+    horas = db.Column(db.Integer, default=0, nullable=False)  # 24-bit day mask, 0 = closed
+    descricao = db.Column(db.String(200), nullable=True)
+
+    # Relationships
+    espaco = db.relationship('Space', back_populates='excecoes_horario')
+
+    def __repr__(self):
+        return f'<SpaceHoursException {self.espaco_id} @ {self.data}>'
+
+    def to_dict(self):
+        """Convert exception to dictionary for JSON serialization."""
+        return {
+            'id': self.id,
+            'space_id': self.espaco_id,
+            'date': self.data.isoformat(),
+            'closed': self.horas == 0,
+            'hours': [f'{start:02d}:00-{end:02d}:00' for start, end in day_open_ranges(self.horas)],
+            'description': self.descricao
+        }
@@ -0,0 +1,27 @@
+"""
+Stream model - Durable log behind the live updates (SSE) channel.
+"""
+from datetime import datetime
+from extensions import db
+
+
+class StreamEvent(db.Model):
+    """
+    StreamEvent model - one delta pushed to live subscribers.
+
+    Rows are written in the same transaction as the change they describe and
+    read back by every worker process, so subscribers connected to any worker
+    see every event. The id doubles as the SSE event id (Last-Event-ID).
+    """
+    __tablename__ = 'stream_events'
+    # Never reuse ids after pruning; clients resume from them
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    canal = db.Column(db.String(50), nullable=False)  # 'curator', 'user:<id>'
+    tipo = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON
+    criado_em = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<StreamEvent {self.id} {self.canal}:{self.tipo}>'
@@ -22,12 +22,29 @@ class StatusUsuario(str, Enum):
     PENDENTE = 'pendente'
 
 
+TIPO_DISPLAY = {
+    TipoUsuario.ADMIN.value: 'Administrador',
+    TipoUsuario.CURATOR.value: 'Curador',
+    TipoUsuario.PRODUCER.value: 'Produtor'
+}
+
+STATUS_DISPLAY = {
+    StatusUsuario.ATIVO.value: 'Ativo',
+    StatusUsuario.INATIVO.value: 'Inativo',
+    StatusUsuario.PENDENTE.value: 'Pendente'
+}
+
+
 class User(UserMixin, db.Model):
     """
     User model - equivalent to Django's CustomUser.
     Extends AbstractUser fields with custom tipo, status, and pontos.
     """
     __tablename__ = 'users'
+    __table_args__ = (
+        # Producer ranking (leaderboard fallback)
+        db.Index('ix_users_tipo_status_pontos', 'tipo', 'status', 'pontos'),
+    )
 
     # Primary key
     id = db.Column(db.Integer, primary_key=True)
@@ -49,6 +66,12 @@ class User(UserMixin, db.Model):
     status = db.Column(db.String(10), default=StatusUsuario.PENDENTE.value, nullable=False)
     pontos = db.Column(db.Integer, default=0, nullable=False)
 
+    # Unread notifications, kept in step by services.notifications
+    notificacoes_nao_lidas = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
+    # SHA-256 of the calendar feed token (services.calendar), None when revoked
+    calendario_token = db.Column(db.String(64), nullable=True)
+
     # Timestamps
     date_joined = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     ultima_atividade = db.Column(db.DateTime, default=datetime.utcnow,
@@ -69,21 +92,11 @@ class User(UserMixin, db.Model):
 
     def get_tipo_display(self):
         """Return human-readable tipo name."""
-        tipo_map = {
-            TipoUsuario.ADMIN.value: 'Administrador',
-            TipoUsuario.CURATOR.value: 'Curador',
-            TipoUsuario.PRODUCER.value: 'Produtor'
-        }
-        return tipo_map.get(self.tipo, 'Desconhecido')
+        return TIPO_DISPLAY.get(self.tipo, 'Desconhecido')
 
     def get_status_display(self):
         """Return human-readable status name."""
-        status_map = {
-            StatusUsuario.ATIVO.value: 'Ativo',
-            StatusUsuario.INATIVO.value: 'Inativo',
-            StatusUsuario.PENDENTE.value: 'Pendente'
-        }
-        return status_map.get(self.status, 'Desconhecido')
+        return STATUS_DISPLAY.get(self.status, 'Desconhecido')
 
     # Password management
     def set_password(self, password):
@@ -160,6 +173,10 @@ class Notificacao(db.Model):
     Migrated from Django Notificacao model.
     """
     __tablename__ = 'notificacoes'
+    __table_args__ = (
+        # Inbox listing and unread filtering, newest first
+        db.Index('ix_notificacoes_usuario_lida_criada', 'usuario_id', 'lida', 'criada_em'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     usuario_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -172,9 +189,6 @@ class Notificacao(db.Model):
     # Relationships
     usuario = db.relationship('User', back_populates='notificacoes')
 
-    class Meta:
-        ordering = ['-criada_em']
-
     def __repr__(self):
         return f'<Notificacao {self.titulo} - {self.usuario.username}>'
 
@@ -1,16 +1,62 @@
 """
 API routes - REST API endpoints for dashboard data.
 """
-from datetime import datetime, timedelta
-from flask import Blueprint, jsonify, request
+from datetime import date, datetime, time, timedelta
+from flask import (
+    Blueprint, Response, current_app, jsonify, request, send_file, stream_with_context, url_for
+)
 from flask_login import login_required, current_user
 from extensions import db
 from decorators.auth import producer_required, curator_required, admin_required, active_user_required
+from decorators.idempotency import idempotent
+from decorators.rate_limit import rate_limit
 from models import (
     User, TipoUsuario, StatusUsuario,
     Material, StatusMaterial,
-    Space, Event, StatusEvento,
-    Achievement, Collection
+    Space, SpaceHoursException, Event, EventException, StatusEvento,
+    Achievement, Collection, Job, StatusJob, ArchivedCollection, ArchivedMaterial
+)
+from models.opening_hours import parse_day_hours
+from models.quantities import parse_quantidade
+from serializers import (
+    ARCHIVED_COLLECTION_ROWS, ARCHIVED_MATERIAL_ROWS, COLLECTION_ROWS, EVENT_ROWS, MATERIAL_ROWS,
+    SPACE_ROWS, USER_ROWS
+)
+from services.analytics import GRANULARITIES, MAX_REPORT_DAYS, collection_report, quantity_totals
+from services.archive import count as count_archived, newest_first
+from services.calendar import (
+    MAX_RANGE_DAYS, parse_date_param, events_in_range_query, month_day_counts, iter_ics,
+    issue_feed_token, revoke_feed_token, feed_token_user
+)
+from services.changes import MAX_CHANGES, changes_since, tracked_models
+from services.leaderboard import (
+    MAX_TOP, MAX_NEIGHBOURS, period_start, top, standing, cached_rank, rank_from_database
+)
+from services.exports import (
+    DATASETS as EXPORT_DATASETS, FORMATS as EXPORT_FORMATS, MIMETYPES as EXPORT_MIMETYPES, export
+)
+from services.imports import (
+    KINDS as IMPORT_KINDS, FORMATS as IMPORT_FORMATS, iter_csv, iter_ndjson, import_rows
+)
+from services.jobs import queue_stats, retry as retry_jobs
+from services.rate_limit import rejections as rate_limit_rejections
+from services.live import (
+    CURATOR_CHANNEL, hub, publish, user_channel, replay, latest_event_id,
+    iter_stream
+)
+from services.notifications import (
+    MAX_PAGE_SIZE, MAX_BULK_IDS, mark_read, delete_notifications, inbox_page
+)
+from services.opening_hours import get_index, invalidate_index
+from services.photos import enqueue_derivatives, photo_file, store_photo
+from services.points import saldo_em, historico
+from services.recurrence import (
+    occurrences_between, recurring_series_query, today_window, expand
+)
+from services.replica import use_primary
+from services.reviews import enqueue_review_effects
+from services.scheduling import (
+    apply_event_schedule, proposed_intervals, find_conflicts, free_slots
 )
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
@@ -29,15 +75,21 @@ def producer_stats():
     user_id = current_user.id
 
     # Count completed collections
-    collections_count = Collection.query.filter_by(produtor_id=user_id).count()
+    collections_count = count_archived('collections', lambda C: db.session.query(C).filter(
+        C.produtor_id == user_id))
 
     # Get achievements
     achievements = Achievement.query.order_by(Achievement.ordem).all()
     unlocked_count = sum(1 for a in achievements if current_user.pontos >= a.pontos_necessarios)
     total_achievements = len(achievements)
 
+    rank = cached_rank(user_id)
+    if rank is None:
+        rank = rank_from_database(current_user)
+
     return jsonify({
         'points': current_user.pontos,
+        'rank': rank,
         'collections_completed': collections_count,
         'achievements_unlocked': unlocked_count,
         'achievements_total': total_achievements
@@ -59,11 +111,15 @@ def producer_achievements():
 @active_user_required
 @producer_required
 def producer_collections():
-    """Get producer collection history."""
-    collections = Collection.query.filter_by(produtor_id=current_user.id)\
-        .order_by(Collection.data_coleta.desc())\
-        .limit(20).all()
-    return jsonify([c.to_dict() for c in collections])
+    """Get producer collection history (older entries are read from the archive)."""
+    def query(C):
+        return db.session.query(C).filter(C.produtor_id == current_user.id)\
+            .order_by(C.data_coleta.desc(), C.id.desc())
+
+    rows = newest_first('collections', COLLECTION_ROWS.select(query(Collection)),
+                        lambda: ARCHIVED_COLLECTION_ROWS.select(query(ArchivedCollection)),
+                        key=lambda row: (row.data_coleta, row.id), limit=20)
+    return jsonify([COLLECTION_ROWS.convert(row) for row in rows])
 
 
 @api_bp.route('/producer/materials')
@@ -71,17 +127,23 @@ def producer_collections():
 @active_user_required
 @producer_required
 def producer_materials():
-    """Get producer's published materials."""
-    materials = Material.query.filter_by(produtor_id=current_user.id)\
-        .order_by(Material.criado_em.desc())\
-        .all()
-    return jsonify([m.to_dict() for m in materials])
+    """Get producer's published materials, including archived ones."""
+    def query(M):
+        return db.session.query(M).filter(M.produtor_id == current_user.id)\
+            .order_by(M.criado_em.desc(), M.id.desc())
+
+    rows = newest_first('materials', MATERIAL_ROWS.select(query(Material)),
+                        lambda: ARCHIVED_MATERIAL_ROWS.select(query(ArchivedMaterial)),
+                        key=lambda row: (row.criado_em, row.id))
+    return jsonify([MATERIAL_ROWS.convert(row) for row in rows])
 
 
 @api_bp.route('/producer/materials', methods=['POST'])
+@rate_limit(20, per=60)
 @login_required
 @active_user_required
 @producer_required
+@idempotent
 def producer_create_material():
     """Create a new material publication."""
     data = request.get_json()
@@ -94,30 +156,147 @@ def producer_create_material():
         if not data.get(field):
             return jsonify({'error': f'Field {field} is required'}), 400
 
+    if data.get('quantity') and parse_quantidade(data['quantity']) is None:
+        return jsonify({'error': 'Invalid quantity, use a number and a unit '
+                                 '(e.g. "10 unidades", "5 kg", "2 litros")'}), 400
+
     material = Material(
         nome=data['name'],
         categoria=data['category'],
         descricao=data['description'],
         localizacao=data['location'],
-        quantidade=data.get('quantity'),
+        quantidade=data.get('quantity') or None,
         produtor_id=current_user.id,
         status=StatusMaterial.PENDING.value
     )
 
     db.session.add(material)
+    db.session.flush()
+    publish(CURATOR_CHANNEL, 'material_published', material.to_dict())
     db.session.commit()
 
     return jsonify(material.to_dict()), 201
 
 
+@api_bp.route('/producer/materials/<int:material_id>/photo', methods=['POST'])
+@rate_limit(20, per=60)
+@login_required
+@active_user_required
+@producer_required
+def producer_upload_material_photo(material_id):
+    """
+    Attach a photo (PNG, JPEG or GIF) to one of the producer's pending materials.
+
+    The body is the image itself, or a multipart upload in field 'photo'.
+    The thumbnail and review-size images are made in the background; until
+    then their URLs serve the original.
+    """
+    material = Material.query.filter_by(id=material_id, produtor_id=current_user.id).first()
+    if material is None:
+        return jsonify({'error': 'Material not found'}), 404
+    if material.status != StatusMaterial.PENDING.value:
+        return jsonify({'error': 'Only pending materials can have their photo changed'}), 400
+
+    upload = request.files.get('photo')
+    try:
+        digest, ext, width, height = store_photo(upload.stream if upload else request.stream)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    material.foto_hash = digest
+    material.foto_formato = ext
+    material.foto_largura = width
+    material.foto_altura = height
+    enqueue_derivatives(digest, ext)
+    db.session.flush()
+    publish(CURATOR_CHANNEL, 'material_updated', material.to_dict())
+    db.session.commit()
+
+    return jsonify(material.to_dict())
+
+
+@api_bp.route('/photos/<variant>/<name>')
+@login_required
+@active_user_required
+def material_photo(variant, name):
+    """
+    Serve a material photo ('original') or a derivative ('review', 'thumb').
+
+    Files are named by their content hash and never change, so they are
+    cached for a year; a derivative still being made falls back to the
+    original, uncached.
+    """
+    found = photo_file(variant, name)
+    if found is None:
+        return jsonify({'error': 'Photo not found'}), 404
+
+    path, final = found
+    response = send_file(path, max_age=31536000 if final else 0)
+    response.cache_control.public = False
+    response.cache_control.private = True
+    if final:
+        response.cache_control.immutable = True
+    return response
+
+
+@api_bp.route('/producer/points/history')
+@login_required
+@active_user_required
+@producer_required
+def producer_points_history():
+    """
+    Get the producer's points ledger, newest first (?before=<id>&limit=50).
+
+    With ?at=<ISO datetime> the balance at that moment is included.
+    """
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+    entries = historico(current_user.id, request.args.get('before', type=int), limit)
+
+    result = {
+        'balance': current_user.pontos,
+        'entries': [e.to_dict() for e in entries],
+        'next_before': entries[-1].id if len(entries) == limit else None
+    }
+
+    if request.args.get('at'):
+        try:
+            moment = datetime.fromisoformat(request.args['at'])
+        except ValueError:
+            return jsonify({'error': 'Invalid at, use ISO format'}), 400
+        result['balance_at'] = saldo_em(current_user.id, moment)
+
+    return jsonify(result)
+
+
 @api_bp.route('/producer/collection-points')
 @login_required
 @active_user_required
 @producer_required
 def producer_collection_points():
-    """Get nearby collection points."""
+    """
+    Get nearby collection points.
+
+    Optional filters: ?open_now=true, ?open_at=<ISO datetime>, ?open_on_weekend=true
+    """
+    index = get_index()
+    now = datetime.now()
+    open_now_ids = set(index.open_at(now, tipo='coleta'))
+
     # Get all active collection spaces
-    spaces = Space.query.filter_by(tipo='coleta', ativo=True).all()
+    query = Space.query.filter_by(tipo='coleta', ativo=True)
+
+    if request.args.get('open_now') == 'true':
+        query = query.filter(Space.id.in_(open_now_ids))
+    if request.args.get('open_at'):
+        try:
+            moment = datetime.fromisoformat(request.args['open_at'])
+        except ValueError:
+            return jsonify({'error': 'Invalid open_at, use ISO format'}), 400
+        query = query.filter(Space.id.in_(index.open_at(moment, tipo='coleta')))
+    if request.args.get('open_on_weekend') == 'true':
+        query = query.filter(Space.id.in_(index.open_on_weekend(tipo='coleta')))
+
+    spaces = query.all()
 
     # Transform to expected format with distance placeholder
     collection_points = []
@@ -127,6 +306,8 @@ def producer_collection_points():
             'name': space.nome,
             'address': space.endereco,
             'hours': space.horario or 'Horário não definido',
+            'weekly_hours': space.to_dict()['weekly_hours'],
+            'open_now': space.id in open_now_ids if space.horario_semanal else None,
             'distance': 'N/A'  # Would need geolocation to calculate
         })
 
@@ -138,17 +319,329 @@ def producer_collection_points():
 @active_user_required
 @producer_required
 def producer_events_today():
-    """Get events happening today."""
-    today = datetime.now().date()
-    tomorrow = today + timedelta(days=1)
+    """Get events happening today (including occurrences of recurring events)."""
+    start, end = today_window()
 
-    events = Event.query.filter(
-        Event.data_inicio >= datetime.combine(today, datetime.min.time()),
-        Event.data_inicio < datetime.combine(tomorrow, datetime.min.time()),
-        Event.status.in_([StatusEvento.AGENDADO.value, StatusEvento.EM_ANDAMENTO.value])
-    ).all()
+    occurrences = occurrences_between(
+        start, end,
+        statuses=[StatusEvento.AGENDADO.value, StatusEvento.EM_ANDAMENTO.value]
+    )
 
-    return jsonify([e.to_dict() for e in events])
+    return jsonify([o.to_dict() for o in occurrences])
+
+
+# =============================================================================
+# Calendar API Endpoints
+# =============================================================================
+
+def _calendar_filters():
+    """
+    Read the shared calendar filters from the query string.
+
+    Returns:
+        Tuple (space_id, tipo, statuses)
+    """
+    space_id = request.args.get('space_id', type=int)
+    tipo = request.args.get('type') or None
+    status = request.args.get('status')
+    statuses = [s for s in status.split(',') if s] if status else None
+    return space_id, tipo, statuses
+
+
+@api_bp.route('/events')
+@login_required
+@active_user_required
+def events_range():
+    """Get events starting inside a date range (?from=&to=&space_id=&type=)."""
+    try:
+        start = parse_date_param(request.args.get('from'))
+        end = parse_date_param(request.args.get('to'), end=True)
+    except ValueError:
+        return jsonify({'error': 'Invalid date, use YYYY-MM-DD or ISO format'}), 400
+
+    if start is None:
+        start = datetime.combine(datetime.now().date(), datetime.min.time())
+    if end is None:
+        end = start + timedelta(days=31)
+
+    if end <= start:
+        return jsonify({'error': 'Field to must be after from'}), 400
+    if end - start > timedelta(days=MAX_RANGE_DAYS):
+        return jsonify({'error': f'Range cannot exceed {MAX_RANGE_DAYS} days'}), 400
+
+    space_id, tipo, statuses = _calendar_filters()
+    occurrences = occurrences_between(start, end, space_id, tipo, statuses)
+
+    return jsonify([o.to_dict() for o in occurrences])
+
+
+@api_bp.route('/events/calendar')
+@login_required
+@active_user_required
+def events_month_grid():
+    """Get per-day event counts for a month grid (?month=YYYY-MM)."""
+    month = request.args.get('month') or datetime.now().strftime('%Y-%m')
+
+    try:
+        year, month_number = (int(part) for part in month.split('-'))
+        datetime(year, month_number, 1)
+    except ValueError:
+        return jsonify({'error': 'Invalid month, use YYYY-MM'}), 400
+
+    space_id, tipo, statuses = _calendar_filters()
+
+    return jsonify({
+        'month': f'{year:04d}-{month_number:02d}',
+        'days': month_day_counts(year, month_number, space_id, tipo, statuses)
+    })
+
+
+@api_bp.route('/events.ics')
+def events_ics():
+    """
+    Stream upcoming events as an iCalendar feed.
+
+    Calendar apps subscribe with ?token= (see calendar_feed_token), as they
+    send no session cookie; the in-app download uses the session.
+    """
+    token = request.args.get('token')
+    if token is None:
+        return _events_ics_download()
+    if feed_token_user(token) is None:
+        return jsonify({'error': 'Invalid or revoked feed token'}), 403
+    return _ics_response()
+
+
+@login_required
+@active_user_required
+def _events_ics_download():
+    return _ics_response()
+
+
+def _ics_response():
+    try:
+        start = parse_date_param(request.args.get('from'))
+        end = parse_date_param(request.args.get('to'), end=True)
+    except ValueError:
+        return jsonify({'error': 'Invalid date, use YYYY-MM-DD or ISO format'}), 400
+
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    start = start or today - timedelta(days=30)
+    end = end or today + timedelta(days=MAX_RANGE_DAYS)
+
+    space_id, tipo, statuses = _calendar_filters()
+    query = events_in_range_query(start, end, space_id, tipo, statuses)
+    series_query = recurring_series_query(start, end, space_id, tipo)
+
+    return Response(
+        stream_with_context(iter_ics(query, series_query, request.host)),
+        mimetype='text/calendar',
+        headers={'Content-Disposition': 'inline; filename="reciclo-eventos.ics"'}
+    )
+
+
+@api_bp.route('/calendar/feed-token')
+@login_required
+@active_user_required
+def calendar_feed_token():
+    """Whether the current user has a calendar feed token."""
+    return jsonify({'active': current_user.calendario_token is not None})
+
+
+@api_bp.route('/calendar/feed-token', methods=['POST'])
+@login_required
+@active_user_required
+def calendar_issue_feed_token():
+    """Create a calendar feed URL, revoking the previous one."""
+    token = issue_feed_token(current_user)
+    return jsonify({
+        'token': token,
+        'url': url_for('api.events_ics', token=token, _external=True)
+    }), 201
+
+
+@api_bp.route('/calendar/feed-token', methods=['DELETE'])
+@login_required
+@active_user_required
+def calendar_revoke_feed_token():
+    """Revoke the current user's calendar feed URL."""
+    revoke_feed_token(current_user)
+    return jsonify({'success': True})
+
+
+# =============================================================================
+# Leaderboard API Endpoints
+# =============================================================================
+
+
+@api_bp.route('/leaderboard')
+@login_required
+@active_user_required
+def leaderboard_top():
+    """Get the top producers (?period=all|week|month&limit=10)."""
+    period = request.args.get('period', 'all')
+    limit = min(max(request.args.get('limit', 10, type=int), 1), MAX_TOP)
+
+    try:
+        start = period_start(period)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    entries, total = top(period, limit)
+    return jsonify({
+        'period': period,
+        'since': start.isoformat() if start else None,
+        'total': total,
+        'entries': entries
+    })
+
+
+@api_bp.route('/leaderboard/me')
+@login_required
+@active_user_required
+@producer_required
+def leaderboard_me():
+    """Get the current producer's rank and neighbours (?period=&neighbours=2)."""
+    period = request.args.get('period', 'all')
+    neighbours = min(max(request.args.get('neighbours', 2, type=int), 0), MAX_NEIGHBOURS)
+
+    try:
+        period_start(period)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    result = standing(current_user.id, period, neighbours)
+    result['period'] = period
+    return jsonify(result)
+
+
+# =============================================================================
+# Notification API Endpoints
+# =============================================================================
+
+
+@api_bp.route('/notifications')
+@login_required
+@active_user_required
+def notifications_list():
+    """Get the current user's inbox (?cursor=&limit=&unread=true)."""
+    limit = min(max(request.args.get('limit', 20, type=int), 1), MAX_PAGE_SIZE)
+    unread_only = request.args.get('unread') == 'true'
+
+    try:
+        notifications, next_cursor = inbox_page(current_user.id, request.args.get('cursor'),
+                                                limit, unread_only)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({
+        'items': [n.to_dict() for n in notifications],
+        'next_cursor': next_cursor,
+        'unread': current_user.notificacoes_nao_lidas
+    })
+
+
+@api_bp.route('/notifications/unread-count')
+@login_required
+@active_user_required
+def notifications_unread_count():
+    """Get the unread badge count (read from the cached counter)."""
+    return jsonify({'unread': current_user.notificacoes_nao_lidas})
+
+
+def _notification_ids(data):
+    """
+    Read the target of a bulk operation: {'ids': [...]} or {'all': true}.
+
+    Returns:
+        Tuple (ids or None for all, error message or None)
+    """
+    if data.get('all') is True:
+        return None, None
+
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        return None, 'Provide ids or all'
+    if len(ids) > MAX_BULK_IDS:
+        return None, f'At most {MAX_BULK_IDS} ids per request'
+    if not all(isinstance(i, int) for i in ids):
+        return None, 'ids must be integers'
+    return ids, None
+
+
+@api_bp.route('/notifications/read', methods=['POST'])
+@login_required
+@active_user_required
+def notifications_mark_read():
+    """Mark notifications as read."""
+    ids, error = _notification_ids(request.get_json() or {})
+    if error:
+        return jsonify({'error': error}), 400
+
+    updated = mark_read(current_user.id, ids)
+    db.session.commit()
+
+    return jsonify({'success': True, 'updated': updated,
+                    'unread': current_user.notificacoes_nao_lidas})
+
+
+@api_bp.route('/notifications', methods=['DELETE'])
+@login_required
+@active_user_required
+def notifications_delete():
+    """Delete notifications."""
+    ids, error = _notification_ids(request.get_json(silent=True) or {})
+    if error:
+        return jsonify({'error': error}), 400
+
+    deleted = delete_notifications(current_user.id, ids)
+    db.session.commit()
+
+    return jsonify({'success': True, 'deleted': deleted,
+                    'unread': current_user.notificacoes_nao_lidas})
+
+
+# =============================================================================
+# Live Updates (Server-Sent Events)
+# =============================================================================
+
+
+@api_bp.route('/stream')
+@login_required
+@active_user_required
+def live_stream():
+    """
+    Stream live dashboard updates as Server-Sent Events.
+
+    Every user gets their personal channel; curators and admins also get the
+    curator queue. Reconnecting clients resume after Last-Event-ID. Served
+    by the gevent workers of gunicorn_live.conf.py, where an open stream
+    costs a greenlet rather than a worker thread.
+    """
+    channels = [user_channel(current_user.id)]
+    if current_user.is_curator() or current_user.is_admin():
+        channels.append(CURATOR_CHANNEL)
+
+    hub.ensure_started(current_app._get_current_object())
+    subscriber = hub.subscribe(channels)
+
+    try:
+        # The replica lags behind: the replay must see every committed event
+        use_primary()
+        last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+        if last_event_id and last_event_id.isdigit():
+            last_id = int(last_event_id)
+            backlog, complete = replay(channels, last_id)
+        else:
+            last_id = latest_event_id()
+            backlog, complete = [], True
+    except Exception:
+        hub.unsubscribe(subscriber)
+        raise
+
+    return Response(iter_stream(subscriber, backlog, not complete, last_id),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 # =============================================================================
@@ -195,9 +688,8 @@ def curator_stats():
 def curator_pending_materials():
     """Get pending materials for review."""
     materials = Material.query.filter_by(status=StatusMaterial.PENDING.value)\
-        .order_by(Material.criado_em.desc())\
-        .all()
-    return jsonify([m.to_dict() for m in materials])
+        .order_by(Material.criado_em.desc())
+    return jsonify(MATERIAL_ROWS.all(materials))
 
 
 @api_bp.route('/curator/review-history')
@@ -205,11 +697,15 @@ def curator_pending_materials():
 @active_user_required
 @curator_required
 def curator_review_history():
-    """Get curator's review history."""
-    materials = Material.query.filter(
-        Material.curador_id == current_user.id,
-        Material.status.in_([StatusMaterial.APPROVED.value, StatusMaterial.REJECTED.value])
-    ).order_by(Material.revisado_em.desc()).limit(20).all()
+    """Get curator's review history (older reviews are read from the archive)."""
+    def query(M):
+        return db.session.query(M.id, M.nome, M.status, M.revisado_em, M.feedback).filter(
+            M.curador_id == current_user.id,
+            M.status.in_([StatusMaterial.APPROVED.value, StatusMaterial.REJECTED.value])
+        ).order_by(M.revisado_em.desc(), M.id.desc())
+
+    materials = newest_first('materials', query(Material), lambda: query(ArchivedMaterial),
+                             key=lambda row: (row.revisado_em, row.id), limit=20)
 
     return jsonify([{
         'id': m.id,
@@ -220,6 +716,37 @@ def curator_review_history():
     } for m in materials])
 
 
+def _review_delta(material):
+    """Live update payload for a reviewed material."""
+    return {
+        'id': material.id,
+        'status': material.status,
+        'curator_id': material.curador_id,
+        'curator': current_user.get_full_name()
+    }
+
+
+@api_bp.route('/curator/materials/<int:material_id>/claim', methods=['POST'])
+@login_required
+@active_user_required
+@curator_required
+def curator_claim_material(material_id):
+    """Tell other curators that this material is being reviewed."""
+    material = Material.query.get_or_404(material_id)
+
+    if material.status != StatusMaterial.PENDING.value:
+        return jsonify({'error': 'Material already reviewed'}), 400
+
+    publish(CURATOR_CHANNEL, 'material_claimed', {
+        'id': material.id,
+        'curator_id': current_user.id,
+        'curator': current_user.get_full_name()
+    })
+    db.session.commit()
+
+    return jsonify({'success': True})
+
+
 @api_bp.route('/curator/materials/<int:material_id>/approve', methods=['POST'])
 @login_required
 @active_user_required
@@ -235,29 +762,19 @@ def curator_approve_material(material_id):
     feedback = data.get('feedback', '')
     points = data.get('points', 50)  # Default points for approval
 
+    if not isinstance(points, int) or points < 0:
+        return jsonify({'error': 'Points must be a non-negative integer'}), 400
+
     material.status = StatusMaterial.APPROVED.value
     material.curador_id = current_user.id
     material.revisado_em = datetime.utcnow()
     material.feedback = feedback
     material.pontos_concedidos = points
 
-    # Award points to producer
-    producer = material.produtor
-    if producer:
-        producer.pontos += points
-
-        # Create collection record
-        collection = Collection(
-            material_nome=material.nome,
-            categoria=material.categoria,
-            quantidade=material.quantidade,
-            pontos=points,
-            feedback=feedback,
-            produtor_id=producer.id,
-            material_id=material.id
-        )
-        db.session.add(collection)
+    # Points, collection record and notification run as a background job
+    enqueue_review_effects(material)
 
+    publish(CURATOR_CHANNEL, 'material_reviewed', _review_delta(material))
     db.session.commit()
 
     return jsonify({
@@ -289,6 +806,9 @@ def curator_reject_material(material_id):
     material.revisado_em = datetime.utcnow()
     material.feedback = feedback
 
+    enqueue_review_effects(material)
+
+    publish(CURATOR_CHANNEL, 'material_reviewed', _review_delta(material))
     db.session.commit()
 
     return jsonify({
@@ -325,20 +845,139 @@ def admin_stats():
     })
 
 
+@api_bp.route('/admin/analytics/collections')
+@login_required
+@active_user_required
+@admin_required
+def admin_collection_analytics():
+    """
+    Get collections and points per period and category
+    (?from=YYYY-MM-DD&to=YYYY-MM-DD&granularity=day|week|month&category=&producer_id=).
+
+    Defaults to the last 30 days; reads only the daily rollups of the range.
+    """
+    try:
+        end = date.fromisoformat(request.args['to']) if request.args.get('to') else date.today()
+        start = date.fromisoformat(request.args['from']) if request.args.get('from') \
+            else end - timedelta(days=29)
+    except ValueError:
+        return jsonify({'error': 'Invalid date, use YYYY-MM-DD'}), 400
+
+    if end < start:
+        return jsonify({'error': 'Field to must not be before from'}), 400
+    if (end - start).days >= MAX_REPORT_DAYS:
+        return jsonify({'error': f'Range cannot exceed {MAX_REPORT_DAYS} days'}), 400
+
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in GRANULARITIES:
+        return jsonify({'error': 'granularity must be one of ' + ', '.join(GRANULARITIES)}), 400
+
+    report = collection_report(start, end, granularity, request.args.get('category'),
+                               request.args.get('producer_id', type=int))
+    report.update({'from': start.isoformat(), 'to': end.isoformat(), 'granularity': granularity})
+    return jsonify(report)
+
+
+@api_bp.route('/admin/analytics/quantities')
+@login_required
+@active_user_required
+@admin_required
+def admin_quantity_analytics():
+    """
+    Get collected quantity totals by category and unit (?from=YYYY-MM-DD&to=YYYY-MM-DD&category=).
+
+    Defaults to the last 30 days; served by a covering index on collections.
+    """
+    try:
+        end = date.fromisoformat(request.args['to']) if request.args.get('to') else date.today()
+        start = date.fromisoformat(request.args['from']) if request.args.get('from') \
+            else end - timedelta(days=29)
+    except ValueError:
+        return jsonify({'error': 'Invalid date, use YYYY-MM-DD'}), 400
+
+    if end < start:
+        return jsonify({'error': 'Field to must not be before from'}), 400
+
+    report = quantity_totals(start, end, request.args.get('category'))
+    report.update({'from': start.isoformat(), 'to': end.isoformat()})
+    return jsonify(report)
+
+
+@api_bp.route('/admin/jobs')
+@login_required
+@active_user_required
+@admin_required
+def admin_jobs():
+    """Get background queue depth and lag, with the dead-lettered jobs."""
+    dead = Job.query.filter_by(status=StatusJob.FALHOU.value)\
+        .order_by(Job.concluido_em.desc()).limit(50).all()
+    stats = queue_stats()
+    stats['dead_jobs'] = [job.to_dict() for job in dead]
+    return jsonify(stats)
+
+
+@api_bp.route('/admin/jobs/<int:job_id>/retry', methods=['POST'])
+@login_required
+@active_user_required
+@admin_required
+def admin_retry_job(job_id):
+    """Requeue a dead-lettered job with fresh attempts."""
+    if not retry_jobs(job_id):
+        return jsonify({'error': 'Job not found or not dead-lettered'}), 404
+    db.session.commit()
+    return jsonify({'success': True})
+
+
+@api_bp.route('/admin/rate-limits')
+@login_required
+@active_user_required
+@admin_required
+def admin_rate_limits():
+    """Get the requests rejected by rate limits, per route."""
+    return jsonify({
+        'enabled': current_app.config['RATE_LIMIT_ENABLED'],
+        'rejections': rate_limit_rejections(current_app.config['RATE_LIMIT_STORAGE'])
+    })
+
+
+@api_bp.route('/changes')
+@login_required
+@active_user_required
+@admin_required
+def admin_changes():
+    """
+    Get the rows changed since a sequence number (?since=<seq>&types=spaces,events).
+
+    Clients store last_seq and pass it back; reset=true means the log no
+    longer reaches that far and the full lists must be reloaded.
+    """
+    since = request.args.get('since', 0, type=int)
+    limit = min(max(request.args.get('limit', MAX_CHANGES, type=int), 1), MAX_CHANGES)
+
+    types = None
+    if request.args.get('types'):
+        types = [t.strip() for t in request.args['types'].split(',') if t.strip()]
+        unknown = set(types) - set(tracked_models())
+        if unknown:
+            return jsonify({'error': 'Unknown types: ' + ', '.join(sorted(unknown))}), 400
+
+    return jsonify(changes_since(since, types, limit))
+
+
 @api_bp.route('/admin/spaces')
 @login_required
 @active_user_required
 @admin_required
 def admin_spaces():
     """Get all spaces."""
-    spaces = Space.query.order_by(Space.nome).all()
-    return jsonify([s.to_dict() for s in spaces])
+    return jsonify(SPACE_ROWS.all(Space.query.order_by(Space.nome)))
 
 
 @api_bp.route('/admin/spaces', methods=['POST'])
 @login_required
 @active_user_required
 @admin_required
+@idempotent
 def admin_create_space():
     """Create a new space."""
     data = request.get_json()
@@ -361,6 +1000,7 @@ def admin_create_space():
 
     db.session.add(space)
     db.session.commit()
+    invalidate_index()
 
     return jsonify(space.to_dict()), 201
 
@@ -391,27 +1031,155 @@ def admin_update_space(space_id):
         space.ativo = data['active']
 
     db.session.commit()
+    invalidate_index()
 
     return jsonify(space.to_dict())
 
 
+@api_bp.route('/admin/spaces/<int:space_id>/free-slots')
+@login_required
+@active_user_required
+@admin_required
+def admin_space_free_slots(space_id):
+    """
+    Get the free slots of a space for an ISO week (?week=2026-W43).
+
+    Slots follow the space's opening hours unless day_start/day_end are given.
+    """
+    space = Space.query.get_or_404(space_id)
+
+    week = request.args.get('week')
+    try:
+        if week:
+            year, week_number = week.upper().split('-W')
+            week_start = date.fromisocalendar(int(year), int(week_number), 1)
+        else:
+            today = date.today()
+            week_start = today - timedelta(days=today.weekday())
+        day_start = time.fromisoformat(request.args.get('day_start', '08:00'))
+        day_end = time.fromisoformat(request.args.get('day_end', '18:00'))
+    except ValueError:
+        return jsonify({'error': 'Invalid week or time, use YYYY-Www and HH:MM'}), 400
+
+    weekly_mask = None
+    if 'day_start' not in request.args and 'day_end' not in request.args:
+        weekly_mask = space.get_horario_semanal()
+
+    min_minutes = request.args.get('min_minutes', 30, type=int)
+    slots = free_slots(space_id, week_start, day_start, day_end,
+                       timedelta(minutes=max(1, min_minutes)), weekly_mask)
+
+    return jsonify({
+        'space_id': space_id,
+        'week_start': week_start.isoformat(),
+        'slots': [{'start': start.isoformat(), 'end': end.isoformat()} for start, end in slots]
+    })
+
+
+@api_bp.route('/admin/spaces/hours-exceptions')
+@login_required
+@active_user_required
+@admin_required
+def admin_hours_exceptions():
+    """Get upcoming holiday/special hours (?space_id= to filter one space)."""
+    query = SpaceHoursException.query.filter(SpaceHoursException.data >= date.today())
+
+    space_id = request.args.get('space_id', type=int)
+    if space_id is not None:
+        query = query.filter(db.or_(SpaceHoursException.espaco_id == space_id,
+                                    SpaceHoursException.espaco_id.is_(None)))
+
+    exceptions = query.order_by(SpaceHoursException.data).all()
+    return jsonify([e.to_dict() for e in exceptions])
+
+
+@api_bp.route('/admin/spaces/hours-exceptions', methods=['POST'])
+@login_required
+@active_user_required
+@admin_required
+def admin_save_hours_exception():
+    """
+    Create or replace the hours of a date.
+
+    Body: {date, space_id (omit for all spaces), hours ('8h-12h') or closed, description}
+    """
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+
+    try:
+        day = date.fromisoformat(data.get('date') or '')
+    except ValueError:
+        return jsonify({'error': 'Field date is required (YYYY-MM-DD)'}), 400
+
+    space_id = data.get('space_id')
+    if space_id is not None:
+        Space.query.get_or_404(space_id)
+
+    if data.get('closed'):
+        hours = 0
+    else:
+        hours = parse_day_hours(data.get('hours'))
+        if hours is None:
+            return jsonify({'error': 'Field hours is required, e.g. 8h-12h, or set closed'}), 400
+
+    exception = SpaceHoursException.query.filter_by(espaco_id=space_id, data=day).first()
+    if exception is None:
+        exception = SpaceHoursException(espaco_id=space_id, data=day)
+        db.session.add(exception)
+
+    exception.horas = hours
+    exception.descricao = data.get('description')
+
+    db.session.commit()
+    invalidate_index()
+
+    return jsonify(exception.to_dict()), 201
+
+
+@api_bp.route('/admin/spaces/hours-exceptions/<int:exception_id>', methods=['DELETE'])
+@login_required
+@active_user_required
+@admin_required
+def admin_delete_hours_exception(exception_id):
+    """Delete a holiday/special hours entry."""
+    exception = SpaceHoursException.query.get_or_404(exception_id)
+
+    db.session.delete(exception)
+    db.session.commit()
+    invalidate_index()
+
+    return jsonify({'success': True})
+
+
 @api_bp.route('/admin/events')
 @login_required
 @active_user_required
 @admin_required
 def admin_events():
-    """Get upcoming events."""
-    events = Event.query.filter(
-        Event.data_inicio >= datetime.now()
-    ).order_by(Event.data_inicio).limit(20).all()
+    """Get upcoming events (including occurrences of recurring events)."""
+    today_start, _ = today_window()
+
+    # Window starts at midnight so series expansions are cached for the day
+    occurrences = occurrences_between(
+        today_start, today_start + timedelta(days=MAX_RANGE_DAYS),
+        statuses=[s.value for s in StatusEvento],
+        limit=20,
+        not_before=datetime.now()
+    )
 
-    return jsonify([e.to_dict() for e in events])
+    # One projection for all the events instead of a space lookup per event
+    events = EVENT_ROWS.all(Event.query.filter(Event.id.in_({o.event.id for o in occurrences})))
+    by_id = {event['id']: event for event in events}
+    return jsonify([o.to_dict(by_id[o.event.id]) for o in occurrences])
 
 
 @api_bp.route('/admin/events', methods=['POST'])
 @login_required
 @active_user_required
 @admin_required
+@idempotent
 def admin_create_event():
     """Create a new event."""
     data = request.get_json()
@@ -428,38 +1196,273 @@ def admin_create_event():
         titulo=data['title'],
         tipo=data['type'],
         descricao=data.get('description'),
-        data_inicio=datetime.fromisoformat(data['date']),
-        horario=data.get('time'),
         espaco_id=data.get('space_id'),
-        localizacao_custom=data.get('location')
+        localizacao_custom=data.get('location'),
+        status=StatusEvento.AGENDADO.value
     )
 
+    error = apply_event_schedule(event, data)
+    if error:
+        return jsonify({'error': error}), 400
+
+    conflict = _space_conflict_response(event)
+    if conflict:
+        return conflict
+
     db.session.add(event)
     db.session.commit()
 
     return jsonify(event.to_dict()), 201
 
 
+@api_bp.route('/admin/events/<int:event_id>', methods=['PUT'])
+@login_required
+@active_user_required
+@admin_required
+def admin_update_event(event_id):
+    """Update an event, rejecting changes that double-book its space."""
+    event = Event.query.get_or_404(event_id)
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+
+    with db.session.no_autoflush:
+        if 'title' in data:
+            event.titulo = data['title']
+        if 'type' in data:
+            event.tipo = data['type']
+        if 'description' in data:
+            event.descricao = data['description']
+        if 'space_id' in data:
+            event.espaco_id = data['space_id']
+        if 'location' in data:
+            event.localizacao_custom = data['location']
+        if 'status' in data:
+            event.status = data['status']
+
+        error = apply_event_schedule(event, data)
+        if error:
+            db.session.rollback()
+            return jsonify({'error': error}), 400
+
+        conflict = _space_conflict_response(event, exclude_event_id=event.id)
+        if conflict:
+            db.session.rollback()
+            return conflict
+
+    db.session.commit()
+
+    return jsonify(event.to_dict())
+
+
+def _space_conflict_response(event, exclude_event_id=None):
+    """
+    Check an event against the other bookings of its space.
+
+    Returns:
+        A 409 response listing the conflicting occurrences, or None
+    """
+    if event.espaco_id is None or event.status == StatusEvento.CANCELADO.value:
+        return None
+
+    conflicts = find_conflicts(event.espaco_id, proposed_intervals(event), exclude_event_id)
+    if not conflicts:
+        return None
+
+    return jsonify({
+        'error': 'Space already booked at this time',
+        'conflicts': [b.occurrence.to_dict() for b in conflicts[:20]]
+    }), 409
+
+
+@api_bp.route('/admin/import/<kind>', methods=['POST'])
+@rate_limit(5, per=60)
+@login_required
+@active_user_required
+@admin_required
+def admin_import(kind):
+    """
+    Bulk create or update spaces or events from CSV or NDJSON (?format=csv|ndjson).
+
+    The body is the file itself, or a multipart upload in field 'file'.
+    Rows are matched on a natural key, so re-importing a file updates
+    instead of duplicating; invalid rows are reported and skipped.
+    """
+    if kind not in IMPORT_KINDS:
+        return jsonify({'error': 'kind must be one of ' + ', '.join(IMPORT_KINDS)}), 404
+
+    upload = request.files.get('file')
+    stream = upload.stream if upload else request.stream
+    fmt = request.args.get('format')
+    if fmt is None:
+        name = upload.filename.lower() if upload and upload.filename else ''
+        if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in (request.mimetype or ''):
+            fmt = 'ndjson'
+        else:
+            fmt = 'csv'
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({'error': 'format must be one of ' + ', '.join(IMPORT_FORMATS)}), 400
+
+    rows = iter_csv(stream) if fmt == 'csv' else iter_ndjson(stream)
+    return jsonify(import_rows(kind, rows).to_dict())
+
+
+@api_bp.route('/admin/export/<dataset>')
+@rate_limit(5, per=60)
+@login_required
+@active_user_required
+@admin_required
+def admin_export(dataset):
+    """
+    Stream collections, materials or users as CSV or XLSX
+    (?format=csv|xlsx&from=&to=&status=&category=&producer_id=&type=).
+
+    Rows are read from the database in batches and sent as they are
+    written, so exports of any size use constant memory.
+    """
+    if dataset not in EXPORT_DATASETS:
+        return jsonify({'error': 'dataset must be one of ' + ', '.join(EXPORT_DATASETS)}), 404
+
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': 'format must be one of ' + ', '.join(EXPORT_FORMATS)}), 400
+
+    try:
+        start = parse_date_param(request.args.get('from'))
+        end = parse_date_param(request.args.get('to'), end=True)
+    except ValueError:
+        return jsonify({'error': 'Invalid date, use YYYY-MM-DD or ISO format'}), 400
+
+    filters = {name: request.args.get(name) for name in EXPORT_DATASETS[dataset].filters}
+    try:
+        chunks = export(dataset, fmt, start, end, **filters)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    filename = f'reciclo-{dataset}-{date.today().isoformat()}.{fmt}'
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+@api_bp.route('/admin/events/<int:event_id>/exceptions')
+@login_required
+@active_user_required
+@admin_required
+def admin_event_exceptions(event_id):
+    """Get the exceptions of a recurring event."""
+    event = Event.query.get_or_404(event_id)
+    exceptions = event.excecoes.order_by(EventException.data_original).all()
+    return jsonify([x.to_dict() for x in exceptions])
+
+
+@api_bp.route('/admin/events/<int:event_id>/exceptions', methods=['POST'])
+@login_required
+@active_user_required
+@admin_required
+def admin_save_event_exception(event_id):
+    """Cancel or override a single occurrence of a recurring event."""
+    event = Event.query.get_or_404(event_id)
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+
+    if not event.recorrencia:
+        return jsonify({'error': 'Event is not recurring'}), 400
+
+    if not data.get('occurrence_date'):
+        return jsonify({'error': 'Field occurrence_date is required'}), 400
+
+    try:
+        original = datetime.fromisoformat(data['occurrence_date'])
+        new_start = datetime.fromisoformat(data['date']) if data.get('date') else None
+        new_end = datetime.fromisoformat(data['end']) if data.get('end') else None
+    except ValueError:
+        return jsonify({'error': 'Invalid date, use ISO format'}), 400
+
+    if original not in expand(event.recorrencia, event.data_inicio,
+                              original, original + timedelta(seconds=1)):
+        return jsonify({'error': 'occurrence_date is not an occurrence of this event'}), 400
+
+    exception = event.excecoes.filter_by(data_original=original).first()
+    if exception is None:
+        exception = EventException(evento_id=event.id, data_original=original)
+        db.session.add(exception)
+
+    exception.cancelada = bool(data.get('cancelled', False))
+    exception.titulo = data.get('title')
+    exception.descricao = data.get('description')
+    exception.data_inicio = new_start
+    exception.data_fim = new_end
+    exception.horario = data.get('time')
+    exception.status = data.get('status')
+
+    db.session.commit()
+
+    return jsonify(exception.to_dict()), 201
+
+
+@api_bp.route('/admin/events/<int:event_id>/exceptions/<int:exception_id>', methods=['DELETE'])
+@login_required
+@active_user_required
+@admin_required
+def admin_delete_event_exception(event_id, exception_id):
+    """Remove an exception, restoring the occurrence generated by the rule."""
+    exception = EventException.query.filter_by(
+        id=exception_id, evento_id=event_id
+    ).first_or_404()
+
+    db.session.delete(exception)
+    db.session.commit()
+
+    return jsonify({'success': True})
+
+
+# TipoUsuario value -> key the admin dashboard styles user badges by
+_USER_TYPE_KEYS = {
+    TipoUsuario.ADMIN.value: 'admin',
+    TipoUsuario.CURATOR.value: 'curator',
+    TipoUsuario.PRODUCER.value: 'producer'
+}
+
+
+def _initials(name):
+    return ''.join([n[0].upper() for n in name.split()[:2]]) if name else 'U'
+
+
+def _last_activity_text(ultima_atividade):
+    """'3 dias atrás'-style text for an ISO timestamp from USER_ROWS."""
+    if not ultima_atividade:
+        return 'Nunca'
+    diff = datetime.utcnow() - datetime.fromisoformat(ultima_atividade)
+    if diff.days > 0:
+        return f'{diff.days} dias atrás'
+    if diff.seconds >= 3600:
+        hours = diff.seconds // 3600
+        return f'{hours} hora{"s" if hours > 1 else ""} atrás'
+    if diff.seconds >= 60:
+        return f'{diff.seconds // 60} min atrás'
+    return 'Agora mesmo'
+
+
 @api_bp.route('/admin/pending-users')
 @login_required
 @active_user_required
 @admin_required
 def admin_pending_users():
     """Get pending users for approval."""
-    users = User.query.filter_by(status=StatusUsuario.PENDENTE.value).all()
-
-    result = []
-    for user in users:
-        name = user.get_full_name()
-        initials = ''.join([n[0].upper() for n in name.split()[:2]]) if name else 'U'
-        result.append({
-            'id': user.id,
-            'name': name,
-            'email': user.email,
-            'initials': initials
-        })
+    users = USER_ROWS.all(User.query.filter_by(status=StatusUsuario.PENDENTE.value))
 
-    return jsonify(result)
+    return jsonify([{
+        'id': user['id'],
+        'name': user['nome'],
+        'email': user['email'],
+        'initials': _initials(user['nome'])
+    } for user in users])
 
 
 @api_bp.route('/admin/active-users')
@@ -468,53 +1471,21 @@ def admin_pending_users():
 @admin_required
 def admin_active_users():
     """Get active users."""
-    users = User.query.filter_by(status=StatusUsuario.ATIVO.value)\
-        .order_by(User.ultima_atividade.desc())\
-        .limit(50).all()
-
-    type_display_map = {
-        TipoUsuario.ADMIN.value: 'Administrador',
-        TipoUsuario.CURATOR.value: 'Curador',
-        TipoUsuario.PRODUCER.value: 'Produtor'
-    }
-    type_key_map = {
-        TipoUsuario.ADMIN.value: 'admin',
-        TipoUsuario.CURATOR.value: 'curator',
-        TipoUsuario.PRODUCER.value: 'producer'
-    }
-
-    result = []
-    for user in users:
-        name = user.get_full_name()
-        initials = ''.join([n[0].upper() for n in name.split()[:2]]) if name else 'U'
-
-        # Calculate last activity text
-        if user.ultima_atividade:
-            diff = datetime.utcnow() - user.ultima_atividade
-            if diff.days > 0:
-                last_activity = f'{diff.days} dias atrás'
-            elif diff.seconds >= 3600:
-                hours = diff.seconds // 3600
-                last_activity = f'{hours} hora{"s" if hours > 1 else ""} atrás'
-            elif diff.seconds >= 60:
-                minutes = diff.seconds // 60
-                last_activity = f'{minutes} min atrás'
-            else:
-                last_activity = 'Agora mesmo'
-        else:
-            last_activity = 'Nunca'
-
-        result.append({
-            'id': user.id,
-            'name': name,
-            'email': user.email,
-            'type': type_key_map.get(user.tipo, 'producer'),
-            'type_display': type_display_map.get(user.tipo, 'Produtor'),
-            'initials': initials,
-            'last_activity': last_activity
-        })
+    users = USER_ROWS.all(
+        User.query.filter_by(status=StatusUsuario.ATIVO.value)
+        .order_by(User.ultima_atividade.desc())
+        .limit(50)
+    )
 
-    return jsonify(result)
+    return jsonify([{
+        'id': user['id'],
+        'name': user['nome'],
+        'email': user['email'],
+        'type': _USER_TYPE_KEYS.get(user['tipo'], 'producer'),
+        'type_display': user['tipo_display'] if user['tipo'] in _USER_TYPE_KEYS else 'Produtor',
+        'initials': _initials(user['nome']),
+        'last_activity': _last_activity_text(user['ultima_atividade'])
+    } for user in users])
 
 
 @api_bp.route('/admin/users/<int:user_id>/approve', methods=['POST'])
@@ -561,6 +1532,7 @@ def admin_reject_user(user_id):
 @login_required
 @active_user_required
 @admin_required
+@idempotent
 def admin_create_user():
     """Create a new user."""
     data = request.get_json()
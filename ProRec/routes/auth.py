@@ -5,11 +5,13 @@ Handles user login and logout with role-based redirection.
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_user, logout_user, current_user
 from models.user import User, StatusUsuario
+from decorators.rate_limit import rate_limit, ip_key
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
 
 @auth_bp.route('/login', methods=['GET', 'POST'])
+@rate_limit(10, per=60, key=ip_key, methods=('POST',))
 def login():
     """
     Login view - handles both GET (display form) and POST (process login).
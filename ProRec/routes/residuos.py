@@ -0,0 +1,505 @@
+"""
+Residuos routes - JWT API for waste stock, reservations and waiting lists.
+
+Clients authenticate with `Authorization: Bearer <token>` from /api/login
+instead of the dashboard session, so the blueprint is exempt from CSRF.
+Responses keep the API's Portuguese `mensagem` format.
+"""
+import jwt
+from flask import Blueprint, current_app, jsonify, request
+from werkzeug.security import check_password_hash, generate_password_hash
+from extensions import db
+from decorators.idempotency import idempotent
+from decorators.rate_limit import rate_limit, ip_key
+from decorators.token import token_required, funcionario_required
+from models.residuo import (
+    TIMESTAMP_FORMAT, FilaEsperaResiduo, PerfilUsuario, ReservaResiduo, Residuo, StatusReserva,
+    Usuario, now
+)
+from services.residuos import (
+    devolver_unidade, posicao_fila_espera, promover_fila_espera, reserva_ativa, reservar
+)
+
+residuos_bp = Blueprint('residuos', __name__, url_prefix='/api')
+
+
+# =====================================================
+# AUTENTICAÇÃO
+# =====================================================
+
+@residuos_bp.route('/login', methods=['POST'])
+@rate_limit(10, per=60, key=ip_key)
+def login():
+    """
+    Rota de login - retorna token JWT
+    Exemplo de requisição:
+    {
+        "email": "admin@email.com",
+        "senha": "admin123"
+    }
+    """
+    data = request.get_json(silent=True)
+
+    if not data or not data.get('email') or not data.get('senha'):
+        return jsonify({'mensagem': 'Email e senha são obrigatórios'}), 400
+
+    usuario = Usuario.query.filter_by(email=data['email']).first()
+
+    if not usuario or not check_password_hash(usuario.senha, data['senha']):
+        return jsonify({'mensagem': 'Credenciais inválidas'}), 401
+
+    token = jwt.encode({
+        'id': usuario.id,
+        'email': usuario.email,
+        'perfil': usuario.perfil,
+        'nome': usuario.nome
+    }, current_app.config['JWT_SECRET_KEY'], algorithm='HS256')
+
+    return jsonify({
+        'mensagem': 'Login realizado com sucesso',
+        'token': token,
+        'usuario': {
+            'id': usuario.id,
+            'nome': usuario.nome,
+            'email': usuario.email,
+            'perfil': usuario.perfil
+        }
+    }), 200
+
+
+# =====================================================
+# USUÁRIOS
+# =====================================================
+
+@residuos_bp.route('/usuarios', methods=['POST'])
+@funcionario_required
+def cadastrar_usuario(current_user):
+    """
+    Cadastra um novo usuário (apenas funcionários)
+    Exemplo de requisição:
+    {
+        "nome": "João Silva",
+        "email": "joao@email.com",
+        "senha": "senha123",
+        "perfil": "cliente",
+        "telefone": "81999999999"
+    }
+    """
+    data = request.get_json(silent=True)
+
+    if not data or not all(k in data for k in ('nome', 'email', 'senha', 'perfil')):
+        return jsonify({'mensagem': 'Dados incompletos'}), 400
+
+    if data['perfil'] not in [perfil.value for perfil in PerfilUsuario]:
+        return jsonify({'mensagem': 'Perfil inválido. Use "funcionario" ou "cliente"'}), 400
+
+    if Usuario.query.filter_by(email=data['email']).first():
+        return jsonify({'mensagem': 'Email já cadastrado'}), 409
+
+    usuario = Usuario(
+        nome=data['nome'],
+        email=data['email'],
+        senha=generate_password_hash(data['senha']),
+        perfil=data['perfil'],
+        telefone=data.get('telefone', '')
+    )
+    db.session.add(usuario)
+    db.session.commit()
+
+    return jsonify({
+        'mensagem': 'Usuário cadastrado com sucesso',
+        'usuario': {
+            'id': usuario.id,
+            'nome': usuario.nome,
+            'email': usuario.email,
+            'perfil': usuario.perfil
+        }
+    }), 201
+
+
+@residuos_bp.route('/usuarios', methods=['GET'])
+@funcionario_required
+def listar_usuarios(current_user):
+    """Lista todos os usuários (apenas funcionários)"""
+    usuarios = Usuario.query.order_by(Usuario.id).all()
+    return jsonify({'usuarios': [usuario.to_dict() for usuario in usuarios]}), 200
+
+
+@residuos_bp.route('/usuarios/<int:usuario_id>', methods=['GET'])
+@token_required
+def obter_usuario(current_user, usuario_id):
+    """Obtém dados de um usuário específico"""
+    # Clientes só podem ver seus próprios dados
+    if current_user['perfil'] == PerfilUsuario.CLIENTE.value and current_user['id'] != usuario_id:
+        return jsonify({'mensagem': 'Acesso negado'}), 403
+
+    usuario = db.session.get(Usuario, usuario_id)
+    if not usuario:
+        return jsonify({'mensagem': 'Usuário não encontrado'}), 404
+
+    return jsonify(usuario.to_dict()), 200
+
+
+# =====================================================
+# RESÍDUOS
+# =====================================================
+
+@residuos_bp.route('/residuos', methods=['POST'])
+@funcionario_required
+def cadastrar_residuo(current_user):
+    """
+    Cadastra um novo residuo (apenas funcionários)
+    Exemplo de requisição:
+    {
+        "categoria": "Aluminio",
+        "nome_residuo": "latas",
+        "descricao": "latas de refrigerante",
+        "quantidade_total": 20,
+        "quantidade_disponivel": 20
+    }
+    """
+    data = request.get_json(silent=True)
+
+    if not data or not all(k in data for k in ('categoria', 'nome_residuo', 'descricao',
+                                               'quantidade_total')):
+        return jsonify({'mensagem': 'Dados incompletos (categoria, nome_residuo, descricao e '
+                                    'quantidade_total são obrigatórios)'}), 400
+
+    if Residuo.query.filter_by(nome_residuo=data['nome_residuo']).first():
+        return jsonify({'mensagem': 'nome_residuo já cadastrado'}), 409
+
+    residuo = Residuo(
+        categoria=data.get('categoria', ''),
+        nome_residuo=data['nome_residuo'],
+        descricao=data.get('descricao', ''),
+        quantidade_total=data['quantidade_total'],
+        quantidade_disponivel=data.get('quantidade_disponivel', data['quantidade_total'])
+    )
+    db.session.add(residuo)
+    db.session.commit()
+
+    return jsonify({
+        'mensagem': 'Material cadastrado com sucesso',
+        'Material': {
+            'id': residuo.id,
+            'categoria': data['categoria'],
+            'nome_residuo': data['nome_residuo'],
+            'descricao': data.get('descricao', ''),
+            'quantidade_total': data['quantidade_total']
+        }
+    }), 201
+
+
+@residuos_bp.route('/residuos', methods=['GET'])
+@rate_limit(60, per=60)
+def listar_residuo():
+    """Lista resíduos, filtrando por categoria, nome, descrição e disponibilidade (pública)"""
+    query = Residuo.query
+
+    for campo in ('categoria', 'nome_residuo', 'descricao'):
+        valor = request.args.get(campo, '')
+        if valor:
+            query = query.filter(getattr(Residuo, campo).like(f'%{valor}%'))
+
+    if request.args.get('disponivel', '').lower() == 'true':
+        query = query.filter(Residuo.quantidade_disponivel > 0)
+
+    residuos = query.order_by(Residuo.id).all()
+    return jsonify({'residuos': [residuo.to_dict() for residuo in residuos]}), 200
+
+
+@residuos_bp.route('/residuos/<int:residuos_id>', methods=['GET'])
+def obter_residuo(residuos_id):
+    """Obtém dados de um material (rota pública)"""
+    residuo = db.session.get(Residuo, residuos_id)
+    if not residuo:
+        return jsonify({'mensagem': 'material não encontrado'}), 404
+    return jsonify(residuo.to_dict()), 200
+
+
+@residuos_bp.route('/residuos/<int:residuos_id>', methods=['PUT'])
+@funcionario_required
+def atualizar_residuo(current_user, residuos_id):
+    """Atualiza dados de um material (apenas funcionários)"""
+    data = request.get_json(silent=True)
+
+    if not data:
+        return jsonify({'mensagem': 'Dados não fornecidos'}), 400
+
+    residuo = db.session.get(Residuo, residuos_id)
+    if not residuo:
+        return jsonify({'mensagem': 'material não encontrado'}), 404
+
+    for campo in ('categoria', 'nome_residuo', 'descricao'):
+        if campo in data:
+            setattr(residuo, campo, data[campo])
+
+    # Atualiza quantidade_disponivel pela diferença na quantidade total
+    if 'quantidade_total' in data:
+        diferenca = data['quantidade_total'] - residuo.quantidade_total
+        residuo.quantidade_total = data['quantidade_total']
+        residuo.quantidade_disponivel = max(0, residuo.quantidade_disponivel + diferenca)
+        db.session.flush()
+
+        # Aumento de quantidade_total libera estoque para a fila de espera
+        promover_fila_espera(residuos_id)
+
+    db.session.commit()
+    return jsonify({'mensagem': 'material atualizado com sucesso'}), 200
+
+
+@residuos_bp.route('/residuos/<int:residuos_id>', methods=['DELETE'])
+@funcionario_required
+def deletar_residuo(current_user, residuos_id):
+    """Deleta um material (apenas funcionários)"""
+    # Não deleta residuo com reservas ativas
+    ativas = ReservaResiduo.query.filter_by(residuos_id=residuos_id,
+                                            status=StatusReserva.ATIVA.value).count()
+    if ativas > 0:
+        return jsonify({'mensagem': 'Não é possível deletar residuo com reservas ativas'}), 400
+
+    removidos = Residuo.query.filter_by(id=residuos_id).delete()
+    FilaEsperaResiduo.query.filter_by(residuos_id=residuos_id).delete()
+    db.session.commit()
+
+    if removidos == 0:
+        return jsonify({'mensagem': 'material não encontrado'}), 404
+
+    return jsonify({'mensagem': 'material deletado com sucesso'}), 200
+
+
+# =====================================================
+# RESERVAS
+# =====================================================
+
+def _sem_estoque(residuos_id):
+    return jsonify({
+        'mensagem': 'material indisponível no momento. Entre na fila de espera',
+        'fila_espera': f'/api/residuos/{residuos_id}/fila'
+    }), 400
+
+
+@residuos_bp.route('/reservas_residuo', methods=['POST'])
+@token_required
+@idempotent
+def criar_reserva(current_user):
+    """
+    Cria uma nova reserva
+    Exemplo de requisição:
+    {
+        "residuo_id": 1
+    }
+    """
+    data = request.get_json(silent=True)
+
+    if not data or 'residuo_id' not in data:
+        return jsonify({'mensagem': 'residuo_id é obrigatório'}), 400
+
+    residuos_id = data['residuo_id']
+    usuario_id = current_user['id']
+
+    residuo = db.session.get(Residuo, residuos_id)
+    if not residuo:
+        return jsonify({'mensagem': 'material não encontrado'}), 404
+
+    if residuo.quantidade_disponivel <= 0:
+        return _sem_estoque(residuos_id)
+
+    if reserva_ativa(usuario_id, residuos_id):
+        return jsonify({'mensagem': 'Você já possui uma reserva ativa deste material'}), 400
+
+    # The stock check above can race with other reservations: reservar()
+    # takes the unit only if one is still left
+    reserva = reservar(usuario_id, residuos_id)
+    if reserva is None:
+        db.session.rollback()
+        return _sem_estoque(residuos_id)
+    db.session.commit()
+
+    return jsonify({
+        'mensagem': 'Reserva criada com sucesso',
+        'reserva': {
+            'id': reserva.id,
+            'residuos_id': residuos_id,
+            'data_retirada': reserva.data_retirada.strftime(TIMESTAMP_FORMAT),
+            'status': reserva.status
+        }
+    }), 201
+
+
+@residuos_bp.route('/reservas_residuo', methods=['GET'])
+@token_required
+def listar_reservas(current_user):
+    """
+    Lista reservas
+    - Clientes veem apenas suas próprias reservas
+    - Funcionários veem todas as reservas
+    """
+    funcionario = current_user['perfil'] == PerfilUsuario.FUNCIONARIO.value
+    query = (db.session.query(ReservaResiduo, Usuario.nome, Usuario.email)
+             .join(Usuario, ReservaResiduo.usuario_id == Usuario.id)
+             .join(Residuo, ReservaResiduo.residuos_id == Residuo.id))
+    if not funcionario:
+        query = query.filter(ReservaResiduo.usuario_id == current_user['id'])
+
+    reservas_lista = []
+    for reserva, usuario_nome, usuario_email in query.order_by(
+            ReservaResiduo.data_retirada.desc()):
+        item = {
+            'id': reserva.id,
+            'residuos_id': reserva.residuos_id,
+            'data_retirada': reserva.data_retirada.strftime(TIMESTAMP_FORMAT),
+            'data_devolucao': reserva.data_devolucao.strftime(TIMESTAMP_FORMAT)
+            if reserva.data_devolucao else None,
+            'status': reserva.status
+        }
+
+        # Adiciona informações do usuário apenas para funcionários
+        if funcionario:
+            item['usuario_id'] = reserva.usuario_id
+            item['usuario_nome'] = usuario_nome
+            item['usuario_email'] = usuario_email
+
+        reservas_lista.append(item)
+
+    return jsonify({'reservas_residuo': reservas_lista}), 200
+
+
+@residuos_bp.route('/reservas_residuo/<int:reserva_id>/devolver', methods=['PUT'])
+@token_required
+def devolver_material(current_user, reserva_id):
+    """Marca uma reserva como devolvida"""
+    reserva = db.session.get(ReservaResiduo, reserva_id)
+
+    if not reserva:
+        return jsonify({'mensagem': 'Reserva não encontrada'}), 404
+
+    # Cliente só pode devolver suas próprias reservas
+    if (current_user['perfil'] == PerfilUsuario.CLIENTE.value
+            and reserva.usuario_id != current_user['id']):
+        return jsonify({'mensagem': 'Acesso negado'}), 403
+
+    if reserva.status == StatusReserva.DEVOLVIDA.value:
+        return jsonify({'mensagem': 'material já foi devolvido'}), 400
+
+    reserva.status = StatusReserva.DEVOLVIDA.value
+    reserva.data_devolucao = now()
+    devolver_unidade(reserva.residuos_id)
+
+    # Repassa o item devolvido para o primeiro da fila, na mesma transação
+    promover_fila_espera(reserva.residuos_id)
+    db.session.commit()
+
+    return jsonify({
+        'mensagem': 'material devolvido com sucesso',
+        'data_devolucao': reserva.data_devolucao.strftime(TIMESTAMP_FORMAT)
+    }), 200
+
+
+@residuos_bp.route('/reservas_residuo/<int:reserva_id>', methods=['DELETE'])
+@funcionario_required
+def cancelar_reserva(current_user, reserva_id):
+    """Cancela/deleta uma reserva (apenas funcionários)"""
+    reserva = db.session.get(ReservaResiduo, reserva_id)
+
+    if not reserva:
+        return jsonify({'mensagem': 'Reserva não encontrada'}), 404
+
+    ativa = reserva.status == StatusReserva.ATIVA.value
+    residuos_id = reserva.residuos_id
+    db.session.delete(reserva)
+
+    # Reserva ativa devolve o material ao estoque e à fila
+    if ativa:
+        devolver_unidade(residuos_id)
+        promover_fila_espera(residuos_id)
+    db.session.commit()
+
+    return jsonify({'mensagem': 'Reserva cancelada com sucesso'}), 200
+
+
+# =====================================================
+# FILA DE ESPERA
+# =====================================================
+
+@residuos_bp.route('/residuos/<int:residuos_id>/fila', methods=['POST'])
+@token_required
+def entrar_fila_espera(current_user, residuos_id):
+    """
+    Entra na fila de espera de um residuo esgotado.
+    Quando o estoque voltar, o primeiro da fila recebe a reserva automaticamente.
+    """
+    usuario_id = current_user['id']
+
+    residuo = db.session.get(Residuo, residuos_id)
+    if not residuo:
+        return jsonify({'mensagem': 'material não encontrado'}), 404
+
+    if residuo.quantidade_disponivel > 0:
+        return jsonify({'mensagem': 'material disponível, faça a reserva diretamente'}), 400
+
+    if reserva_ativa(usuario_id, residuos_id):
+        return jsonify({'mensagem': 'Você já possui uma reserva ativa deste material'}), 400
+
+    if posicao_fila_espera(usuario_id, residuos_id) is not None:
+        return jsonify({'mensagem': 'Você já está na fila de espera deste material'}), 409
+
+    entrada = FilaEsperaResiduo(usuario_id=usuario_id, residuos_id=residuos_id,
+                                enfileirado_em=now())
+    db.session.add(entrada)
+    db.session.commit()
+
+    return jsonify({
+        'mensagem': 'Você entrou na fila de espera',
+        'fila': {
+            'residuos_id': residuos_id,
+            'enfileirado_em': entrada.enfileirado_em.strftime(TIMESTAMP_FORMAT),
+            'posicao': posicao_fila_espera(usuario_id, residuos_id)
+        }
+    }), 201
+
+
+@residuos_bp.route('/residuos/<int:residuos_id>/fila', methods=['GET'])
+@token_required
+def obter_posicao_fila(current_user, residuos_id):
+    """Informa a posição do usuário na fila de espera de um residuo"""
+    posicao = posicao_fila_espera(current_user['id'], residuos_id)
+
+    if posicao is None:
+        return jsonify({'mensagem': 'Você não está na fila de espera deste material'}), 404
+
+    total = FilaEsperaResiduo.query.filter_by(residuos_id=residuos_id).count()
+
+    return jsonify({
+        'residuos_id': residuos_id,
+        'posicao': posicao,
+        'total_na_fila': total
+    }), 200
+
+
+@residuos_bp.route('/residuos/<int:residuos_id>/fila', methods=['DELETE'])
+@token_required
+def sair_fila_espera(current_user, residuos_id):
+    """Remove o usuário da fila de espera de um residuo"""
+    removidos = FilaEsperaResiduo.query.filter_by(usuario_id=current_user['id'],
+                                                  residuos_id=residuos_id).delete()
+    db.session.commit()
+
+    if removidos == 0:
+        return jsonify({'mensagem': 'Você não está na fila de espera deste material'}), 404
+
+    return jsonify({'mensagem': 'Você saiu da fila de espera'}), 200
+
+
+# =====================================================
+# STATUS
+# =====================================================
+
+@residuos_bp.route('/status', methods=['GET'])
+def status():
+    """Verifica se a API está funcionando"""
+    return jsonify({
+        'status': 'online',
+        'mensagem': 'API do reciclo funcionando',
+        'versao': '1.0'
+    }), 200
@@ -0,0 +1,13 @@
+"""
+Serializers package initialization.
+Column-projection serializers for read-only list endpoints.
+"""
+from serializers.rows import (
+    RowSerializer, MATERIAL_ROWS, ARCHIVED_MATERIAL_ROWS, COLLECTION_ROWS,
+    ARCHIVED_COLLECTION_ROWS, SPACE_ROWS, EVENT_ROWS, USER_ROWS
+)
+
+__all__ = [
+    'RowSerializer', 'MATERIAL_ROWS', 'ARCHIVED_MATERIAL_ROWS', 'COLLECTION_ROWS',
+    'ARCHIVED_COLLECTION_ROWS', 'SPACE_ROWS', 'EVENT_ROWS', 'USER_ROWS'
+]
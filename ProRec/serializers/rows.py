@@ -0,0 +1,221 @@
+"""
+Row serializers - JSON dicts built straight from selected columns.
+
+List endpoints used to load full ORM instances (identity map, attribute
+instrumentation, lazy relationship loads for names) only to call
+to_dict() on them. A RowSerializer selects just the columns its to_dict()
+needs, joining related names in the same query, and converts each result
+tuple with a plain function that reads the models' module-level display
+tables. The dicts are equal to the models' to_dict() output;
+`flask bench serializers` checks that and measures both paths.
+"""
+from datetime import datetime
+from sqlalchemy.orm import aliased
+from models.user import User, TIPO_DISPLAY as USER_TIPO_DISPLAY, STATUS_DISPLAY as USER_STATUS_DISPLAY
+from models.material import (
+    Material, CATEGORIA_DISPLAY, STATUS_DISPLAY as MATERIAL_STATUS_DISPLAY, foto_dict
+)
+from models.achievement import Collection
+from models.archive import ArchivedCollection, ArchivedMaterial
+from models.space import Space, TIPO_DISPLAY as SPACE_TIPO_DISPLAY
+from models.event import Event, TIPO_DISPLAY as EVENT_TIPO_DISPLAY, STATUS_DISPLAY as EVENT_STATUS_DISPLAY
+from models.opening_hours import describe_mask, mask_from_bytes
+
+# strftime('%b') month names, resolved once instead of per row
+_MONTH_ABBR = (None,) + tuple(datetime(2000, month, 1).strftime('%b') for month in range(1, 13))
+
+
+class RowSerializer:
+    """
+    Precompiled projection: the columns to select, the outer joins they
+    need and the function turning one row tuple into a dict.
+    """
+
+    __slots__ = ('columns', 'joins', 'convert')
+
+    def __init__(self, columns, convert, joins=()):
+        self.columns = tuple(columns)
+        self.joins = tuple(joins)
+        self.convert = convert
+
+    def select(self, query):
+        """Restrict a model query to the serializer's columns."""
+        for target, onclause in self.joins:
+            query = query.outerjoin(target, onclause)
+        return query.with_entities(*self.columns)
+
+    def all(self, query):
+        """Run a model query and serialize every row."""
+        convert = self.convert
+        return [convert(row) for row in self.select(query)]
+
+
+def _full_name(first_name, last_name, username):
+    """Same rule as User.get_full_name."""
+    if first_name and last_name:
+        return f'{first_name} {last_name}'
+    return username
+
+
+def _dmy(value):
+    """strftime('%d/%m/%Y') without the per-call format parsing."""
+    return f'{value.day:02d}/{value.month:02d}/{value.year}' if value else None
+
+
+_Produtor = aliased(User)
+
+
+def _material(row):
+    (id, nome, categoria, descricao, localizacao, quantidade, quantidade_valor, unidade,
+     status, feedback, pontos, first_name, last_name, username, produtor_id, curador_id,
+     criado_em, revisado_em, foto_hash, foto_formato, foto_largura, foto_altura) = row
+    return {
+        'id': id,
+        'name': nome,
+        'category': CATEGORIA_DISPLAY.get(categoria) or categoria.capitalize(),
+        'category_value': categoria,
+        'description': descricao,
+        'location': localizacao,
+        'quantity': quantidade,
+        'quantity_value': quantidade_valor,
+        'quantity_unit': unidade,
+        'status': status,
+        'status_display': MATERIAL_STATUS_DISPLAY.get(status, 'Desconhecido'),
+        'feedback': feedback,
+        'points': pontos,
+        'producer': _full_name(first_name, last_name, username),
+        'producer_id': produtor_id,
+        'curator_id': curador_id,
+        'date': _dmy(criado_em),
+        'reviewed_date': _dmy(revisado_em),
+        'photo': foto_dict(foto_hash, foto_formato, foto_largura, foto_altura)
+    }
+
+
+def _material_rows(M):
+    """Material serializer over the hot model or its archive alias."""
+    return RowSerializer(
+        (M.id, M.nome, M.categoria, M.descricao, M.localizacao, M.quantidade,
+         M.quantidade_valor, M.unidade, M.status, M.feedback, M.pontos_concedidos,
+         _Produtor.first_name, _Produtor.last_name, _Produtor.username, M.produtor_id,
+         M.curador_id, M.criado_em, M.revisado_em, M.foto_hash, M.foto_formato,
+         M.foto_largura, M.foto_altura),
+        _material,
+        joins=[(_Produtor, _Produtor.id == M.produtor_id)]
+    )
+
+
+MATERIAL_ROWS = _material_rows(Material)
+ARCHIVED_MATERIAL_ROWS = _material_rows(ArchivedMaterial)
+
+
+def _collection(row):
+    (id, material_nome, categoria, quantidade, quantidade_valor, unidade, pontos,
+     feedback, data_coleta) = row
+    return {
+        'id': id,
+        'material_name': material_nome,
+        'category': CATEGORIA_DISPLAY.get(categoria) or categoria.capitalize(),
+        'category_value': categoria,
+        'quantity': quantidade,
+        'quantity_value': quantidade_valor,
+        'quantity_unit': unidade,
+        'points': pontos,
+        'feedback': feedback,
+        'date': f'{data_coleta.year}-{data_coleta.month:02d}-{data_coleta.day:02d}'
+        if data_coleta else None
+    }
+
+
+def _collection_rows(C):
+    """Collection serializer over the hot model or its archive alias."""
+    return RowSerializer(
+        (C.id, C.material_nome, C.categoria, C.quantidade, C.quantidade_valor, C.unidade,
+         C.pontos, C.feedback, C.data_coleta),
+        _collection
+    )
+
+
+COLLECTION_ROWS = _collection_rows(Collection)
+ARCHIVED_COLLECTION_ROWS = _collection_rows(ArchivedCollection)
+
+
+def _space(row):
+    (id, nome, tipo, endereco, horario, horario_semanal, descricao, ativo,
+     latitude, longitude) = row
+    return {
+        'id': id,
+        'name': nome,
+        'type': tipo,
+        'type_display': SPACE_TIPO_DISPLAY.get(tipo, 'Desconhecido'),
+        'address': endereco,
+        'hours': horario,
+        'weekly_hours': describe_mask(mask_from_bytes(horario_semanal)),
+        'description': descricao,
+        'active': ativo,
+        'latitude': latitude,
+        'longitude': longitude
+    }
+
+
+SPACE_ROWS = RowSerializer(
+    (Space.id, Space.nome, Space.tipo, Space.endereco, Space.horario, Space.horario_semanal,
+     Space.descricao, Space.ativo, Space.latitude, Space.longitude),
+    _space
+)
+
+
+_Espaco = aliased(Space)
+
+
+def _event(row):
+    (id, titulo, descricao, tipo, status, data_inicio, horario, espaco_nome,
+     localizacao_custom, espaco_id, recorrencia) = row
+    return {
+        'id': id,
+        'title': titulo,
+        'description': descricao,
+        'type': tipo,
+        'type_display': EVENT_TIPO_DISPLAY.get(tipo, 'Desconhecido'),
+        'status': status,
+        'status_display': EVENT_STATUS_DISPLAY.get(status, 'Desconhecido'),
+        'date': f'{data_inicio.day:02d} {_MONTH_ABBR[data_inicio.month]} {data_inicio.year}'
+        if data_inicio else None,
+        'date_iso': data_inicio.isoformat() if data_inicio else None,
+        'time': horario,
+        'location': espaco_nome if espaco_nome is not None
+        else localizacao_custom or 'Local não definido',
+        'space_id': espaco_id,
+        'recurrence': recorrencia
+    }
+
+
+EVENT_ROWS = RowSerializer(
+    (Event.id, Event.titulo, Event.descricao, Event.tipo, Event.status, Event.data_inicio,
+     Event.horario, _Espaco.nome, Event.localizacao_custom, Event.espaco_id, Event.recorrencia),
+    _event,
+    joins=[(_Espaco, _Espaco.id == Event.espaco_id)]
+)
+
+
+def _user(row):
+    (id, username, email, first_name, last_name, tipo, status, pontos, ultima_atividade) = row
+    return {
+        'id': id,
+        'username': username,
+        'email': email,
+        'nome': _full_name(first_name, last_name, username),
+        'tipo': tipo,
+        'tipo_display': USER_TIPO_DISPLAY.get(tipo, 'Desconhecido'),
+        'status': status,
+        'status_display': USER_STATUS_DISPLAY.get(status, 'Desconhecido'),
+        'pontos': pontos,
+        'ultima_atividade': ultima_atividade.isoformat() if ultima_atividade else None
+    }
+
+
+USER_ROWS = RowSerializer(
+    (User.id, User.username, User.email, User.first_name, User.last_name, User.tipo,
+     User.status, User.pontos, User.ultima_atividade),
+    _user
+)
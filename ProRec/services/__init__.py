@@ -0,0 +1,4 @@
+"""
+Services package initialization.
+Domain logic shared by routes and maintenance scripts.
+"""
@@ -0,0 +1,178 @@
+"""
+Analytics services - Collection reports read from the daily rollups.
+
+collection_rollups is maintained in the same flush as every collection
+(see models.rollup), so reports only read rollup rows for the requested
+days: their cost follows the length of the range, not the size of the
+collections history.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, select, union_all
+from extensions import db
+from models.achievement import Collection
+from models.archive import ArchivedCollection, collections_archive
+from models.rollup import CollectionRollup
+from services.archive import reaches_archive
+
+GRANULARITIES = ('day', 'week', 'month')
+
+# Longest range accepted by collection_report
+MAX_REPORT_DAYS = 3 * 366
+
+
+def bucket_of(day, granularity):
+    """First day of the day/week (Monday)/month bucket containing a date."""
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def collection_report(start, end, granularity='day', categoria=None, produtor_id=None):
+    """
+    Collections and points per bucket and category.
+
+    Args:
+        start: First day included
+        end: Last day included
+        granularity: 'day', 'week' or 'month'
+        categoria: Only this category
+        produtor_id: Only this producer
+
+    Returns:
+        Dict with the buckets (oldest first) and the totals of the range
+    """
+    query = db.session.query(
+        CollectionRollup.dia,
+        CollectionRollup.categoria,
+        func.sum(CollectionRollup.coletas),
+        func.sum(CollectionRollup.pontos)
+    ).filter(CollectionRollup.dia >= start, CollectionRollup.dia <= end)
+    if categoria:
+        query = query.filter(CollectionRollup.categoria == categoria)
+    if produtor_id is not None:
+        query = query.filter(CollectionRollup.produtor_id == produtor_id)
+    rows = query.group_by(CollectionRollup.dia, CollectionRollup.categoria).all()
+
+    buckets = {}
+    for dia, cat, coletas, pontos in rows:
+        if not coletas:
+            continue  # Every collection of the day was deleted
+        bucket = buckets.setdefault(bucket_of(dia, granularity), {})
+        totals = bucket.setdefault(cat, [0, 0])
+        totals[0] += coletas
+        totals[1] += pontos
+
+    result = []
+    total_collections = total_points = 0
+    for period in sorted(buckets):
+        categories = [
+            {'category': cat, 'collections': coletas, 'points': pontos}
+            for cat, (coletas, pontos) in sorted(buckets[period].items())
+        ]
+        collections = sum(c['collections'] for c in categories)
+        points = sum(c['points'] for c in categories)
+        total_collections += collections
+        total_points += points
+        result.append({
+            'period': period.isoformat(),
+            'collections': collections,
+            'points': points,
+            'categories': categories
+        })
+
+    return {
+        'buckets': result,
+        'total_collections': total_collections,
+        'total_points': total_points
+    }
+
+
+def rebuild_rollups(start=None):
+    """
+    Recompute the rollups from the collections, archived ones included.
+
+    Args:
+        start: Only rebuild days from this date on (default: everything)
+
+    Returns:
+        Number of rollup rows written; the caller commits
+    """
+    since = datetime.combine(start, datetime.min.time()) if start is not None else None
+    tables = [Collection.__table__]
+    if reaches_archive('collections', since):
+        tables.append(collections_archive)
+
+    # Archived collections still count: rebuild from both tables
+    arms = []
+    for table in tables:
+        arm = select(table.c.data_coleta, table.c.categoria, table.c.produtor_id, table.c.id,
+                     table.c.pontos)
+        if since is not None:
+            arm = arm.where(table.c.data_coleta >= since)
+        arms.append(arm)
+    collections = union_all(*arms).subquery() if len(arms) > 1 else arms[0].subquery()
+
+    dia = func.date(collections.c.data_coleta)
+    clear = delete(CollectionRollup)
+    source = select(
+        dia, collections.c.categoria, collections.c.produtor_id,
+        func.count(collections.c.id), func.sum(collections.c.pontos)
+    ).group_by(dia, collections.c.categoria, collections.c.produtor_id)
+    if start is not None:
+        clear = clear.where(CollectionRollup.dia >= start)
+
+    db.session.execute(clear)
+    return db.session.execute(
+        CollectionRollup.__table__.insert().from_select(
+            ['dia', 'categoria', 'produtor_id', 'coletas', 'pontos'], source
+        )
+    ).rowcount
+
+
+def quantity_totals(start, end, categoria=None):
+    """
+    Collected quantities summed by category and canonical unit.
+
+    Reads only ix_collections_data_categoria_unidade_valor (and its
+    archive twin when the range reaches archived collections).
+
+    Args:
+        start: First day included
+        end: Last day included
+        categoria: Only this category
+
+    Returns:
+        Dict with the totals and the number of collections whose quantity
+        could not be parsed
+    """
+    since = datetime.combine(start, datetime.min.time())
+    entities = [Collection]
+    if reaches_archive('collections', since):
+        entities.append(ArchivedCollection)
+
+    sums = {}
+    for C in entities:
+        query = db.session.query(
+            C.categoria, C.unidade, func.count(), func.sum(C.quantidade_valor)
+        ).filter(
+            C.data_coleta >= since,
+            C.data_coleta < datetime.combine(end + timedelta(days=1), datetime.min.time())
+        )
+        if categoria:
+            query = query.filter(C.categoria == categoria)
+        for cat, unidade, coletas, valor in query.group_by(C.categoria, C.unidade):
+            total = sums.setdefault((cat, unidade), [0, 0])
+            total[0] += coletas
+            total[1] += valor or 0
+
+    unparsed = sum(coletas for (_, unidade), (coletas, _) in sums.items() if unidade is None)
+    totals = [
+        {'category': cat, 'unit': unidade, 'collections': coletas, 'total': round(valor, 3)}
+        for (cat, unidade), (coletas, valor) in sorted(
+            item for item in sums.items() if item[0][1] is not None
+        )
+    ]
+
+    return {'totals': totals, 'unparsed_collections': unparsed}
@@ -0,0 +1,195 @@
+"""
+Archive services - Hot/cold split of reviewed materials, collections and
+read notifications.
+
+archive() moves rows older than the configured age from the hot tables to
+their *_archive tables in batches of BATCH_SIZE, one transaction each, so
+the hot tables and their indexes only hold what the curator queue,
+dashboards and recent history read. Rows are moved with plain SQL, so the
+collection rollups (and other flush listeners) keep counting them; the
+change log gets an 'archive' entry per moved row instead of a delete.
+
+Each table records a watermark older than every row it archived. Reads
+that stay after it never touch the archive; newest-first reads that reach
+back past it merge both tables (newest_first), and counts and range
+reports add the archive in (count, reaches_archive).
+
+The newest row of a table is never archived, so SQLite keeps handing out
+ids above every archived one and ids stay unique across both tables.
+"""
+import heapq
+from datetime import datetime, timedelta
+from itertools import islice
+from sqlalchemy import and_, delete, func, select
+from sqlalchemy.dialects.sqlite import insert
+from extensions import db
+from models.archive import (
+    ArchiveWatermark, ArchivedCollection, ArchivedMaterial, ArchivedNotificacao,
+    collections_archive, materials_archive, notificacoes_archive
+)
+from models.achievement import Collection
+from models.change_log import OperacaoChange, log_changes
+from models.material import Material, StatusMaterial
+from models.user import Notificacao
+
+# Default age after which rows are archived (ARCHIVE_AFTER_DAYS overrides it)
+ARCHIVE_AFTER = timedelta(days=365)
+
+# Rows younger than this stay in the main tables, whatever ARCHIVE_AFTER_DAYS says
+MIN_AGE = timedelta(days=35)
+
+# Rows moved per transaction
+BATCH_SIZE = 1000
+
+_REVIEWED = (StatusMaterial.APPROVED.value, StatusMaterial.REJECTED.value)
+
+# name -> (model, archive table, archive alias, rows that may be archived before a cutoff)
+ARCHIVES = {
+    'collections': (
+        Collection, collections_archive, ArchivedCollection,
+        lambda cutoff: Collection.data_coleta < cutoff
+    ),
+    'materials': (
+        Material, materials_archive, ArchivedMaterial,
+        lambda cutoff: and_(Material.status.in_(_REVIEWED), Material.criado_em < cutoff,
+                            Material.revisado_em < cutoff)
+    ),
+    'notificacoes': (
+        Notificacao, notificacoes_archive, ArchivedNotificacao,
+        lambda cutoff: and_(Notificacao.lida.is_(True), Notificacao.criada_em < cutoff)
+    )
+}
+
+
+def watermark(name):
+    """Date every archived row of a table is older than, or None if none was archived."""
+    row = db.session.get(ArchiveWatermark, name)
+    return row.ate if row else None
+
+
+def reaches_archive(name, start=None):
+    """Whether a read of rows dated from `start` on (None: all) needs the archive."""
+    ate = watermark(name)
+    return ate is not None and (start is None or start < ate)
+
+
+def _raise_watermark(name, cutoff):
+    statement = insert(ArchiveWatermark).values(tabela=name, ate=cutoff)
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=['tabela'],
+        set_={'ate': func.max(ArchiveWatermark.ate, statement.excluded.ate)}
+    ))
+
+
+def archive_table(name, cutoff, batch_size=BATCH_SIZE):
+    """
+    Move the archivable rows of one table dated before cutoff.
+
+    Each batch is copied and deleted in its own committed transaction,
+    together with the watermark.
+
+    Returns:
+        Number of rows moved
+    """
+    model, table, _, archivable = ARCHIVES[name]
+    hot = model.__table__
+    newest = db.session.query(func.max(model.id)).scalar()
+    if newest is None:
+        return 0
+
+    columns = [column.name for column in hot.columns]
+    moved = 0
+    while True:
+        ids = [row[0] for row in db.session.query(model.id)
+               .filter(archivable(cutoff), model.id < newest)
+               .order_by(model.id).limit(batch_size)]
+        if not ids:
+            break
+        _raise_watermark(name, cutoff)
+        db.session.execute(table.insert().from_select(
+            columns, select(*hot.columns).where(hot.c.id.in_(ids))
+        ))
+        db.session.execute(delete(hot).where(hot.c.id.in_(ids)))
+        log_changes(db.session, hot.name, ids, OperacaoChange.ARCHIVE.value)
+        db.session.commit()
+        moved += len(ids)
+    return moved
+
+
+def archive(max_age=ARCHIVE_AFTER, batch_size=BATCH_SIZE, now=None):
+    """
+    Archive every table (collections before the materials they came from).
+
+    Args:
+        max_age: Rows older than this are archived
+        batch_size: Rows moved per transaction
+
+    Returns:
+        Dict of rows moved per table
+
+    Raises:
+        ValueError: if max_age is below MIN_AGE
+    """
+    if max_age < MIN_AGE:
+        raise ValueError(f'Rows must be at least {MIN_AGE.days} days old to be archived')
+    cutoff = (now or datetime.utcnow()) - max_age
+    return {name: archive_table(name, cutoff, batch_size) for name in ARCHIVES}
+
+
+def archive_stats():
+    """Hot rows, archived rows and watermark of every table."""
+    stats = {}
+    for name, (model, table, _, _) in ARCHIVES.items():
+        ate = watermark(name)
+        stats[name] = {
+            'hot': db.session.query(func.count(model.id)).scalar(),
+            'archived': db.session.execute(select(func.count()).select_from(table)).scalar(),
+            'watermark': ate.isoformat() if ate else None
+        }
+    return stats
+
+
+def newest_first(name, hot_query, archived_query, key, limit=None):
+    """
+    Newest rows of a read, falling through to the archive when it reaches
+    back that far.
+
+    The hot query runs first; the archive is only read when the page is
+    short or its oldest row predates the watermark, and both are merged.
+
+    Args:
+        name: Table name in ARCHIVES
+        hot_query: Query on the hot model, ordered newest first
+        archived_query: Function returning the same query on the archive alias
+        key: Function(row) -> the (date, id) the queries are ordered by
+        limit: Rows wanted (None for all)
+
+    Returns:
+        List of rows, newest first
+    """
+    rows = hot_query.limit(limit).all()
+    ate = watermark(name)
+    if ate is None or (limit is not None and len(rows) == limit and key(rows[-1])[0] >= ate):
+        return rows
+    archived = archived_query().limit(limit).all()
+    for row in archived:
+        if isinstance(row, db.Model):
+            db.session.expunge(row)  # Read-only: never flushed back to the hot table
+    merged = heapq.merge(rows, archived, key=key, reverse=True)
+    return list(islice(merged, limit))
+
+
+def count(name, query_for):
+    """
+    Count rows in the hot table and, once it has archived rows, the archive.
+
+    Args:
+        name: Table name in ARCHIVES
+        query_for: Function(entity) -> query to count; called with the hot
+            model and its archive alias
+    """
+    model, _, alias, _ = ARCHIVES[name]
+    total = query_for(model).count()
+    if watermark(name) is not None:
+        total += query_for(alias).count()
+    return total
@@ -0,0 +1,264 @@
+"""
+Calendar services - Event range queries, month grids and iCalendar export.
+
+Calendar apps fetch subscribed feeds without the session cookie, so each
+user can have a feed token for the .ics URL. Only its SHA-256 is stored;
+issuing a new token revokes the previous one.
+"""
+import hashlib
+import hmac
+import secrets
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+from extensions import db
+from models.event import Event, StatusEvento
+from models.user import User
+from services.recurrence import occurrences_between
+
+# Longest window a single range query may cover
+MAX_RANGE_DAYS = 366
+
+# Number of events fetched per round-trip while streaming an export
+ICS_BATCH_SIZE = 200
+
+
+def parse_date_param(value, end=False):
+    """
+    Parse a 'from'/'to' query parameter.
+
+    Accepts either a date ('2026-10-01') or a full ISO datetime. A bare date
+    used as the end of a range covers the whole day.
+
+    Args:
+        value: Raw query string value
+        end: True when parsing the exclusive end of a range
+
+    Returns:
+        datetime, or None if value is empty
+
+    Raises:
+        ValueError: if the value is not a valid ISO date/datetime
+    """
+    if not value:
+        return None
+
+    if len(value) == 10:
+        parsed = datetime.combine(date.fromisoformat(value), datetime.min.time())
+        return parsed + timedelta(days=1) if end else parsed
+
+    return datetime.fromisoformat(value)
+
+
+def events_in_range_query(start, end, space_id=None, tipo=None, statuses=None):
+    """
+    Build the query for single (non-recurring) events starting in [start, end).
+
+    The filter on (data_inicio, status) is served by ix_events_data_inicio_status.
+    Recurring series are expanded by services.recurrence.occurrences_between.
+
+    Args:
+        start: Inclusive window start
+        end: Exclusive window end
+        space_id: Optional space filter
+        tipo: Optional event type filter
+        statuses: Status values to include (default: everything but cancelled)
+
+    Returns:
+        SQLAlchemy query ordered by start date
+    """
+    if statuses is None:
+        statuses = [s.value for s in StatusEvento if s != StatusEvento.CANCELADO]
+
+    query = Event.query.filter(
+        Event.data_inicio >= start,
+        Event.data_inicio < end,
+        Event.status.in_(statuses),
+        Event.recorrencia.is_(None)
+    )
+
+    if space_id is not None:
+        query = query.filter(Event.espaco_id == space_id)
+    if tipo:
+        query = query.filter(Event.tipo == tipo)
+
+    return query.order_by(Event.data_inicio, Event.id)
+
+
+def month_day_counts(year, month, space_id=None, tipo=None, statuses=None):
+    """
+    Count events per day for a month grid.
+
+    Returns:
+        List of {'date': 'YYYY-MM-DD', 'count': n} for every day of the month
+    """
+    start = datetime(year, month, 1)
+    days_in_month = monthrange(year, month)[1]
+    end = start + timedelta(days=days_in_month)
+
+    query = events_in_range_query(start, end, space_id, tipo, statuses).order_by(None)
+    day = func.date(Event.data_inicio)
+    rows = query.with_entities(day, func.count(Event.id)).group_by(day).all()
+    counts = {str(row[0]): row[1] for row in rows}
+
+    # Recurring series are expanded inside the month only
+    for occurrence in occurrences_between(start, end, space_id, tipo, statuses,
+                                          include_single=False):
+        key = occurrence.start.strftime('%Y-%m-%d')
+        counts[key] = counts.get(key, 0) + 1
+
+    result = []
+    for offset in range(days_in_month):
+        key = (start + timedelta(days=offset)).strftime('%Y-%m-%d')
+        result.append({'date': key, 'count': counts.get(key, 0)})
+    return result
+
+
+def _ics_escape(text):
+    """Escape a TEXT value per RFC 5545."""
+    return (text.replace('\\', '\\\\')
+                .replace(';', '\\;')
+                .replace(',', '\\,')
+                .replace('\r\n', '\\n')
+                .replace('\n', '\\n'))
+
+
+def _ics_line(name, value):
+    """Build a content line folded at 75 octets, terminated with CRLF."""
+    line = f'{name}:{value}'.encode('utf-8')
+    chunks = []
+    while len(line) > 75:
+        # Never split a multi-byte UTF-8 sequence
+        cut = 75 if not chunks else 74
+        while (line[cut] & 0xC0) == 0x80:
+            cut -= 1
+        chunks.append(line[:cut])
+        line = line[cut:]
+    chunks.append(line)
+    return (b'\r\n ').join(chunks).decode('utf-8') + '\r\n'
+
+
+def _ics_datetime(value):
+    """Format a naive local datetime as a floating iCalendar DATE-TIME."""
+    return value.strftime('%Y%m%dT%H%M%S')
+
+
+def ics_event(event, host, exceptions=(), exception=None):
+    """
+    Render a single VEVENT block.
+
+    Args:
+        event: Event row (single event or recurring series master)
+        host: Host name used to build stable UIDs
+        exceptions: For a series master, all of its exceptions
+        exception: When set, render this modified occurrence of the series
+    """
+    start = event.data_inicio
+    end = event.data_fim
+    title = event.titulo
+    description = event.descricao
+    status = event.status
+
+    if exception is not None:
+        duration = end - start if end else None
+        start = exception.data_inicio or exception.data_original
+        end = exception.data_fim or (start + duration if duration else None)
+        title = exception.titulo or title
+        description = exception.descricao or description
+        status = exception.status or status
+
+    lines = [
+        'BEGIN:VEVENT\r\n',
+        _ics_line('UID', f'event-{event.id}@{host}'),
+        _ics_line('DTSTAMP', (event.criado_em or datetime.utcnow()).strftime('%Y%m%dT%H%M%SZ')),
+    ]
+    if exception is not None:
+        lines.append(_ics_line('RECURRENCE-ID', _ics_datetime(exception.data_original)))
+    lines.append(_ics_line('DTSTART', _ics_datetime(start)))
+    if end:
+        lines.append(_ics_line('DTEND', _ics_datetime(end)))
+    if event.recorrencia and exception is None:
+        lines.append(_ics_line('RRULE', event.recorrencia))
+        for cancelled in exceptions:
+            if cancelled.cancelada:
+                lines.append(_ics_line('EXDATE', _ics_datetime(cancelled.data_original)))
+    lines.append(_ics_line('SUMMARY', _ics_escape(title)))
+    if description:
+        lines.append(_ics_line('DESCRIPTION', _ics_escape(description)))
+    lines.append(_ics_line('LOCATION', _ics_escape(event.get_localizacao())))
+    lines.append(_ics_line('CATEGORIES', _ics_escape(event.get_tipo_display())))
+    if status == StatusEvento.CANCELADO.value:
+        lines.append('STATUS:CANCELLED\r\n')
+    lines.append('END:VEVENT\r\n')
+    return ''.join(lines)
+
+
+def iter_ics(query, series_query, host):
+    """
+    Stream an iCalendar document.
+
+    Single events are fetched in batches with yield_per so the whole calendar
+    is never held in memory; each VEVENT is yielded as soon as it is rendered.
+    Recurring series are exported once with their RRULE, EXDATEs for cancelled
+    occurrences and a RECURRENCE-ID override per modified occurrence.
+
+    Args:
+        query: Single events query (see events_in_range_query)
+        series_query: Recurring series query (see recurring_series_query)
+        host: Host name used to build stable UIDs
+    """
+    yield ('BEGIN:VCALENDAR\r\n'
+           'VERSION:2.0\r\n'
+           'PRODID:-//ProRec//Reciclo//PT\r\n'
+           'CALSCALE:GREGORIAN\r\n'
+           'X-WR-CALNAME:Reciclo - Eventos\r\n')
+
+    events = query.options(joinedload(Event.espaco)).yield_per(ICS_BATCH_SIZE)
+    for event in events:
+        yield ics_event(event, host)
+
+    for event in series_query.options(joinedload(Event.espaco)):
+        exceptions = event.excecoes.all()
+        yield ics_event(event, host, exceptions)
+        for exception in exceptions:
+            if not exception.cancelada:
+                yield ics_event(event, host, exception=exception)
+
+    yield 'END:VCALENDAR\r\n'
+
+
+def _feed_token_digest(secret):
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+def issue_feed_token(user):
+    """
+    Give a user a new calendar feed token, revoking the previous one, and commit.
+
+    Returns:
+        Token for the feed URL ('<user id>.<secret>'); it cannot be read back later
+    """
+    secret = secrets.token_urlsafe(32)
+    user.calendario_token = _feed_token_digest(secret)
+    db.session.commit()
+    return f'{user.id}.{secret}'
+
+
+def revoke_feed_token(user):
+    """Revoke a user's calendar feed token and commit."""
+    user.calendario_token = None
+    db.session.commit()
+
+
+def feed_token_user(token):
+    """Active user a calendar feed token belongs to, or None."""
+    user_id, sep, secret = token.partition('.')
+    if not sep or not user_id.isdigit():
+        return None
+    user = db.session.get(User, int(user_id))
+    if user is None or user.calendario_token is None or not user.is_ativo():
+        return None
+    if not hmac.compare_digest(user.calendario_token, _feed_token_digest(secret)):
+        return None
+    return user
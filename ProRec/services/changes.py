@@ -0,0 +1,137 @@
+"""
+Change services - Incremental delta sync over the change log.
+
+Clients keep the last seq they applied and ask for what changed after it.
+The log is compacted (only the newest entry per row is kept) and
+truncated by age; clients older than the truncation watermark get
+reset=True and must reload their lists.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, select
+from extensions import db
+from models.change_log import ChangeLog, ChangeLogWatermark, OperacaoChange, UNTRACKED_TABLES
+
+# Default age after which entries are removed by compact_change_log
+RETENTION = timedelta(days=7)
+
+# Largest page returned by changes_since
+MAX_CHANGES = 1000
+
+# Operations whose row is gone from its table, so changes carry no data
+_WITHOUT_DATA = (OperacaoChange.DELETE.value, OperacaoChange.ARCHIVE.value)
+
+
+def tracked_models():
+    """Map each tracked table name to its model class."""
+    return {
+        mapper.class_.__tablename__: mapper.class_
+        for mapper in db.Model.registry.mappers
+        if mapper.class_.__tablename__ not in UNTRACKED_TABLES
+    }
+
+
+def _watermark():
+    row = db.session.get(ChangeLogWatermark, 1)
+    return row.seq if row else 0
+
+
+def latest_seq():
+    """Newest seq handed out, even if its entry was truncated since."""
+    return max(db.session.query(func.max(ChangeLog.seq)).scalar() or 0, _watermark())
+
+
+def changes_since(since, types=None, limit=MAX_CHANGES):
+    """
+    Return the rows changed after a seq, with their current data.
+
+    Several changes to the same row collapse into the newest one; inserted
+    and updated rows carry their to_dict() so clients need no extra request.
+
+    Args:
+        since: Last seq the client applied
+        types: Table names to include (default: all tracked)
+        limit: Maximum log entries read
+
+    Returns:
+        Dict with changes, last_seq, has_more and reset
+    """
+    if since < _watermark():
+        return {'changes': [], 'last_seq': latest_seq(), 'has_more': False, 'reset': True}
+
+    query = ChangeLog.query.filter(ChangeLog.seq > since)
+    if types:
+        query = query.filter(ChangeLog.entidade.in_(types))
+    entries = query.order_by(ChangeLog.seq).limit(limit + 1).all()
+
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    latest = {}
+    for entry in entries:
+        latest[(entry.entidade, entry.entidade_id)] = entry
+
+    # One query per type for the current state of the changed rows
+    models = tracked_models()
+    wanted = {}
+    for (entidade, entidade_id), entry in latest.items():
+        if entry.operacao not in _WITHOUT_DATA:
+            wanted.setdefault(entidade, []).append(entidade_id)
+
+    current = {}
+    for entidade, ids in wanted.items():
+        model = models.get(entidade)
+        if model is None:
+            continue
+        for row in model.query.filter(model.id.in_(ids)):
+            current[(entidade, row.id)] = row.to_dict()
+
+    changes = []
+    for key, entry in sorted(latest.items(), key=lambda item: item[1].seq):
+        change = entry.to_dict()
+        if entry.operacao not in _WITHOUT_DATA:
+            if key not in current:
+                # Deleted later than the page we are returning
+                continue
+            change['data'] = current[key]
+        changes.append(change)
+
+    return {
+        'changes': changes,
+        'last_seq': entries[-1].seq if entries else since,
+        'has_more': has_more,
+        'reset': False
+    }
+
+
+def compact_change_log(retention=RETENTION):
+    """
+    Keep only the newest entry per row and drop entries older than retention.
+
+    Compaction never loses information for any client: if a row changed
+    after a client's seq, its newest entry is still after it. Truncation
+    does, so the highest truncated seq becomes the reset watermark.
+
+    Returns:
+        Tuple (entries compacted, entries truncated); the caller commits
+    """
+    newest = select(func.max(ChangeLog.seq)).group_by(ChangeLog.entidade, ChangeLog.entidade_id)
+    compacted = db.session.execute(
+        delete(ChangeLog).where(ChangeLog.seq.not_in(newest))
+    ).rowcount
+
+    cutoff = datetime.utcnow() - retention
+    truncated_max = db.session.query(func.max(ChangeLog.seq))\
+        .filter(ChangeLog.criado_em < cutoff).scalar()
+
+    truncated = 0
+    if truncated_max is not None:
+        truncated = db.session.execute(
+            delete(ChangeLog).where(ChangeLog.seq <= truncated_max)
+        ).rowcount
+        watermark = db.session.get(ChangeLogWatermark, 1)
+        if watermark is None:
+            watermark = ChangeLogWatermark(id=1, seq=0)
+            db.session.add(watermark)
+        watermark.seq = max(watermark.seq, truncated_max)
+
+    return compacted, truncated
@@ -0,0 +1,375 @@
+"""
+Export services - Streaming CSV and XLSX exports of collections, materials and users.
+
+Rows are selected as plain column tuples and read with yield_per, so only
+one batch of BATCH_SIZE rows is in memory at a time. The output is built
+incrementally as well: CSV text is yielded once per batch, and XLSX files
+are written through zipfile into a buffer that is drained after each
+batch. Responses therefore go out with chunked transfer encoding while the
+query is still running, whatever the size of the export.
+
+XLSX is produced with the standard library only (one worksheet with
+inline strings), so no spreadsheet package is needed.
+"""
+import csv
+import io
+import re
+import zipfile
+from datetime import datetime
+from itertools import chain
+from xml.sax.saxutils import escape
+from sqlalchemy.orm import aliased
+from extensions import db
+from models.user import User, TipoUsuario, StatusUsuario, TIPO_DISPLAY
+from models.material import Material, StatusMaterial, CategoriaMaterial
+from models.achievement import Collection
+from models.archive import ArchivedCollection, ArchivedMaterial
+from services.archive import reaches_archive
+
+FORMATS = ('csv', 'xlsx')
+
+MIMETYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+}
+
+# Rows fetched from the cursor and written per output chunk
+BATCH_SIZE = 1000
+
+
+def _full_name(first_name, last_name, username):
+    """Same rule as User.get_full_name."""
+    if first_name and last_name:
+        return f'{first_name} {last_name}'
+    return username
+
+
+class ExportDataset:
+    """
+    Columns, joins and filters of one export.
+
+    Args:
+        headers: Output column names
+        columns: Selected columns; the first one is the exported model's id
+        date_column: Column filtered by the from/to range and used for ordering
+        filters: Filter name -> (column, allowed values or a converter)
+        joins: (target, onclause) outer joins the columns need
+        convert: Function turning a row tuple into the output values
+    """
+
+    __slots__ = ('headers', 'columns', 'date_column', 'filters', 'joins', 'convert')
+
+    def __init__(self, headers, columns, date_column, filters, joins=(), convert=tuple):
+        self.headers = tuple(headers)
+        self.columns = tuple(columns)
+        self.date_column = date_column
+        self.filters = filters
+        self.joins = tuple(joins)
+        self.convert = convert
+
+    def query(self, start=None, end=None, **filters):
+        """
+        Build the export query.
+
+        Args:
+            start: Only rows dated at or after this datetime
+            end: Only rows dated before this datetime
+            **filters: Values for the dataset's filters; None is ignored
+
+        Raises:
+            ValueError: if a filter is unknown or its value is invalid
+        """
+        query = db.session.query(*self.columns)
+        for target, onclause in self.joins:
+            query = query.outerjoin(target, onclause)
+
+        if start is not None:
+            query = query.filter(self.date_column >= start)
+        if end is not None:
+            query = query.filter(self.date_column < end)
+
+        for name, value in filters.items():
+            if value in (None, ''):
+                continue
+            if name not in self.filters:
+                raise ValueError(f'Unknown filter {name}')
+            column, allowed = self.filters[name]
+            if callable(allowed):
+                try:
+                    value = allowed(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f'Invalid {name}')
+            elif value not in allowed:
+                raise ValueError(f'{name} must be one of ' + ', '.join(allowed))
+            query = query.filter(column == value)
+
+        return query.order_by(self.date_column, self.columns[0])
+
+    def rows(self, query):
+        """Iterate over converted rows, BATCH_SIZE at a time from the cursor."""
+        convert = self.convert
+        for row in query.yield_per(BATCH_SIZE):
+            yield convert(row)
+
+
+def _values(enum):
+    return tuple(item.value for item in enum)
+
+
+_Produtor = aliased(User)
+_Curador = aliased(User)
+
+
+def _material(row):
+    (*head, produtor_first, produtor_last, produtor_username,
+     curador_first, curador_last, curador_username, criado_em, revisado_em) = row
+    return (*head,
+            _full_name(produtor_first, produtor_last, produtor_username),
+            _full_name(curador_first, curador_last, curador_username),
+            criado_em, revisado_em)
+
+
+def _collection(row):
+    *head, first_name, last_name, username, data_coleta = row
+    return (*head, _full_name(first_name, last_name, username), data_coleta)
+
+
+def _user(row):
+    id, username, email, first_name, last_name, tipo, *tail = row
+    return (id, username, email, _full_name(first_name, last_name, username),
+            TIPO_DISPLAY.get(tipo, 'Desconhecido'), *tail)
+
+
+def _collections(C):
+    """Collections export over the hot model or its archive alias."""
+    return ExportDataset(
+        ('id', 'material', 'category', 'quantity', 'quantity_value', 'quantity_unit', 'points',
+         'producer_id', 'material_id', 'producer', 'date'),
+        (C.id, C.material_nome, C.categoria, C.quantidade, C.quantidade_valor, C.unidade,
+         C.pontos, C.produtor_id, C.material_id, _Produtor.first_name, _Produtor.last_name,
+         _Produtor.username, C.data_coleta),
+        C.data_coleta,
+        {'category': (C.categoria, _values(CategoriaMaterial)),
+         'producer_id': (C.produtor_id, int)},
+        joins=[(_Produtor, _Produtor.id == C.produtor_id)],
+        convert=_collection
+    )
+
+
+def _materials(M):
+    """Materials export over the hot model or its archive alias."""
+    return ExportDataset(
+        ('id', 'name', 'category', 'description', 'location', 'quantity', 'quantity_value',
+         'quantity_unit', 'status', 'feedback', 'points', 'producer_id', 'curator_id',
+         'producer', 'curator', 'created', 'reviewed'),
+        (M.id, M.nome, M.categoria, M.descricao, M.localizacao, M.quantidade,
+         M.quantidade_valor, M.unidade, M.status, M.feedback, M.pontos_concedidos,
+         M.produtor_id, M.curador_id, _Produtor.first_name, _Produtor.last_name,
+         _Produtor.username, _Curador.first_name, _Curador.last_name, _Curador.username,
+         M.criado_em, M.revisado_em),
+        M.criado_em,
+        {'status': (M.status, _values(StatusMaterial)),
+         'category': (M.categoria, _values(CategoriaMaterial)),
+         'producer_id': (M.produtor_id, int)},
+        joins=[(_Produtor, _Produtor.id == M.produtor_id),
+               (_Curador, _Curador.id == M.curador_id)],
+        convert=_material
+    )
+
+
+DATASETS = {
+    'collections': _collections(Collection),
+    'materials': _materials(Material),
+    'users': ExportDataset(
+        ('id', 'username', 'email', 'name', 'type', 'status', 'points', 'joined',
+         'last_activity'),
+        (User.id, User.username, User.email, User.first_name, User.last_name, User.tipo,
+         User.status, User.pontos, User.date_joined, User.ultima_atividade),
+        User.date_joined,
+        {'status': (User.status, _values(StatusUsuario)),
+         'type': (User.tipo, lambda value: TipoUsuario(int(value)).value)},
+        convert=_user
+    )
+}
+
+# Same exports over the archive tables, read when the range reaches them
+ARCHIVED_DATASETS = {
+    'collections': _collections(ArchivedCollection),
+    'materials': _materials(ArchivedMaterial)
+}
+
+
+def _cell_text(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ', timespec='seconds')
+    return value
+
+
+# Leading characters that make spreadsheets evaluate a text cell as a formula
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def iter_csv(headers, rows):
+    """
+    Stream rows as UTF-8 CSV (with BOM, so spreadsheets detect the encoding).
+
+    Text starting like a formula is prefixed with a quote.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(headers)
+
+    count = 0
+    for row in rows:
+        writer.writerow([
+            "'" + value if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES)
+            else _cell_text(value)
+            for value in row
+        ])
+        count += 1
+        if count % BATCH_SIZE == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode('utf-8')
+
+
+class _Chunks:
+    """Write-only, unseekable file object emptied with take()."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b''.join(self._parts)
+        self._parts.clear()
+        return data
+
+
+_XML_HEAD = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'),
+    '_rels/.rels': (
+        f'<Relationships xmlns="{_PKG_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'),
+    'xl/_rels/workbook.xml.rels': (
+        f'<Relationships xmlns="{_PKG_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+        '</Relationships>'),
+    # Style 1 formats date cells
+    'xl/styles.xml': (
+        f'<styleSheet xmlns="{_MAIN_NS}">'
+        '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '</cellXfs></styleSheet>'),
+}
+
+# Characters XML 1.0 does not allow
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+
+
+def _xlsx_cell(value):
+    if value is None:
+        return '<c/>'
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c><v>{value!r}</v></c>'
+    if isinstance(value, datetime):
+        delta = value - _EXCEL_EPOCH
+        return f'<c s="1"><v>{delta.days + delta.seconds / 86400:.6f}</v></c>'
+    text = escape(_INVALID_XML.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return '<row>' + ''.join(_xlsx_cell(value) for value in values) + '</row>'
+
+
+def iter_xlsx(headers, rows, sheet_name='Export'):
+    """Stream rows as a single-sheet XLSX workbook."""
+    out = _Chunks()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as package:
+        for name, xml in _XLSX_PARTS.items():
+            package.writestr(name, _XML_HEAD + xml)
+        package.writestr('xl/workbook.xml', (
+            f'{_XML_HEAD}<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+            f'<sheets><sheet name="{escape(sheet_name)}" sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>'))
+        yield out.take()
+
+        # The sheet size is unknown up front: stream it with a zip64 data descriptor
+        with package.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(f'{_XML_HEAD}<worksheet xmlns="{_MAIN_NS}"><sheetData>'.encode('utf-8'))
+            sheet.write(_xlsx_row(headers).encode('utf-8'))
+            batch = []
+            for row in rows:
+                batch.append(_xlsx_row(row))
+                if len(batch) >= BATCH_SIZE:
+                    sheet.write(''.join(batch).encode('utf-8'))
+                    batch = []
+                    yield out.take()
+            sheet.write((''.join(batch) + '</sheetData></worksheet>').encode('utf-8'))
+
+    yield out.take()
+
+
+def export(dataset, fmt, start=None, end=None, **filters):
+    """
+    Stream an export.
+
+    The query is built (and filters validated) before the first chunk, so
+    errors surface before a response starts.
+
+    Args:
+        dataset: 'collections', 'materials' or 'users'
+        fmt: 'csv' or 'xlsx'
+        start: Only rows dated at or after this datetime
+        end: Only rows dated before this datetime
+        **filters: Dataset filters (status, category, producer_id, type)
+
+    Returns:
+        Iterator of bytes chunks
+
+    Raises:
+        ValueError: if a filter is unknown or invalid
+    """
+    spec = DATASETS[dataset]
+    queries = [spec.query(start, end, **filters)]
+    if dataset in ARCHIVED_DATASETS and reaches_archive(dataset, start):
+        # Archived rows first: they all predate the archive watermark
+        queries.insert(0, ARCHIVED_DATASETS[dataset].query(start, end, **filters))
+    rows = chain.from_iterable(spec.rows(query) for query in queries)
+    if fmt == 'xlsx':
+        return iter_xlsx(spec.headers, rows, sheet_name=dataset)
+    return iter_csv(spec.headers, rows)
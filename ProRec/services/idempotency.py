@@ -0,0 +1,113 @@
+"""
+Idempotency services - Run a retried POST once and replay its response.
+
+The first request with a key claims it by committing an 'em_andamento'
+row, runs the view and stores the status and body. Duplicates that arrive
+meanwhile are told to retry after RETRY_AFTER seconds instead of holding a
+worker thread; later duplicates get the stored response, until the key
+expires. A key reused with a different request is refused, so a client
+bug cannot read someone else's response.
+
+Keys are read and claimed on connections of their own, so claiming never
+commits or rolls back what the request's session holds.
+
+Failed requests (exceptions, 5xx, 429) release the key, so the retry runs
+again. A key whose request died mid-flight is reclaimed after
+IN_FLIGHT_TIMEOUT.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models.idempotency import IdempotencyKey, StatusIdempotencia
+
+MAX_KEY_LENGTH = 255
+
+# An in-flight key older than this belongs to a request that died
+IN_FLIGHT_TIMEOUT = timedelta(minutes=5)
+
+# Seconds a duplicate of a request still running is told to wait
+RETRY_AFTER = 1
+
+
+def request_hash(request):
+    """Fingerprint of what a key was first used for: method, path, query and body."""
+    digest = hashlib.sha256()
+    for part in (request.method, request.full_path, request.mimetype or ''):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+
+def _read(where):
+    """Key row matching a condition, read on a connection of its own."""
+    with db.engine.connect() as connection:
+        return connection.execute(select(IdempotencyKey.__table__).where(where)).first()
+
+
+def claim(escopo, chave, digest, ttl):
+    """
+    Claim a key for this request, or find the request that holds it.
+
+    The claim is committed on its own connection, so it is visible to
+    concurrent duplicates before the view runs and the session is untouched.
+
+    Returns:
+        (record, owner) - owner is True when this request must run the view;
+        record is a row with the IdempotencyKey columns
+    """
+    table = IdempotencyKey.__table__
+    this_key = (table.c.escopo == escopo) & (table.c.chave == chave)
+    now = datetime.utcnow()
+    for _ in range(2):
+        record = _read(this_key)
+        if record is not None and not (
+                record.expira_em <= now or
+                (record.status == StatusIdempotencia.EM_ANDAMENTO.value and
+                 record.criado_em <= now - IN_FLIGHT_TIMEOUT)):
+            return record, False
+
+        try:
+            with db.engine.begin() as connection:
+                if record is not None:
+                    # Expired, or its request died: take it over
+                    connection.execute(delete(table).where(table.c.id == record.id))
+                record_id = connection.execute(insert(table).values(
+                    escopo=escopo, chave=chave, request_hash=digest,
+                    criado_em=now, expira_em=now + ttl
+                )).inserted_primary_key[0]
+        except IntegrityError:
+            continue  # A concurrent duplicate claimed it first; read its row
+        return _read(table.c.id == record_id), True
+    return _read(this_key), False
+
+
+def complete(record_id, response):
+    """Store a response for its key and commit."""
+    IdempotencyKey.query.filter_by(id=record_id).update({
+        'status': StatusIdempotencia.CONCLUIDA.value,
+        'status_code': response.status_code,
+        'corpo': response.get_data(),
+        'mimetype': response.mimetype
+    })
+    db.session.commit()
+
+
+def release(record_id):
+    """Drop a failed request's key (and its uncommitted work) so a retry runs again."""
+    db.session.rollback()
+    IdempotencyKey.query.filter_by(id=record_id).delete()
+    db.session.commit()
+
+
+def purge_expired():
+    """
+    Delete expired keys.
+
+    Returns:
+        Number of keys deleted
+    """
+    return IdempotencyKey.query.filter(IdempotencyKey.expira_em <= datetime.utcnow())\
+        .delete(synchronize_session=False)
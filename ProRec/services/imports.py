@@ -0,0 +1,277 @@
+"""
+Import services - Bulk upsert of spaces and events from CSV or NDJSON.
+
+Input is parsed as a stream and written in chunks of CHUNK_SIZE rows, one
+transaction per chunk, so memory stays flat however large the file is.
+Rows are matched on a natural key and updated in place when they already
+exist, which makes re-running an import safe. Invalid rows are reported
+with their line number and skipped; they never abort the batch.
+
+Rows use the same fields as the create endpoints (name, type, address, ...
+for spaces; title, type, date, time, ... for events).
+"""
+import csv
+import io
+import json
+from models.space import Space, TipoEspaco
+from models.event import Event, TipoEvento, StatusEvento
+from extensions import db
+from services.opening_hours import invalidate_index
+from services.scheduling import apply_event_schedule, find_conflicts, proposed_intervals
+
+KINDS = ('spaces', 'events')
+FORMATS = ('csv', 'ndjson')
+
+# Rows per transaction
+CHUNK_SIZE = 500
+
+# Errors listed in the report; the count keeps going past it
+MAX_REPORTED_ERRORS = 1000
+
+
+class RowError(ValueError):
+    """A row that cannot be imported."""
+
+
+def iter_csv(stream):
+    """
+    Yield (line, row) from a binary CSV stream with a header line.
+
+    Empty cells are dropped, so they behave like fields left out.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    for row in reader:
+        yield reader.line_num, {k.strip(): v.strip() for k, v in row.items()
+                                if k and v is not None and v.strip()}
+
+
+def iter_ndjson(stream):
+    """
+    Yield (line, row) from a binary stream with one JSON object per line.
+
+    Values are turned into text like CSV cells, so both formats validate alike.
+    """
+    for line, raw in enumerate(stream, start=1):
+        if not raw.strip():
+            continue
+        try:
+            row = json.loads(raw)
+        except ValueError:
+            yield line, RowError('Invalid JSON')
+            continue
+        if not isinstance(row, dict):
+            yield line, RowError('Line is not a JSON object')
+            continue
+        yield line, {k: str(v).strip() for k, v in row.items()
+                     if v is not None and str(v).strip()}
+
+
+def _required(data, fields):
+    for field in fields:
+        if not data.get(field):
+            raise RowError(f'Field {field} is required')
+
+
+def _choice(value, enum, field):
+    if value not in {item.value for item in enum}:
+        raise RowError(f'Invalid {field} {value!r}')
+    return value
+
+
+def _float(data, field):
+    if data.get(field) in (None, ''):
+        return None
+    try:
+        return float(data[field])
+    except (TypeError, ValueError):
+        raise RowError(f'Invalid {field}')
+
+
+def _bool(value):
+    return str(value).strip().lower() not in ('0', 'false', 'nao', 'não', 'no')
+
+
+class _SpaceImporter:
+    """Spaces keyed by (name, address)."""
+
+    def key_of(self, data):
+        _required(data, ('name', 'type', 'address'))
+        return data['name'].strip(), data['address'].strip()
+
+    def load(self, keys):
+        names = {name for name, _ in keys}
+        return {(s.nome, s.endereco): s for s in Space.query.filter(Space.nome.in_(names))}
+
+    def apply(self, space, data):
+        space.nome, space.endereco = self.key_of(data)
+        space.tipo = _choice(data['type'], TipoEspaco, 'type')
+        if 'hours' in data:
+            space.horario = data['hours']
+        if 'description' in data:
+            space.descricao = data['description']
+        if 'latitude' in data:
+            space.latitude = _float(data, 'latitude')
+        if 'longitude' in data:
+            space.longitude = _float(data, 'longitude')
+        if 'active' in data:
+            space.ativo = _bool(data['active'])
+
+    def new(self):
+        return Space()
+
+    def finish(self):
+        invalidate_index()
+
+
+class _EventImporter:
+    """Events keyed by (title, start, space)."""
+
+    def key_of(self, data):
+        _required(data, ('title', 'type', 'date'))
+        probe = Event()
+        error = apply_event_schedule(probe, {k: data[k] for k in ('date', 'end', 'time')
+                                             if k in data})
+        if error:
+            raise RowError(error)
+        space_id = data.get('space_id')
+        if space_id not in (None, ''):
+            try:
+                space_id = int(space_id)
+            except (TypeError, ValueError):
+                raise RowError('Invalid space_id')
+        else:
+            space_id = None
+        return data['title'].strip(), probe.data_inicio, space_id
+
+    def load(self, keys):
+        starts = {start for _, start, _ in keys}
+        return {(e.titulo, e.data_inicio, e.espaco_id): e
+                for e in Event.query.filter(Event.data_inicio.in_(starts))}
+
+    def apply(self, event, data):
+        event.titulo, _, event.espaco_id = self.key_of(data)
+        event.tipo = _choice(data['type'], TipoEvento, 'type')
+        event.status = _choice(data.get('status') or event.status or StatusEvento.AGENDADO.value,
+                               StatusEvento, 'status')
+        if 'description' in data:
+            event.descricao = data['description']
+        if 'location' in data:
+            event.localizacao_custom = data['location']
+
+        error = apply_event_schedule(event, data)
+        if error:
+            raise RowError(error)
+
+        if event.espaco_id is not None and event.status != StatusEvento.CANCELADO.value:
+            if db.session.get(Space, event.espaco_id) is None:
+                raise RowError(f'Space {event.espaco_id} not found')
+            if find_conflicts(event.espaco_id, proposed_intervals(event), event.id):
+                raise RowError('Space already booked at this time')
+
+    def new(self):
+        return Event()
+
+    def finish(self):
+        pass
+
+
+_IMPORTERS = {'spaces': _SpaceImporter, 'events': _EventImporter}
+
+
+class ImportReport:
+    """Counters and the first MAX_REPORTED_ERRORS row errors of an import."""
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors = []
+
+    def error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'error': message})
+
+    def to_dict(self):
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors)
+        }
+
+
+def _copy(source, target):
+    """Copy column values between instances of the same model."""
+    for attr in source.__mapper__.column_attrs:
+        value = getattr(source, attr.key)
+        if getattr(target, attr.key) != value:
+            setattr(target, attr.key, value)
+    return target
+
+
+def _import_chunk(importer, chunk, report):
+    """Upsert one chunk of (line, row) in its own transaction."""
+    keyed = []
+    for line, data in chunk:
+        try:
+            if isinstance(data, Exception):
+                raise data
+            keyed.append((line, data, importer.key_of(data)))
+        except ValueError as e:
+            report.error(line, str(e))
+
+    existing = importer.load({key for _, _, key in keyed}) if keyed else {}
+
+    for line, data, key in keyed:
+        target = existing.get(key)
+        # Validate on a detached copy, so a failing row leaves no partial change
+        candidate = _copy(target, importer.new()) if target is not None else importer.new()
+        try:
+            importer.apply(candidate, data)
+        except ValueError as e:
+            report.error(line, str(e))
+            continue
+
+        if target is None:
+            db.session.add(candidate)
+            existing[key] = candidate  # Later rows with the same key update this one
+            report.created += 1
+        else:
+            _copy(candidate, target)
+            report.updated += 1
+
+    db.session.commit()
+
+
+def import_rows(kind, rows, chunk_size=CHUNK_SIZE):
+    """
+    Upsert spaces or events from an iterable of (line, row).
+
+    Args:
+        kind: 'spaces' or 'events'
+        rows: Output of iter_csv or iter_ndjson
+        chunk_size: Rows per transaction
+
+    Returns:
+        ImportReport
+    """
+    importer = _IMPORTERS[kind]()
+    report = ImportReport()
+    chunk = []
+    try:
+        for item in rows:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                _import_chunk(importer, chunk, report)
+                chunk = []
+        if chunk:
+            _import_chunk(importer, chunk, report)
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.session.rollback()
+        report.error(None, f'Unreadable input: {e}')
+    finally:
+        importer.finish()
+    return report
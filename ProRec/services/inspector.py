@@ -0,0 +1,238 @@
+"""
+Inspector services - Table sizes, indexes and row browsing for the
+`inspect` commands.
+
+Tables are reflected from the database itself, so every table on disk can
+be inspected, including ones without a model. Rows are read as plain
+tuples in keyset batches (`key > last key ORDER BY key LIMIT n`) with
+yield_per, so browsing from any point of a large table costs one index
+seek and one batch of memory. Samples probe random keys instead of
+sorting the table by random().
+"""
+import random
+from sqlalchemy import MetaData, String, Table, func, inspect, literal, literal_column, select
+from sqlalchemy.sql import column as column_clause, table as table_clause
+from sqlalchemy.exc import OperationalError
+from extensions import db
+
+# Rows fetched per keyset query
+BATCH_SIZE = 500
+
+# dbstat virtual table (one row per table or index with aggregate=1)
+_dbstat = table_clause('dbstat', column_clause('name'), column_clause('pgsize'),
+                       column_clause('aggregate'))
+
+# --where operators, longest first so '>=' is not read as '>'
+OPERATORS = {
+    '>=': lambda column, value: column >= value,
+    '<=': lambda column, value: column <= value,
+    '!=': lambda column, value: column != value,
+    '~': lambda column, value: column.like(value),
+    '=': lambda column, value: column == value,
+    '>': lambda column, value: column > value,
+    '<': lambda column, value: column < value
+}
+
+
+def table_names():
+    """Names of every table in the database."""
+    return inspect(db.engine).get_table_names()
+
+
+def reflect(name):
+    """
+    Table as stored in the database.
+
+    Raises:
+        ValueError: if there is no such table
+    """
+    if name not in table_names():
+        raise ValueError(f'No table named {name}')
+    return Table(name, MetaData(), autoload_with=db.engine)
+
+
+def page_sizes():
+    """
+    Bytes on disk of every table and index, from the dbstat virtual table.
+
+    Returns:
+        Dict of name -> bytes, or None if SQLite was built without dbstat
+    """
+    try:
+        rows = db.session.execute(
+            select(_dbstat.c.name, _dbstat.c.pgsize).where(_dbstat.c.aggregate == 1)
+        )
+    except OperationalError:
+        db.session.rollback()
+        return None
+    return dict(rows.all())
+
+
+def table_stats():
+    """
+    Rows, size on disk and indexes of every table.
+
+    Returns:
+        List of dicts with name, rows, bytes, index_bytes and indexes
+        (bytes are None without dbstat)
+    """
+    inspector = inspect(db.engine)
+    sizes = page_sizes()
+    stats = []
+    for name in inspector.get_table_names():
+        indexes = [index['name'] for index in inspector.get_indexes(name)]
+        index_bytes = None
+        if sizes is not None:
+            # Unique constraints are backed by sqlite_autoindex_<table>_<n>
+            index_bytes = sum(size for index, size in sizes.items()
+                              if index in indexes or index.startswith(f'sqlite_autoindex_{name}_'))
+        stats.append({
+            'name': name,
+            'rows': db.session.execute(select(func.count()).select_from(table_clause(name))).scalar(),
+            'bytes': sizes.get(name, 0) if sizes is not None else None,
+            'index_bytes': index_bytes,
+            'indexes': len(indexes)
+        })
+    return stats
+
+
+def index_list(name):
+    """
+    Indexes of a table.
+
+    Returns:
+        List of dicts with name, columns, unique and bytes (None without dbstat)
+
+    Raises:
+        ValueError: if there is no such table
+    """
+    reflect(name)
+    sizes = page_sizes()
+    return [{
+        'name': index['name'],
+        'columns': [column or '<expression>' for column in index['column_names']],
+        'unique': bool(index['unique']),
+        'bytes': sizes.get(index['name'], 0) if sizes is not None else None
+    } for index in inspect(db.engine).get_indexes(name)]
+
+
+def _key(table):
+    """Column rows are paged by: the single-column primary key, else rowid."""
+    primary_key = list(table.primary_key.columns)
+    return primary_key[0] if len(primary_key) == 1 else literal_column('rowid')
+
+
+def parse_where(table, conditions):
+    """
+    Turn 'column<op>value' strings into filters.
+
+    Values are bound as text; SQLite converts them to the column's type
+    affinity before comparing. `~` is LIKE.
+
+    Raises:
+        ValueError: for an unknown column or a condition without operator
+    """
+    filters = []
+    for condition in conditions:
+        for op, build in OPERATORS.items():
+            column, found, value = condition.partition(op)
+            if found:
+                break
+        else:
+            raise ValueError(f'Condition needs one of {" ".join(OPERATORS)}: {condition}')
+        column = column.strip()
+        if column not in table.c:
+            raise ValueError(f'No column {column} in {table.name}')
+        filters.append(build(table.c[column], literal(value, String)))
+    return filters
+
+
+def _select(table, columns):
+    """
+    Select of some (or all) columns of a table, with the key first.
+
+    Returns:
+        (select, names of the selected columns)
+    """
+    names = list(columns) if columns else [column.name for column in table.c]
+    missing = [name for name in names if name not in table.c]
+    if missing:
+        raise ValueError(f'No column {", ".join(missing)} in {table.name}')
+    return select(_key(table), *(table.c[name] for name in names)), names
+
+
+def iter_rows(table, columns=None, where=(), after=None, limit=None, descending=False,
+              batch_size=BATCH_SIZE):
+    """
+    Rows of a table in key order, read in keyset batches.
+
+    Args:
+        table: Reflected table
+        columns: Column names to read (None for all)
+        where: Filters from parse_where
+        after: Start after this key (exclusive); before it when descending
+        limit: Rows wanted (None for all)
+        descending: Newest (highest key) first
+
+    Yields:
+        (key, dict of column values) pairs
+    """
+    key = _key(table)
+    base, names = _select(table, columns)
+    base = base.where(*where)
+    order = key.desc() if descending else key.asc()
+    remaining = limit
+    while remaining is None or remaining > 0:
+        batch = batch_size if remaining is None else min(batch_size, remaining)
+        query = base
+        if after is not None:
+            query = query.where(key < after if descending else key > after)
+        result = db.session.execute(query.order_by(order).limit(batch),
+                                    execution_options={'yield_per': batch})
+        fetched = 0
+        for row in result:
+            after = row[0]
+            fetched += 1
+            yield after, dict(zip(names, row[1:]))
+        if remaining is not None:
+            remaining -= fetched
+        if fetched < batch:
+            return
+
+
+def sample_rows(table, size, columns=None, where=()):
+    """
+    About `size` random rows of a table.
+
+    Each probe picks a random point between the smallest and largest key
+    and reads the first matching row at or after it, so sparse ranges are
+    favoured slightly but no sort of the whole table is needed. Tables
+    paged by a non-integer key fall back to ORDER BY random().
+
+    Yields:
+        (key, dict of column values) pairs in key order
+    """
+    key = _key(table)
+    base, names = _select(table, columns)
+    base = base.where(*where)
+    low, high = db.session.execute(
+        select(func.min(key), func.max(key)).select_from(table).where(*where)
+    ).one()
+    if low is None:
+        return
+    if not isinstance(low, int):
+        for row in db.session.execute(base.order_by(func.random()).limit(size)):
+            yield row[0], dict(zip(names, row[1:]))
+        return
+
+    seen = {}
+    for _ in range(size * 2):  # Probes landing on a seen row are retried
+        if len(seen) == size:
+            break
+        row = db.session.execute(
+            base.where(key >= random.randint(low, high)).order_by(key).limit(1)
+        ).first()
+        if row is not None:
+            seen.setdefault(row[0], dict(zip(names, row[1:])))
+    for found in sorted(seen):
+        yield found, seen[found]
@@ -0,0 +1,354 @@
+"""
+Job services - Durable background queue for side effects.
+
+enqueue() inserts a jobs row inside the caller's transaction, so a job
+exists exactly when the change that caused it was committed. Workers
+(threads started in each web process, or `flask jobs work` processes)
+claim the oldest available job with one conditional UPDATE ... RETURNING,
+then run its handler and mark it done in a single transaction: the side
+effects and the completion commit or roll back together.
+
+Failed jobs are retried with exponential backoff; after max_tentativas
+they stay in the 'falhou' state (dead letter) until retried by an admin.
+"""
+import json
+import os
+import random
+import socket
+import threading
+import time as _time
+import traceback
+from datetime import datetime, timedelta
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from extensions import db
+from models.job import Job, StatusJob
+
+# Seconds an idle worker waits before looking for jobs again
+POLL_INTERVAL = 2.0
+
+# A running job whose worker has not finished it by then is requeued
+LOCK_TIMEOUT = timedelta(minutes=5)
+
+# Retry delays: BACKOFF_BASE * 2^(attempt - 1) seconds, capped, with jitter
+BACKOFF_BASE = 5
+BACKOFF_MAX = 3600
+
+# Finished jobs kept for inspection, and how often maintenance runs
+RETENTION = timedelta(days=7)
+MAINTENANCE_INTERVAL = 60
+
+_handlers = {}
+
+
+def job_handler(tipo):
+    """
+    Register the function that runs jobs of a type.
+
+    The handler receives the payload as keyword arguments and works in the
+    worker's session; it must not commit.
+    """
+    def register(fn):
+        _handlers[tipo] = fn
+        return fn
+    return register
+
+
+def enqueue(tipo, payload, chave=None, delay=None, max_tentativas=5):
+    """
+    Queue a job; it becomes visible to workers when the transaction commits.
+
+    Args:
+        tipo: Registered job type
+        payload: JSON-serializable dict passed to the handler
+        chave: Idempotency key; a second job with the same key is ignored
+        delay: timedelta before the job may run
+        max_tentativas: Attempts before the job is dead-lettered
+
+    Returns:
+        True if queued, False if a job with the same key already exists
+    """
+    if tipo not in _handlers:
+        raise ValueError(f'No handler registered for job type {tipo!r}')
+
+    now = datetime.utcnow()
+    statement = insert(Job.__table__).values(
+        tipo=tipo,
+        payload=json.dumps(payload),
+        chave=chave,
+        status=StatusJob.PENDENTE.value,
+        tentativas=0,
+        max_tentativas=max_tentativas,
+        disponivel_em=now + (delay or timedelta()),
+        criado_em=now
+    )
+    if chave is not None:
+        statement = statement.on_conflict_do_nothing(index_elements=['chave'])
+
+    inserted = db.session.execute(statement).rowcount == 1
+    db.session.info['jobs_enqueued'] = True
+    return inserted
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_workers_after_commit(session):
+    """Start or wake this process's workers once enqueued jobs are committed."""
+    if not session.info.pop('jobs_enqueued', False):
+        return
+    if has_app_context() and current_app.config.get('JOB_WORKERS', 0) > 0:
+        pool.ensure_started(current_app._get_current_object(), current_app.config['JOB_WORKERS'])
+    pool.wake()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_enqueued_after_rollback(session):
+    session.info.pop('jobs_enqueued', None)
+
+
+def backoff(tentativas):
+    """Delay before retrying a job that failed its n-th attempt."""
+    delay = min(BACKOFF_BASE * 2 ** (tentativas - 1), BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def worker_id(suffix=''):
+    """Identifier written to the jobs a worker claims."""
+    return f'{socket.gethostname()}:{os.getpid()}:{suffix or threading.current_thread().name}'
+
+
+def claim(worker):
+    """
+    Atomically take the next available job.
+
+    Returns:
+        Tuple (id, tipo, payload, tentativas, max_tentativas), or None
+    """
+    table = Job.__table__
+    now = datetime.utcnow()
+    candidate = db.session.query(Job.id).filter(
+        Job.status == StatusJob.PENDENTE.value,
+        Job.disponivel_em <= now
+    ).order_by(Job.disponivel_em, Job.id).limit(1).scalar_subquery()
+
+    row = db.session.execute(
+        update(table)
+        .where(table.c.id == candidate, table.c.status == StatusJob.PENDENTE.value)
+        .values(status=StatusJob.EXECUTANDO.value, travado_por=worker, travado_em=now,
+                tentativas=table.c.tentativas + 1)
+        .returning(table.c.id, table.c.tipo, table.c.payload,
+                   table.c.tentativas, table.c.max_tentativas)
+    ).first()
+    db.session.commit()
+    return tuple(row) if row else None
+
+
+def _finish(job_id, worker, **values):
+    """Update a job this worker still holds; False if its lock was lost."""
+    table = Job.__table__
+    return db.session.execute(
+        update(table)
+        .where(table.c.id == job_id, table.c.travado_por == worker,
+               table.c.status == StatusJob.EXECUTANDO.value)
+        .values(travado_por=None, travado_em=None, **values)
+    ).rowcount == 1
+
+
+def run_job(job, worker):
+    """
+    Run a claimed job and record the outcome.
+
+    Returns:
+        True if the job succeeded
+    """
+    job_id, tipo, payload, tentativas, max_tentativas = job
+    try:
+        handler = _handlers.get(tipo)
+        if handler is None:
+            raise LookupError(f'No handler registered for job type {tipo!r}')
+        handler(**json.loads(payload))
+        if _finish(job_id, worker, status=StatusJob.CONCLUIDO.value,
+                   concluido_em=datetime.utcnow(), ultimo_erro=None):
+            db.session.commit()
+            return True
+        # Lock expired and the job was requeued: let its new run apply the effects
+        db.session.rollback()
+        return False
+    except Exception:
+        db.session.rollback()
+        error = traceback.format_exc(limit=5)
+        if tentativas >= max_tentativas:
+            _finish(job_id, worker, status=StatusJob.FALHOU.value,
+                    concluido_em=datetime.utcnow(), ultimo_erro=error)
+            current_app.logger.error('Job %s (%s) dead-lettered:\n%s', job_id, tipo, error)
+        else:
+            _finish(job_id, worker, status=StatusJob.PENDENTE.value,
+                    disponivel_em=datetime.utcnow() + backoff(tentativas), ultimo_erro=error)
+            current_app.logger.warning('Job %s (%s) failed attempt %s', job_id, tipo, tentativas)
+        db.session.commit()
+        return False
+
+
+def run_pending(worker=None, limit=None):
+    """
+    Run available jobs until none is left (or limit is reached).
+
+    Returns:
+        Number of jobs run
+    """
+    worker = worker or worker_id()
+    count = 0
+    while limit is None or count < limit:
+        job = claim(worker)
+        if job is None:
+            break
+        run_job(job, worker)
+        count += 1
+    return count
+
+
+def requeue_stale():
+    """
+    Release jobs whose worker died: requeue them, or dead-letter them if
+    they are out of attempts.
+
+    Returns:
+        Number of jobs released; the caller commits
+    """
+    table = Job.__table__
+    stale = (table.c.status == StatusJob.EXECUTANDO.value) & \
+        (table.c.travado_em < datetime.utcnow() - LOCK_TIMEOUT)
+    dead = db.session.execute(
+        update(table).where(stale, table.c.tentativas >= table.c.max_tentativas)
+        .values(status=StatusJob.FALHOU.value, travado_por=None, travado_em=None,
+                concluido_em=datetime.utcnow(), ultimo_erro='Worker lock expired')
+    ).rowcount
+    requeued = db.session.execute(
+        update(table).where(stale)
+        .values(status=StatusJob.PENDENTE.value, travado_por=None, travado_em=None,
+                disponivel_em=datetime.utcnow())
+    ).rowcount
+    return dead + requeued
+
+
+def purge_finished(retention=RETENTION):
+    """Delete completed jobs older than retention; the caller commits."""
+    return Job.query.filter(
+        Job.status == StatusJob.CONCLUIDO.value,
+        Job.concluido_em < datetime.utcnow() - retention
+    ).delete(synchronize_session=False)
+
+
+def retry(job_id=None):
+    """
+    Put dead-lettered jobs back in the queue with fresh attempts.
+
+    Args:
+        job_id: Only this job (default: every dead job)
+
+    Returns:
+        Number of jobs requeued; the caller commits
+    """
+    query = Job.query.filter(Job.status == StatusJob.FALHOU.value)
+    if job_id is not None:
+        query = query.filter(Job.id == job_id)
+    return query.update({
+        Job.status: StatusJob.PENDENTE.value,
+        Job.tentativas: 0,
+        Job.disponivel_em: datetime.utcnow(),
+        Job.concluido_em: None
+    }, synchronize_session=False)
+
+
+def queue_stats():
+    """
+    Queue depth and lag.
+
+    Returns:
+        Dict with counts per status, jobs ready to run, and the age in
+        seconds of the oldest ready job (lag)
+    """
+    now = datetime.utcnow()
+    counts = dict(db.session.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+    ready = db.session.query(func.count(Job.id), func.min(Job.disponivel_em)).filter(
+        Job.status == StatusJob.PENDENTE.value,
+        Job.disponivel_em <= now
+    ).one()
+
+    return {
+        'ready': ready[0],
+        'scheduled': counts.get(StatusJob.PENDENTE.value, 0) - ready[0],
+        'running': counts.get(StatusJob.EXECUTANDO.value, 0),
+        'done': counts.get(StatusJob.CONCLUIDO.value, 0),
+        'dead': counts.get(StatusJob.FALHOU.value, 0),
+        'lag_seconds': round((now - ready[1]).total_seconds(), 3) if ready[1] else 0.0
+    }
+
+
+class WorkerPool:
+    """Worker threads of one process, woken early when jobs are committed."""
+
+    def __init__(self):
+        self._threads = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._last_maintenance = 0.0
+
+    def wake(self):
+        self._wake.set()
+
+    def ensure_started(self, app, size):
+        """Start `size` worker threads in this process on first use."""
+        if any(thread.is_alive() for thread in self._threads):
+            return
+        with self._lock:
+            if any(thread.is_alive() for thread in self._threads):
+                return
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(target=self._run, args=(app,), name=f'job-worker-{n}', daemon=True)
+                for n in range(size)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def join(self, timeout=None):
+        """Wait for the threads to stop, at most `timeout` seconds in total."""
+        deadline = None if timeout is None else _time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - _time.monotonic()))
+
+    def _maintain(self):
+        """Requeue stale jobs and purge old ones, at most every MAINTENANCE_INTERVAL."""
+        now = _time.monotonic()
+        with self._lock:
+            if now - self._last_maintenance < MAINTENANCE_INTERVAL:
+                return
+            self._last_maintenance = now
+        requeue_stale()
+        purge_finished()
+        db.session.commit()
+
+    def _run(self, app):
+        worker = worker_id()
+        while not self._stop.is_set():
+            ran = 0
+            try:
+                with app.app_context():
+                    self._maintain()
+                    ran = run_pending(worker, limit=100)
+            except Exception:
+                # Keep the worker alive across transient errors (locked database, etc.)
+                app.logger.exception('Job worker %s error', worker)
+            if not ran:
+                self._wake.wait(POLL_INTERVAL)
+                self._wake.clear()
+
+
+pool = WorkerPool()
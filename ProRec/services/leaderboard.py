@@ -0,0 +1,329 @@
+"""
+Leaderboard services - Producer rankings with O(log n) rank lookups.
+
+Each board keeps its entries in a SortedList ordered by (-points, user_id),
+so moving a producer and finding the rank of a score are O(log n) and the
+top N is a slice. Week and month boards are sums of the points ledger since
+the period start; the all-time board reads User.pontos, the ledger's
+running balance.
+
+A board remembers the newest ledger entry it includes and applies the
+entries added since, at most every CATCH_UP_INTERVAL seconds (at once after
+an award committed by this process), so awards made by any worker process
+show up without rebuilding. A board is built on the request path only
+when its period starts; every REBUILD_INTERVAL seconds a background thread
+rebuilds it to pick up renamed, activated and deactivated producers while
+requests keep reading the current one.
+
+Ranks use standard competition ranking: producers with the same points
+share a rank ("1224").
+"""
+import threading
+import time as _time
+from datetime import datetime, timedelta
+from flask import current_app
+from sortedcontainers import SortedList
+from sqlalchemy import func, literal_column
+from extensions import db
+from models.points import PointsLedger
+from models.user import User, TipoUsuario, StatusUsuario
+
+PERIODS = ('all', 'week', 'month')
+
+# Seconds between reads of the ledger entries other workers added
+CATCH_UP_INTERVAL = 2
+
+# Seconds before a board is rebuilt in the background
+REBUILD_INTERVAL = 600
+
+# Ledger entries read per catch-up query
+CATCH_UP_BATCH = 1000
+
+MAX_TOP = 100
+MAX_NEIGHBOURS = 10
+
+
+def period_start(period, now=None):
+    """
+    Start of the current period, or None for the all-time board.
+
+    Raises:
+        ValueError: if period is unknown
+    """
+    if period not in PERIODS:
+        raise ValueError('period must be one of ' + ', '.join(PERIODS))
+    now = now or datetime.utcnow()
+    midnight = datetime.combine(now.date(), datetime.min.time())
+    if period == 'week':
+        return midnight - timedelta(days=now.weekday())
+    if period == 'month':
+        return midnight.replace(day=1)
+    return None
+
+
+class Leaderboard:
+    """
+    Order-statistics list of (points, user) pairs.
+
+    Args:
+        scores: Iterable of (user_id, name, points)
+    """
+
+    def __init__(self, scores=()):
+        self._points = {}
+        self._names = {}
+        for user_id, name, points in scores:
+            self._points[user_id] = points
+            self._names[user_id] = name
+        self._entries = SortedList((-points, user_id) for user_id, points in self._points.items())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, user_id):
+        return user_id in self._points
+
+    def points_of(self, user_id):
+        return self._points.get(user_id)
+
+    def add(self, user_id, delta, name=None):
+        """Add delta points to a user, inserting them if new."""
+        old = self._points.get(user_id)
+        if old is not None:
+            self._entries.remove((-old, user_id))
+        elif name is None:
+            return  # Unknown user; the next rebuild will include them
+        else:
+            old = 0
+            self._names[user_id] = name
+        new = old + delta
+        self._points[user_id] = new
+        self._entries.add((-new, user_id))
+
+    def remove(self, user_id):
+        points = self._points.pop(user_id, None)
+        if points is None:
+            return
+        self._names.pop(user_id, None)
+        self._entries.remove((-points, user_id))
+
+    def rank_of_points(self, points):
+        """Rank a score would have: 1 + number of users with more points."""
+        return self._entries.bisect_left((-points, 0)) + 1
+
+    def rank(self, user_id):
+        points = self._points.get(user_id)
+        return None if points is None else self.rank_of_points(points)
+
+    def _entry(self, key):
+        points, user_id = -key[0], key[1]
+        return {
+            'rank': self.rank_of_points(points),
+            'user_id': user_id,
+            'name': self._names.get(user_id),
+            'points': points
+        }
+
+    def top(self, limit):
+        return [self._entry(key) for key in self._entries.islice(0, limit)]
+
+    def around(self, user_id, neighbours):
+        """The user's entry with up to `neighbours` entries on each side."""
+        points = self._points.get(user_id)
+        if points is None:
+            return []
+        index = self._entries.index((-points, user_id))
+        start = max(0, index - neighbours)
+        return [self._entry(key) for key in self._entries.islice(start, index + neighbours + 1)]
+
+
+class _Board:
+    """A period's Leaderboard and how far into the ledger it is."""
+
+    def __init__(self, leaderboard, start, watermark):
+        self.leaderboard = leaderboard
+        self.start = start
+        self.watermark = watermark  # id of the newest ledger entry included
+        self.lock = threading.Lock()
+        self.built_at = self.checked_at = _time.monotonic()
+        self.rebuilding = False
+
+
+def _is_ranked(tipo, status):
+    return tipo == TipoUsuario.PRODUCER.value and status == StatusUsuario.ATIVO.value
+
+
+def _producer_filter(query):
+    return query.filter(User.tipo == TipoUsuario.PRODUCER.value,
+                        User.status == StatusUsuario.ATIVO.value)
+
+
+def _build(start):
+    """Read a period's scores for every active producer into a new board."""
+    watermark = db.session.query(func.max(PointsLedger.id)).scalar() or 0
+    if start is None:
+        rows = _producer_filter(
+            User.query.with_entities(User.id, User.first_name, User.last_name,
+                                     User.username, User.pontos)
+        ).all()
+    else:
+        # A range of ix_points_ledger_criado_em (covering); the unary + keeps
+        # SQLite from scanning a usuario_id index whole to avoid sorting
+        earned = db.session.query(
+            PointsLedger.usuario_id.label('user_id'),
+            func.sum(PointsLedger.delta).label('points')
+        ).filter(PointsLedger.criado_em >= start, PointsLedger.id <= watermark)\
+            .group_by(literal_column('+points_ledger.usuario_id')).subquery()
+        rows = _producer_filter(
+            User.query.join(earned, earned.c.user_id == User.id)
+            .with_entities(User.id, User.first_name, User.last_name,
+                           User.username, earned.c.points)
+        ).all()
+
+    scores = [(row[0], _display_name(row[1], row[2], row[3]), row[4] or 0) for row in rows]
+    return _Board(Leaderboard(scores), start, watermark)
+
+
+def _catch_up(board):
+    """Apply the ledger entries added after the board's watermark."""
+    while True:
+        rows = db.session.query(
+            PointsLedger.id, PointsLedger.usuario_id, PointsLedger.delta, PointsLedger.criado_em,
+            User.first_name, User.last_name, User.username, User.tipo, User.status
+        ).join(User, User.id == PointsLedger.usuario_id)\
+            .filter(PointsLedger.id > board.watermark)\
+            .order_by(PointsLedger.id).limit(CATCH_UP_BATCH).all()
+
+        with board.lock:
+            for row in rows:
+                if row[0] <= board.watermark:
+                    continue  # Applied meanwhile by another request thread
+                board.watermark = row[0]
+                if board.start is not None and row[3] < board.start:
+                    continue  # Backdated into an earlier period
+                if _is_ranked(row[7], row[8]):
+                    board.leaderboard.add(row[1], row[2], _display_name(row[4], row[5], row[6]))
+        if len(rows) < CATCH_UP_BATCH:
+            return
+
+
+def _display_name(first_name, last_name, username):
+    """Same rule as User.get_full_name, without loading the model."""
+    if first_name and last_name:
+        return f'{first_name} {last_name}'
+    return username
+
+
+_boards = {}
+_build_locks = {period: threading.Lock() for period in PERIODS}
+
+
+def _rebuild_in_background(period, board):
+    """Replace a board with a fresh build, made in a thread of its own."""
+    app = current_app._get_current_object()
+
+    def run():
+        try:
+            with app.app_context():
+                fresh = _build(board.start)
+        except Exception:
+            app.logger.exception('Leaderboard %s rebuild failed', period)
+            board.built_at = _time.monotonic()  # Try again after REBUILD_INTERVAL
+            board.rebuilding = False
+            return
+        if _boards.get(period) is board:
+            _boards[period] = fresh
+
+    board.rebuilding = True
+    threading.Thread(target=run, name=f'leaderboard-{period}', daemon=True).start()
+
+
+def _board(period, build=True):
+    """
+    Current board of a period, caught up with the ledger.
+
+    Args:
+        build: Build the board if the period has none yet; otherwise
+            return None in that case
+    """
+    start = period_start(period)
+    board = _boards.get(period)
+    if board is None or board.start != start:
+        if not build:
+            return None
+        with _build_locks[period]:
+            board = _boards.get(period)
+            if board is None or board.start != start:
+                board = _build(start)
+                _boards[period] = board
+
+    now = _time.monotonic()
+    if now - board.checked_at >= CATCH_UP_INTERVAL:
+        board.checked_at = now
+        _catch_up(board)
+    if now - board.built_at >= REBUILD_INTERVAL and not board.rebuilding:
+        _rebuild_in_background(period, board)
+    return board
+
+
+def top(period='all', limit=10):
+    """
+    Top of a period's board.
+
+    Must be called inside an application context.
+
+    Returns:
+        Tuple (entries, number of ranked producers)
+    """
+    board = _board(period)
+    with board.lock:
+        return board.leaderboard.top(limit), len(board.leaderboard)
+
+
+def standing(user_id, period='all', neighbours=2):
+    """
+    A producer's rank, points and neighbours on a period's board.
+
+    Returns:
+        Dict with rank, points, total and neighbours (rank None if unranked)
+    """
+    board = _board(period)
+    with board.lock:
+        leaderboard = board.leaderboard
+        return {
+            'rank': leaderboard.rank(user_id),
+            'points': leaderboard.points_of(user_id),
+            'total': len(leaderboard),
+            'neighbours': leaderboard.around(user_id, neighbours)
+        }
+
+
+def cached_rank(user_id, period='all'):
+    """Rank from the period's cached board without building one, or None."""
+    board = _board(period, build=False)
+    if board is None:
+        return None
+    with board.lock:
+        return board.leaderboard.rank(user_id)
+
+
+def ledger_changed():
+    """Have every board read the ledger on its next use; call after awarding points."""
+    for board in list(_boards.values()):
+        board.checked_at = 0.0
+
+
+def invalidate_boards():
+    """Drop all cached boards; call after bulk point changes."""
+    _boards.clear()
+
+
+def rank_from_database(user):
+    """
+    Rank of a producer computed in SQL.
+
+    Served by ix_users_tipo_status_pontos; used when no board is cached and
+    building one is not worth it for a single lookup.
+    """
+    ahead = _producer_filter(User.query).filter(User.pontos > user.pontos).count()
+    return ahead + 1
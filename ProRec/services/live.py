@@ -0,0 +1,274 @@
+"""
+Live update services - Pub/sub hub behind the Server-Sent Events endpoint.
+
+publish() appends a StreamEvent row inside the caller's transaction. One
+poller thread per process tails the stream_events table and fans new rows
+out to the subscribers connected to that process, so events published by
+any worker reach every open dashboard. SQLite serializes writers, so ids
+become visible in increasing order and "id > last seen" never skips a row.
+
+Subscribers are plain objects with a bounded buffer and a condition
+variable. A subscriber that falls more than SUBSCRIBER_BUFFER events behind
+is told to reset (reload its state) instead of growing without bound.
+
+An open stream waits on its subscriber for as long as the dashboard is
+open, so /api/stream is served by gevent workers (gunicorn_live.conf.py):
+with threading patched, each stream is a greenlet and the poller fans out
+to every subscriber of the process from one greenlet, instead of each
+stream holding a gthread worker thread.
+"""
+import json
+import threading
+import time as _time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.orm import Session
+from extensions import db
+from models.stream import StreamEvent
+
+CURATOR_CHANNEL = 'curator'
+
+# Seconds between polls of stream_events when nothing wakes the poller earlier
+POLL_INTERVAL = 1.0
+
+# Seconds between heartbeat comments on an idle stream
+HEARTBEAT_INTERVAL = 15
+
+# Events kept for Last-Event-ID replay
+RETENTION = timedelta(hours=1)
+PRUNE_INTERVAL = 300
+
+# Most events buffered per subscriber and replayed on reconnection
+SUBSCRIBER_BUFFER = 256
+REPLAY_LIMIT = 500
+
+
+def user_channel(user_id):
+    """Channel with the personal events of a user."""
+    return f'user:{user_id}'
+
+
+def publish(channel, tipo, payload):
+    """
+    Queue an event for live subscribers; it is delivered once the current
+    transaction commits.
+
+    Args:
+        channel: CURATOR_CHANNEL or user_channel(id)
+        tipo: Event name, e.g. 'material_published'
+        payload: JSON-serializable dict
+    """
+    db.session.add(StreamEvent(canal=channel, tipo=tipo, payload=json.dumps(payload)))
+    db.session.info['live_published'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_after_commit(session):
+    """Deliver events published in this process without waiting for the next poll."""
+    if session.info.pop('live_published', False):
+        hub.wake()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('live_published', None)
+
+
+class Message:
+    """A stream event as delivered to subscribers."""
+
+    __slots__ = ('id', 'channel', 'tipo', 'data')
+
+    def __init__(self, id, channel, tipo, data):
+        self.id = id
+        self.channel = channel
+        self.tipo = tipo
+        self.data = data
+
+    def to_sse(self):
+        """Format the message as an SSE frame."""
+        return f'id: {self.id}\nevent: {self.tipo}\ndata: {self.data}\n\n'
+
+
+class Subscriber:
+    """One open stream: the channels it listens to and its pending messages."""
+
+    __slots__ = ('channels', 'buffer', 'overflowed', 'condition')
+
+    def __init__(self, channels):
+        self.channels = frozenset(channels)
+        self.buffer = []
+        self.overflowed = False
+        self.condition = threading.Condition()
+
+    def push(self, message):
+        with self.condition:
+            if len(self.buffer) >= SUBSCRIBER_BUFFER:
+                self.buffer.clear()
+                self.overflowed = True
+            else:
+                self.buffer.append(message)
+            self.condition.notify()
+
+    def wait(self, timeout):
+        """
+        Wait for messages.
+
+        Returns:
+            Tuple (messages, overflowed); empty after timeout
+        """
+        with self.condition:
+            if not self.buffer and not self.overflowed:
+                self.condition.wait(timeout)
+            messages, self.buffer = self.buffer, []
+            overflowed, self.overflowed = self.overflowed, False
+            return messages, overflowed
+
+
+class LiveHub:
+    """Per-process fan-out of stream_events rows to subscribers."""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._last_id = None
+        self._last_prune = 0.0
+
+    def subscribe(self, channels):
+        subscriber = Subscriber(channels)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def wake(self):
+        self._wake.set()
+
+    def dispatch(self, messages):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for message in messages:
+            for subscriber in subscribers:
+                if message.channel in subscriber.channels:
+                    subscriber.push(message)
+
+    def ensure_started(self, app):
+        """Start the poller thread of this process on first use."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            with app.app_context():
+                engine = db.engine
+                self._last_id = latest_event_id()
+            self._thread = threading.Thread(target=self._run, args=(engine,),
+                                            name='live-hub-poller', daemon=True)
+            self._thread.start()
+
+    def _run(self, engine):
+        table = StreamEvent.__table__
+        while True:
+            self._wake.wait(POLL_INTERVAL)
+            self._wake.clear()
+            try:
+                with engine.connect() as conn:
+                    rows = conn.execute(
+                        select(table.c.id, table.c.canal, table.c.tipo, table.c.payload)
+                        .where(table.c.id > self._last_id)
+                        .order_by(table.c.id)
+                        .limit(REPLAY_LIMIT)
+                    ).all()
+                    if rows:
+                        self._last_id = rows[-1][0]
+                        self.dispatch([Message(*row) for row in rows])
+                        if len(rows) == REPLAY_LIMIT:
+                            self._wake.set()
+                    self._prune(conn)
+            except Exception:
+                # Keep the poller alive across transient errors (locked database, etc.)
+                _time.sleep(POLL_INTERVAL)
+
+    def _prune(self, conn):
+        """Drop events older than RETENTION, at most every PRUNE_INTERVAL seconds."""
+        if _time.monotonic() - self._last_prune < PRUNE_INTERVAL:
+            return
+        self._last_prune = _time.monotonic()
+        conn.execute(delete(StreamEvent.__table__)
+                     .where(StreamEvent.__table__.c.criado_em < datetime.utcnow() - RETENTION))
+        conn.commit()
+
+
+hub = LiveHub()
+
+
+def replay(channels, last_event_id):
+    """
+    Load the events a reconnecting client missed.
+
+    Returns:
+        Tuple (messages, complete); complete is False when the gap is larger
+        than what is retained and the client must reload its state
+    """
+    oldest = db.session.query(func.min(StreamEvent.id)).scalar()
+    if oldest is None:
+        return [], True
+
+    rows = StreamEvent.query.with_entities(
+        StreamEvent.id, StreamEvent.canal, StreamEvent.tipo, StreamEvent.payload
+    ).filter(
+        StreamEvent.id > last_event_id,
+        StreamEvent.canal.in_(channels)
+    ).order_by(StreamEvent.id).limit(REPLAY_LIMIT + 1).all()
+
+    complete = oldest <= last_event_id + 1 and len(rows) <= REPLAY_LIMIT
+    return [Message(*row) for row in rows[:REPLAY_LIMIT]], complete
+
+
+def latest_event_id():
+    """Id of the newest stream event, 0 when there is none."""
+    return db.session.query(func.max(StreamEvent.id)).scalar() or 0
+
+
+def iter_stream(subscriber, backlog, reset, last_id):
+    """
+    Generate the SSE body of one subscriber until the client disconnects.
+
+    Args:
+        subscriber: Subscriber registered with the hub
+        backlog: Messages replayed after Last-Event-ID
+        reset: Send a 'reset' event first (the backlog is incomplete)
+        last_id: Newest event the client already has; older deliveries are dropped
+    """
+    try:
+        yield 'retry: 3000\n\n'
+        if reset:
+            yield 'event: reset\ndata: {}\n\n'
+
+        for message in backlog:
+            last_id = message.id
+            yield message.to_sse()
+
+        while True:
+            messages, overflowed = subscriber.wait(HEARTBEAT_INTERVAL)
+            if overflowed:
+                yield 'event: reset\ndata: {}\n\n'
+            if not messages and not overflowed:
+                yield ': heartbeat\n\n'
+                continue
+            for message in messages:
+                # The hub may deliver what the replay already sent
+                if message.id > last_id:
+                    last_id = message.id
+                    yield message.to_sse()
+    finally:
+        hub.unsubscribe(subscriber)
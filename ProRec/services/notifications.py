@@ -0,0 +1,183 @@
+"""
+Notification services - User inbox with a cached unread counter.
+
+User.notificacoes_nao_lidas is changed with an atomic UPDATE in the same
+transaction as the notifications it counts, so reading the badge never
+needs a COUNT(*). Callers commit.
+"""
+import base64
+from datetime import datetime
+from sqlalchemy import and_, case, delete, func, or_, update
+from extensions import db
+from models.archive import ArchivedNotificacao, notificacoes_archive
+from models.user import User, Notificacao
+from services.archive import newest_first
+from services.live import publish, user_channel
+
+# Largest inbox page and bulk operation accepted
+MAX_PAGE_SIZE = 100
+MAX_BULK_IDS = 500
+
+# The unread counter is not part of User.to_dict(), so its updates are not
+# changes for the change log's consumers
+_NOT_LOGGED = {'change_log': False}
+
+
+def _adjust_unread(user_id, delta):
+    """Add delta to the user's unread counter, never going below zero."""
+    if delta:
+        db.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(notificacoes_nao_lidas=case(
+                (User.notificacoes_nao_lidas + delta < 0, 0),
+                else_=User.notificacoes_nao_lidas + delta
+            )),
+            execution_options=_NOT_LOGGED
+        )
+
+
+def notify(user_id, tipo, titulo, mensagem):
+    """
+    Add a notification to a user's inbox.
+
+    Args:
+        user_id: Recipient
+        tipo: TipoNotificacao value
+        titulo: Short title
+        mensagem: Notification body
+
+    Returns:
+        The new Notificacao (flushed, not committed)
+    """
+    notificacao = Notificacao(usuario_id=user_id, tipo=tipo, titulo=titulo, mensagem=mensagem)
+    db.session.add(notificacao)
+    db.session.flush()
+    _adjust_unread(user_id, 1)
+    publish(user_channel(user_id), 'notification', notificacao.to_dict())
+    return notificacao
+
+
+def _scope(user_id, ids):
+    """Query over a user's notifications, optionally restricted to ids."""
+    query = Notificacao.query.filter(Notificacao.usuario_id == user_id)
+    if ids is not None:
+        query = query.filter(Notificacao.id.in_(ids))
+    return query
+
+
+def mark_read(user_id, ids=None):
+    """
+    Mark notifications as read.
+
+    Args:
+        user_id: Inbox owner
+        ids: Notification ids, or None for the whole inbox
+
+    Returns:
+        Number of notifications that were unread
+    """
+    changed = _scope(user_id, ids).filter(Notificacao.lida.is_(False))\
+        .update({Notificacao.lida: True}, synchronize_session=False)
+    _adjust_unread(user_id, -changed)
+    return changed
+
+
+def delete_notifications(user_id, ids=None):
+    """
+    Delete notifications.
+
+    Args:
+        user_id: Inbox owner
+        ids: Notification ids, or None for the whole inbox
+
+    Returns:
+        Number of notifications deleted
+    """
+    unread = _scope(user_id, ids).filter(Notificacao.lida.is_(False))\
+        .delete(synchronize_session=False)
+    read = _scope(user_id, ids).delete(synchronize_session=False)
+    _adjust_unread(user_id, -unread)
+
+    archived = delete(notificacoes_archive).where(notificacoes_archive.c.usuario_id == user_id)
+    if ids is not None:
+        archived = archived.where(notificacoes_archive.c.id.in_(ids))
+    return unread + read + db.session.execute(archived).rowcount
+
+
+def recount_unread(user_id=None):
+    """
+    Recompute unread counters from the notifications table.
+
+    Args:
+        user_id: Only repair this user (default: every user)
+
+    Returns:
+        Number of users whose counter was wrong
+    """
+    actual = db.session.query(func.count(Notificacao.id))\
+        .filter(Notificacao.usuario_id == User.id, Notificacao.lida.is_(False))\
+        .scalar_subquery()
+
+    statement = update(User).where(User.notificacoes_nao_lidas != actual)\
+        .values(notificacoes_nao_lidas=actual)
+    if user_id is not None:
+        statement = statement.where(User.id == user_id)
+    return db.session.execute(statement, execution_options=_NOT_LOGGED).rowcount
+
+
+def encode_cursor(notificacao):
+    """Opaque keyset cursor pointing after a notification."""
+    raw = f'{notificacao.criada_em.isoformat()}|{notificacao.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: if the cursor is malformed
+    """
+    try:
+        criada_em, notificacao_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(criada_em), int(notificacao_id)
+    except (UnicodeError, ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+
+def inbox_page(user_id, cursor=None, limit=20, unread_only=False):
+    """
+    Fetch one page of a user's inbox, newest first.
+
+    Uses keyset pagination on (criada_em, id), served by
+    ix_notificacoes_usuario_lida_criada, so deep pages cost the same as the
+    first. Pages reaching back past the archive watermark include archived
+    (read) notifications.
+
+    Returns:
+        Tuple (notifications, next_cursor or None)
+    """
+    position = decode_cursor(cursor) if cursor else None
+
+    def query(N):
+        page = db.session.query(N).filter(N.usuario_id == user_id)
+        if unread_only:
+            page = page.filter(N.lida.is_(False))
+        if position:
+            criada_em, notificacao_id = position
+            page = page.filter(or_(
+                N.criada_em < criada_em,
+                and_(N.criada_em == criada_em, N.id < notificacao_id)
+            ))
+        return page.order_by(N.criada_em.desc(), N.id.desc())
+
+    if unread_only:
+        rows = query(Notificacao).limit(limit + 1).all()  # Only read ones are archived
+    else:
+        rows = newest_first('notificacoes', query(Notificacao),
+                            lambda: query(ArchivedNotificacao),
+                            key=lambda n: (n.criada_em, n.id), limit=limit + 1)
+
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
@@ -0,0 +1,175 @@
+"""
+Opening hours services - The "open now" index over weekly hour bitmaps.
+
+OpeningHoursIndex transposes the masks of all active spaces (see
+models/opening_hours.py) into one integer bitset per hour of the week
+(bit j = j-th space open), so open_now, open_at and open_on_weekend are a
+handful of bitwise operations.
+"""
+import threading
+import time as _time
+from datetime import datetime
+from sqlalchemy import update
+from extensions import db
+from models.opening_hours import (
+    HOURS_PER_WEEK, WEEKEND_HOURS, hour_of_week, mask_from_bytes, mask_to_bytes, parse_horario
+)
+from models.space import Space, SpaceHoursException
+
+# Seconds before the in-memory index is rebuilt to pick up other workers' edits
+INDEX_TTL = 60
+
+
+def _iter_bits(bitset):
+    """Yield the positions of the set bits of an integer."""
+    while bitset:
+        low = bitset & -bitset
+        yield low.bit_length() - 1
+        bitset ^= low
+
+
+class OpeningHoursIndex:
+    """
+    Transposed bitmap index over the weekly hours of all active spaces.
+
+    Args:
+        spaces: Iterable of (space_id, tipo, weekly_mask or None)
+        exceptions: Iterable of (date, space_id or None for all spaces, day_mask)
+    """
+
+    def __init__(self, spaces, exceptions=()):
+        self.ids = []
+        self.by_hour = [0] * HOURS_PER_WEEK
+        self.by_tipo = {}
+        self.known = 0
+        self.positions = {}
+
+        for position, (space_id, tipo, mask) in enumerate(spaces):
+            self.ids.append(space_id)
+            self.positions[space_id] = position
+            bit = 1 << position
+            self.by_tipo[tipo] = self.by_tipo.get(tipo, 0) | bit
+            if mask is None:
+                continue
+            self.known |= bit
+            for hour in _iter_bits(mask):
+                self.by_hour[hour] |= bit
+
+        self.weekend = 0
+        for hour in WEEKEND_HOURS:
+            self.weekend |= self.by_hour[hour]
+
+        # {date: (global day mask or None, {position: day mask})}
+        self.exceptions = {}
+        for day, space_id, daily in exceptions:
+            shared, specific = self.exceptions.get(day, (None, {}))
+            if space_id is None:
+                shared = daily
+            elif space_id in self.positions:
+                specific[self.positions[space_id]] = daily
+            self.exceptions[day] = (shared, specific)
+
+    def _bitset_ids(self, bitset):
+        return [self.ids[position] for position in _iter_bits(bitset)]
+
+    def open_bitset(self, moment):
+        """Bitset of the spaces open at moment, holidays applied."""
+        result = self.by_hour[hour_of_week(moment)]
+
+        overrides = self.exceptions.get(moment.date())
+        if overrides:
+            shared, specific = overrides
+            if shared is not None:
+                result = self.known if shared >> moment.hour & 1 else 0
+            for position, daily in specific.items():
+                bit = 1 << position
+                result = result | bit if daily >> moment.hour & 1 else result & ~bit
+        return result
+
+    def open_at(self, moment, tipo=None):
+        """Ids of the spaces open at moment."""
+        bitset = self.open_bitset(moment)
+        if tipo is not None:
+            bitset &= self.by_tipo.get(tipo, 0)
+        return self._bitset_ids(bitset)
+
+    def open_on_weekend(self, tipo=None):
+        """Ids of the spaces open at some hour on Saturday or Sunday."""
+        bitset = self.weekend
+        if tipo is not None:
+            bitset &= self.by_tipo.get(tipo, 0)
+        return self._bitset_ids(bitset)
+
+
+_index = None
+_index_built_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Return the process-wide index, rebuilding it when invalidated or stale.
+
+    Must be called inside an application context.
+    """
+    global _index, _index_built_at
+
+    with _index_lock:
+        if _index is None or _time.monotonic() - _index_built_at > INDEX_TTL:
+            _index = _build_index()
+            _index_built_at = _time.monotonic()
+        return _index
+
+
+def invalidate_index():
+    """Drop the cached index; call after editing spaces or their hours."""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def _build_index():
+    rows = Space.query.with_entities(Space.id, Space.tipo, Space.horario_semanal)\
+        .filter(Space.ativo.is_(True))\
+        .order_by(Space.id)\
+        .all()
+    spaces = [(row[0], row[1], mask_from_bytes(row[2])) for row in rows]
+
+    today = datetime.now().date()
+    exceptions = SpaceHoursException.query.with_entities(
+        SpaceHoursException.data, SpaceHoursException.espaco_id, SpaceHoursException.horas
+    ).filter(SpaceHoursException.data >= today).all()
+
+    return OpeningHoursIndex(spaces, exceptions)
+
+
+def parse_space_hours(overwrite=False, dry_run=False):
+    """
+    Fill the weekly hours mask of spaces from their free-text hours and commit.
+
+    Args:
+        overwrite: Re-parse spaces that already have a mask
+        dry_run: Parse without saving
+
+    Returns:
+        Tuple (spaces parsed, list of (id, nome, horario) not understood)
+    """
+    query = Space.query.with_entities(Space.id, Space.nome, Space.horario)\
+        .filter(Space.horario.isnot(None))
+    if not overwrite:
+        query = query.filter(Space.horario_semanal.is_(None))
+
+    changes = []
+    unparsed = []
+    for space_id, nome, horario in query:
+        mask = parse_horario(horario)
+        if mask is None:
+            unparsed.append((space_id, nome, horario))
+            continue
+        changes.append({'id': space_id, 'horario_semanal': mask_to_bytes(mask)})
+
+    if changes and not dry_run:
+        db.session.execute(update(Space), changes)
+        db.session.commit()
+        invalidate_index()
+    return len(changes), unparsed
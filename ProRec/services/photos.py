@@ -0,0 +1,256 @@
+"""
+Photo services - Content-addressed storage of material photos.
+
+An upload is written to a temporary file in CHUNK_SIZE pieces while it is
+hashed, so a 16 MB photo never sits in memory, checked to be an image
+(only its header is decoded) and moved to
+UPLOAD_FOLDER/materials/original/<ab>/<sha256>.<ext>. The same image
+uploaded twice is stored once; files never change, so they are served
+with long cache lifetimes.
+
+The thumbnail and review-size JPEGs are made by a background job that
+hands each decode-and-resize to a process pool, off the request threads
+and outside the web process's GIL.
+"""
+import hashlib
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+from PIL import Image, ImageOps
+from services.jobs import enqueue, job_handler
+
+CHUNK_SIZE = 64 * 1024
+
+ORIGINAL = 'original'
+
+# Derivative -> longest side in pixels; derivatives are always JPEG
+DERIVATIVES = {'thumb': 320, 'review': 1280}
+JPEG_QUALITY = 82
+
+# Pillow format -> stored extension
+FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'GIF': 'gif'}
+
+# Larger images are refused before anything decodes them
+MAX_PIXELS = 40_000_000
+
+# Unreferenced files younger than this may belong to an upload in progress
+GC_GRACE_SECONDS = 24 * 3600
+
+PHOTO_DERIVATIVES = 'photo_derivatives'
+
+_NAME = re.compile(r'^([0-9a-f]{64})\.(jpg|png|gif)$')
+
+
+def photo_path(root, variant, digest, ext):
+    """Where a photo (variant 'original') or a derivative is stored."""
+    return os.path.join(root, 'materials', variant, digest[:2], f'{digest}.{ext}')
+
+
+def store_photo(stream):
+    """
+    Store an uploaded image, unless the same content is already stored.
+
+    Args:
+        stream: File-like object with the image bytes
+
+    Returns:
+        (digest, ext, width, height)
+
+    Raises:
+        ValueError: The upload is not an accepted image
+    """
+    root = current_app.config['UPLOAD_FOLDER']
+    tmp_dir = os.path.join(root, 'materials', 'tmp')
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        digest = hashlib.sha256()
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+
+        try:
+            with Image.open(tmp) as image:
+                fmt, (width, height) = image.format, image.size
+        except (OSError, Image.DecompressionBombError):
+            raise ValueError('File is not an image')
+
+        ext = FORMATS.get(fmt)
+        if ext is None or not ({ext, fmt.lower()} & current_app.config['ALLOWED_EXTENSIONS']):
+            raise ValueError('Image format must be one of '
+                             + ', '.join(sorted(current_app.config['ALLOWED_EXTENSIONS'])))
+        if width * height > MAX_PIXELS:
+            raise ValueError(f'Image is too large ({width}x{height})')
+
+        digest = digest.hexdigest()
+        path = photo_path(root, ORIGINAL, digest, ext)
+        if os.path.exists(path):
+            os.remove(tmp)
+            # Restart the grace period: until the caller commits the row
+            # referencing it, collect_garbage must not take this file
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp, path)
+        return digest, ext, width, height
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def photo_file(variant, name):
+    """
+    File to serve for a photo URL (see models.material.foto_dict).
+
+    A derivative that is not ready yet falls back to the original.
+
+    Returns:
+        (path, final) - final is False for a fallback, or None if not found
+    """
+    match = _NAME.match(name)
+    if match is None or (variant != ORIGINAL and variant not in DERIVATIVES):
+        return None
+    digest, ext = match.groups()
+    root = current_app.config['UPLOAD_FOLDER']
+
+    path = photo_path(root, variant, digest, ext)
+    if os.path.exists(path):
+        return path, True
+    if variant == ORIGINAL:
+        return None
+    for ext in FORMATS.values():
+        path = photo_path(root, ORIGINAL, digest, ext)
+        if os.path.exists(path):
+            return path, False
+    return None
+
+
+def derivatives_ready(digest):
+    """Whether every derivative of a photo has been made."""
+    root = current_app.config['UPLOAD_FOLDER']
+    return all(os.path.exists(photo_path(root, name, digest, 'jpg')) for name in DERIVATIVES)
+
+
+def enqueue_derivatives(digest, ext):
+    """Queue the making of a photo's derivatives, in the caller's transaction."""
+    if not derivatives_ready(digest):
+        enqueue(PHOTO_DERIVATIVES, {'digest': digest, 'ext': ext})
+
+
+def render(source, target, size):
+    """
+    Write `source` as a JPEG fitted in size x size pixels to `target`.
+    Runs in the render pool's processes.
+    """
+    with Image.open(source) as image:
+        image.draft('RGB', (size, size))  # JPEG: decode at a reduced scale
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size))
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        tmp = f'{target}.{os.getpid()}.tmp'
+        image.save(tmp, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+    os.replace(tmp, target)
+
+
+class RenderPool:
+    """Processes of one web or worker process that resize photos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def submit(self, fn, *args):
+        """Run fn(*args) in the pool, started (again, after a fork) on first use."""
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # spawn, not fork: the parent has threads (jobs, gthread workers)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=current_app.config['PHOTO_PROCESSES'],
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                self._pid = os.getpid()
+            return self._executor.submit(fn, *args)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown()
+            self._executor = None
+
+
+render_pool = RenderPool()
+
+
+@job_handler(PHOTO_DERIVATIVES)
+def make_derivatives(digest, ext):
+    """Make the missing derivatives of a photo, in parallel."""
+    root = current_app.config['UPLOAD_FOLDER']
+    source = photo_path(root, ORIGINAL, digest, ext)
+    if not os.path.exists(source):
+        return
+
+    futures = []
+    for name, size in DERIVATIVES.items():
+        target = photo_path(root, name, digest, 'jpg')
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            futures.append(render_pool.submit(render, source, target, size))
+    for future in futures:
+        future.result()
+
+
+def collect_garbage(referenced):
+    """
+    Delete stored photos no material refers to, with their derivatives,
+    and abandoned temporary files.
+
+    Args:
+        referenced: Set of photo digests still in use
+
+    Returns:
+        Number of photos deleted
+    """
+    root = os.path.join(current_app.config['UPLOAD_FOLDER'], 'materials')
+    cutoff = time.time() - GC_GRACE_SECONDS
+    deleted = 0
+
+    for dirpath, _, filenames in os.walk(os.path.join(root, ORIGINAL)):
+        for filename in filenames:
+            match = _NAME.match(filename)
+            path = os.path.join(dirpath, filename)
+            if match is None or match.group(1) in referenced or os.path.getmtime(path) > cutoff:
+                continue
+            digest = match.group(1)
+            for variant in DERIVATIVES:
+                derivative = photo_path(current_app.config['UPLOAD_FOLDER'], variant, digest, 'jpg')
+                if os.path.exists(derivative):
+                    os.remove(derivative)
+            os.remove(path)
+            deleted += 1
+
+    tmp_dir = os.path.join(root, 'tmp')
+    if os.path.isdir(tmp_dir):
+        for filename in os.listdir(tmp_dir):
+            path = os.path.join(tmp_dir, filename)
+            if os.path.getmtime(path) <= cutoff:
+                os.remove(path)
+    return deleted
@@ -0,0 +1,149 @@
+"""
+Points services - Awards, reversals and balances through the points ledger.
+
+User.pontos stays the O(1) current balance; every change to it goes
+through conceder_pontos(), which appends a ledger entry carrying the new
+balance in the same transaction. Historical balances are one index seek
+on (usuario_id, criado_em).
+"""
+from datetime import datetime
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+from extensions import db
+from models.user import User
+from models.points import PointsLedger, MotivoPontos
+from services.leaderboard import ledger_changed
+
+
+def conceder_pontos(user, pontos, motivo, referencia_id=None, quando=None):
+    """
+    Award (or, with negative pontos, reverse) points.
+
+    The balance is incremented in SQL, so concurrent awards never overwrite
+    each other. Callers commit.
+
+    Args:
+        user: User receiving the points
+        pontos: Points to add (negative for a reversal)
+        motivo: MotivoPontos value
+        referencia_id: Id of the related record (e.g. material)
+        quando: Entry date; only for seeding history in chronological order
+
+    Returns:
+        The new PointsLedger entry
+    """
+    if user.id is None:
+        db.session.flush()  # the increment below needs an existing row
+    user.pontos = User.pontos + pontos
+    db.session.flush()
+
+    entry = PointsLedger(
+        usuario_id=user.id,
+        delta=pontos,
+        saldo=user.pontos,  # refreshed from the row after the increment
+        motivo=motivo,
+        referencia_id=referencia_id,
+        criado_em=quando or datetime.utcnow()
+    )
+    db.session.add(entry)
+
+    # The cached leaderboards read the new entry after commit
+    db.session.info['points_awarded'] = True
+    return entry
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_awards_after_commit(session):
+    if session.info.pop('points_awarded', False):
+        ledger_changed()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_awards_after_rollback(session):
+    session.info.pop('points_awarded', None)
+
+
+def saldo_em(user_id, moment):
+    """
+    Balance of a user at a given moment.
+
+    Returns:
+        Points balance (0 before the first entry)
+    """
+    saldo = PointsLedger.query.with_entities(PointsLedger.saldo)\
+        .filter(PointsLedger.usuario_id == user_id, PointsLedger.criado_em <= moment)\
+        .order_by(PointsLedger.criado_em.desc(), PointsLedger.id.desc())\
+        .limit(1).scalar()
+    return saldo or 0
+
+
+def historico(user_id, before_id=None, limit=50):
+    """
+    Ledger entries of a user, newest first.
+
+    Args:
+        user_id: Ledger owner
+        before_id: Return entries older than this id (keyset pagination)
+        limit: Page size
+
+    Returns:
+        List of PointsLedger
+    """
+    query = PointsLedger.query.filter(PointsLedger.usuario_id == user_id)
+    if before_id is not None:
+        query = query.filter(PointsLedger.id < before_id)
+    return query.order_by(PointsLedger.id.desc()).limit(limit).all()
+
+
+def _ledger_totals():
+    """Subquery with the ledger sum of every user that has entries."""
+    return db.session.query(
+        PointsLedger.usuario_id.label('usuario_id'),
+        func.sum(PointsLedger.delta).label('total')
+    ).group_by(PointsLedger.usuario_id).subquery()
+
+
+def reconcile(fix=False):
+    """
+    Compare every User.pontos with its ledger sum in one grouped query.
+
+    Args:
+        fix: Set User.pontos to the ledger sum where they differ
+
+    Returns:
+        List of (user_id, pontos, ledger_total) with drift
+    """
+    totals = _ledger_totals()
+    ledger_total = func.coalesce(totals.c.total, 0)
+    drift = db.session.query(User.id, User.pontos, ledger_total)\
+        .outerjoin(totals, totals.c.usuario_id == User.id)\
+        .filter(User.pontos != ledger_total)\
+        .order_by(User.id)\
+        .all()
+
+    if fix and drift:
+        expected = {user_id: total for user_id, _, total in drift}
+        for user in User.query.filter(User.id.in_(expected)):
+            user.pontos = expected[user.id]
+
+    return [tuple(row) for row in drift]
+
+
+def open_balances():
+    """
+    Give users that predate the ledger an opening entry for their balance.
+
+    Returns:
+        Number of entries created; the caller commits
+    """
+    has_entries = db.session.query(PointsLedger.id)\
+        .filter(PointsLedger.usuario_id == User.id).exists()
+    users = User.query.with_entities(User.id, User.pontos)\
+        .filter(User.pontos != 0, ~has_entries).all()
+
+    db.session.add_all(
+        PointsLedger(usuario_id=user_id, delta=pontos, saldo=pontos,
+                     motivo=MotivoPontos.SALDO_INICIAL.value)
+        for user_id, pontos in users
+    )
+    return len(users)
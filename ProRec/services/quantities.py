@@ -0,0 +1,64 @@
+"""
+Quantity services - Backfill of the numeric quantity columns.
+
+Rows written before quantidade_valor/unidade existed only have the text;
+new rows are parsed on assignment (see models.quantities).
+"""
+from sqlalchemy import update
+from extensions import db
+from models.achievement import Collection
+from models.material import Material
+from models.quantities import parse_quantidade
+
+# Sample of unparsed texts reported per table
+MAX_UNPARSED = 20
+
+
+def backfill_table(model, overwrite=False, batch_size=1000):
+    """
+    Parse the quantities of one table in id-ordered batches and commit each.
+
+    parse_quantidade is memoized, so repeated texts are parsed once and each
+    batch is a single executemany UPDATE by primary key.
+
+    Args:
+        model: Material or Collection
+        overwrite: Re-parse rows that already have a unit
+
+    Returns:
+        Tuple (rows updated, sample of unparsed texts)
+    """
+    updated = 0
+    unparsed = set()
+    last_id = 0
+    while True:
+        query = model.query.with_entities(model.id, model.quantidade)\
+            .filter(model.id > last_id, model.quantidade.isnot(None))
+        if not overwrite:
+            query = query.filter(model.unidade.is_(None))
+        rows = query.order_by(model.id).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        changes = []
+        for row_id, quantidade in rows:
+            parsed = parse_quantidade(quantidade)
+            if parsed is None:
+                if len(unparsed) < MAX_UNPARSED:
+                    unparsed.add(quantidade)
+                continue
+            changes.append({'id': row_id, 'quantidade_valor': parsed[0], 'unidade': parsed[1]})
+
+        if changes:
+            db.session.execute(update(model), changes)
+            db.session.commit()
+            updated += len(changes)
+
+    return updated, unparsed
+
+
+def backfill_quantities():
+    """Fill the numeric quantity of every material and collection that lacks one."""
+    for model in (Material, Collection):
+        backfill_table(model)
@@ -0,0 +1,112 @@
+"""
+Rate limit services - Token buckets shared by all worker processes.
+
+A bucket holds up to `limit` tokens and refills at limit/per tokens a
+second; each request takes one. Buckets live in a small SQLite file
+(RATE_LIMIT_STORAGE), so every Gunicorn worker on the host sees the same
+counts, and a take is a single UPSERT ... RETURNING: atomic across
+processes, with no read-modify-write race and no lock held between
+statements. Rejections are counted per route for monitoring.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    chave TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    atualizado_em REAL NOT NULL,
+    cheio_em REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rate_limit_rejections (
+    rota TEXT PRIMARY KEY,
+    rejeicoes INTEGER NOT NULL
+);
+"""
+
+# Takes one token if at least one has refilled; no row back means rejected.
+# In DO UPDATE, bare column names are the stored bucket.
+_TAKE = """
+INSERT INTO rate_limit_buckets (chave, tokens, atualizado_em, cheio_em)
+VALUES (:chave, :limite - 1, :agora, :agora + 1 / :taxa)
+ON CONFLICT (chave) DO UPDATE SET
+    tokens = min(:limite, tokens + (:agora - atualizado_em) * :taxa) - 1,
+    atualizado_em = :agora,
+    cheio_em = :agora + (:limite - min(:limite, tokens + (:agora - atualizado_em) * :taxa) + 1) / :taxa
+WHERE min(:limite, tokens + (:agora - atualizado_em) * :taxa) >= 1
+RETURNING tokens
+"""
+
+_local = threading.local()
+
+
+def _connection(path):
+    """This thread's connection to the bucket file, reopened after a fork."""
+    key = (os.getpid(), path)
+    if getattr(_local, 'key', None) != key:
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=OFF')  # counters, not records
+        conn.executescript(SCHEMA)
+        _local.conn, _local.key = conn, key
+    return _local.conn
+
+
+def take(path, chave, rota, limit, per):
+    """
+    Take one token from a bucket, counting a rejection against `rota` if
+    it is empty.
+
+    Args:
+        path: SQLite file holding the buckets
+        chave: Bucket key (route and client)
+        rota: Route name the rejection counts against
+        limit: Bucket size (burst)
+        per: Seconds to refill a whole bucket
+
+    Returns:
+        (allowed, retry_after) - seconds until a token is available, 0 if allowed
+    """
+    conn = _connection(path)
+    taxa = limit / per
+    agora = time.time()
+    params = {'chave': chave, 'limite': limit, 'agora': agora, 'taxa': taxa}
+    if conn.execute(_TAKE, params).fetchone() is not None:
+        return True, 0
+
+    tokens, atualizado_em = conn.execute(
+        'SELECT tokens, atualizado_em FROM rate_limit_buckets WHERE chave = ?', (chave,)
+    ).fetchone()
+    conn.execute(
+        'INSERT INTO rate_limit_rejections (rota, rejeicoes) VALUES (?, 1) '
+        'ON CONFLICT (rota) DO UPDATE SET rejeicoes = rejeicoes + 1', (rota,)
+    )
+    disponivel = min(limit, tokens + (agora - atualizado_em) * taxa)
+    return False, max(1, math.ceil((1 - disponivel) / taxa))
+
+
+def rejections(path):
+    """Rejected requests per route since the last reset, most rejected first."""
+    return dict(_connection(path).execute(
+        'SELECT rota, rejeicoes FROM rate_limit_rejections ORDER BY rejeicoes DESC, rota'
+    ).fetchall())
+
+
+def reset_rejections(path):
+    """Zero the rejection counters."""
+    _connection(path).execute('DELETE FROM rate_limit_rejections')
+
+
+def purge(path):
+    """
+    Delete the buckets that have refilled, which behave like missing ones.
+
+    Returns:
+        Number of buckets deleted
+    """
+    return _connection(path).execute(
+        'DELETE FROM rate_limit_buckets WHERE cheio_em <= ?', (time.time(),)
+    ).rowcount
@@ -0,0 +1,204 @@
+"""
+Recurrence services - Lazy occurrence expansion inside query windows.
+
+Rules are parsed by models/recurrence.py. Occurrences are never stored;
+they are generated on demand and only inside the window being queried.
+"""
+import heapq
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+from sqlalchemy import or_
+from models.recurrence import iter_occurrences, parse_rrule
+
+
+@lru_cache(maxsize=4096)
+def expand(rule, dtstart, window_start, window_end):
+    """
+    Return the occurrence starts of a rule inside [window_start, window_end).
+
+    Results are cached per (rule, dtstart, window); rule edits produce a new
+    key, so the cache never needs explicit invalidation.
+    """
+    parsed = parse_rrule(rule)
+    result = []
+    for current in iter_occurrences(parsed, dtstart, window_start):
+        if current >= window_end:
+            break
+        if current >= window_start:
+            result.append(current)
+    return tuple(result)
+
+
+class Occurrence:
+    """A single (possibly recurring) event occurrence inside a query window."""
+
+    __slots__ = ('event', 'original_start', 'start', 'end', 'exception')
+
+    def __init__(self, event, original_start, exception=None):
+        self.event = event
+        self.original_start = original_start
+        self.exception = exception
+
+        duration = event.data_fim - event.data_inicio if event.data_fim else None
+        if exception is not None and exception.data_inicio:
+            self.start = exception.data_inicio
+        else:
+            self.start = original_start
+        if exception is not None and exception.data_fim:
+            self.end = exception.data_fim
+        else:
+            self.end = self.start + duration if duration is not None else None
+
+    def __lt__(self, other):
+        return (self.start, self.event.id) < (other.start, other.event.id)
+
+    @property
+    def status(self):
+        if self.exception is not None and self.exception.status:
+            return self.exception.status
+        return self.event.status
+
+    def to_dict(self, data=None):
+        """
+        Event dictionary with the fields overridden for this occurrence.
+
+        Args:
+            data: The event's dictionary to start from (e.g. from EVENT_ROWS);
+                defaults to event.to_dict()
+        """
+        data = dict(data) if data is not None else self.event.to_dict()
+        data['date'] = self.start.strftime('%d %b %Y')
+        data['date_iso'] = self.start.isoformat()
+        data['occurrence_date'] = self.original_start.isoformat()
+
+        exception = self.exception
+        if exception is not None:
+            if exception.titulo:
+                data['title'] = exception.titulo
+            if exception.descricao:
+                data['description'] = exception.descricao
+            if exception.horario:
+                data['time'] = exception.horario
+            if exception.status:
+                data['status'] = exception.status
+                data['status_display'] = self.event.get_status_display(exception.status)
+        return data
+
+
+def recurring_series_query(start, end, space_id=None, tipo=None):
+    """
+    Build the query for recurring series with occurrences possibly in [start, end).
+
+    Single events have no recorrencia_fim, so the range on
+    ix_events_recorrencia_fim only ever visits recurring series.
+    """
+    from models.event import Event
+
+    query = Event.query.filter(
+        Event.recorrencia_fim >= start,
+        Event.data_inicio < end
+    )
+    if space_id is not None:
+        query = query.filter(Event.espaco_id == space_id)
+    if tipo:
+        query = query.filter(Event.tipo == tipo)
+    return query.order_by(Event.data_inicio, Event.id)
+
+
+def _window_exceptions(event_ids, start, end):
+    """Load exceptions that move occurrences into or out of the window."""
+    from models.event import EventException
+
+    if not event_ids:
+        return {}
+
+    rows = EventException.query.filter(
+        EventException.evento_id.in_(event_ids),
+        or_(
+            (EventException.data_original >= start) & (EventException.data_original < end),
+            (EventException.data_inicio >= start) & (EventException.data_inicio < end)
+        )
+    ).all()
+    return {(row.evento_id, row.data_original): row for row in rows}
+
+
+def occurrences_between(start, end, space_id=None, tipo=None, statuses=None,
+                        limit=None, include_single=True, not_before=None):
+    """
+    Expand every event occurring inside [start, end).
+
+    Single events are returned as-is; recurring events are expanded lazily
+    inside the window only and merged in chronological order.
+
+    Args:
+        start: Inclusive window start
+        end: Exclusive window end
+        space_id: Optional space filter
+        tipo: Optional event type filter
+        statuses: Optional list of status values to keep
+        limit: Stop after this many occurrences
+        include_single: False to expand recurring series only
+        not_before: Drop occurrences starting earlier than this. Lets callers
+            keep a stable (cacheable) window while asking for "from now on"
+
+    Returns:
+        List of Occurrence objects ordered by start
+    """
+    from models.event import StatusEvento
+    from services.calendar import events_in_range_query
+
+    if statuses is None:
+        statuses = [s.value for s in StatusEvento if s != StatusEvento.CANCELADO]
+
+    series = recurring_series_query(start, end, space_id, tipo).all()
+    exceptions = _window_exceptions([e.id for e in series], start, end)
+
+    # Exceptions may move an occurrence from outside the window into it
+    moved_in = {}
+    for (event_id, original), exception in exceptions.items():
+        if not start <= original < end:
+            moved_in.setdefault(event_id, []).append(exception)
+
+    streams = []
+    if include_single:
+        single = events_in_range_query(max(start, not_before or start), end,
+                                       space_id, tipo, statuses)
+        if limit is not None:
+            single = single.limit(limit)
+        streams.append([Occurrence(event, event.data_inicio) for event in single])
+
+    for event in series:
+        occurrences = []
+        for original in expand(event.recorrencia, event.data_inicio, start, end):
+            exception = exceptions.get((event.id, original))
+            if exception is not None and exception.cancelada:
+                continue
+            occurrence = Occurrence(event, original, exception)
+            if start <= occurrence.start < end:
+                occurrences.append(occurrence)
+        for exception in moved_in.get(event.id, []):
+            if not exception.cancelada:
+                occurrences.append(Occurrence(event, exception.data_original, exception))
+        occurrences.sort()
+        streams.append(occurrences)
+
+    merged = (o for o in heapq.merge(*streams) if o.status in statuses)
+    if not_before is not None:
+        merged = (o for o in merged if o.start >= not_before)
+    if limit is not None:
+        merged = islice(merged, limit)
+    return list(merged)
+
+
+def day_window(day):
+    """Return the [start, end) datetimes covering a calendar day."""
+    if isinstance(day, datetime):
+        day = day.date()
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1)
+
+
+def today_window():
+    """Return the window covering today (local time)."""
+    return day_window(date.today())
@@ -0,0 +1,96 @@
+"""
+Replica services - Read/write routing to a read-only copy of the database.
+
+With REPLICA_DATABASE_URL set, the URL becomes the 'replica' bind and GET,
+HEAD and OPTIONS requests read through it (see extensions.RoutingSession),
+so dashboards, reports and exports use their own connection pool instead
+of competing with writers. Everything else, and any read after a write in
+the same request, goes to the primary.
+
+A client that wrote keeps reading from the primary for
+REPLICA_STICKY_SECONDS, long enough for the replica to catch up, so it
+never sees its own changes disappear. That deadline lives in the Flask
+session, so clients authenticated by a bearer token (the residuos API),
+which have no session cookie, always read the primary. Views whose reads
+must be current, like the live stream replay, call use_primary().
+
+For SQLite the replica is a second file refreshed from the primary with
+the online backup API (sync(), `flask replica sync --interval N`) and
+opened read-only, e.g. `sqlite:///file:/srv/reciclo-replica.db?mode=ro&uri=true`.
+"""
+import sqlite3
+import time
+from flask import current_app, request, session
+from sqlalchemy.engine import make_url
+from extensions import db
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Flask session key holding the time until which the client reads the primary
+STICKY_KEY = 'primary_until'
+
+
+def _token_client():
+    """Whether the request authenticates with a token instead of the session cookie."""
+    return 'Authorization' in request.headers
+
+
+def _route_request():
+    info = db.session.info
+    info.pop('wrote', None)
+    info['replica'] = (request.method in SAFE_METHODS
+                       and not _token_client()
+                       and session.get(STICKY_KEY, 0) < time.time())
+
+
+def _stick_after_write(response):
+    if db.session.info.get('wrote') and not _token_client():
+        session[STICKY_KEY] = time.time() + current_app.config['REPLICA_STICKY_SECONDS']
+    return response
+
+
+def _end_request(exc):
+    db.session.info.pop('replica', None)
+
+
+def use_primary():
+    """Read the rest of this request from the primary, e.g. before a replay."""
+    db.session.info['replica'] = False
+
+
+def init_replica(app):
+    """Route the reads of safe requests to the replica, if one is configured."""
+    if 'replica' not in app.config.get('SQLALCHEMY_BINDS', {}):
+        return
+    app.before_request(_route_request)
+    app.after_request(_stick_after_write)
+    app.teardown_request(_end_request)
+
+
+def _path(url):
+    """File path of a SQLite URL (plain or `file:...?mode=ro&uri=true`)."""
+    database = make_url(url).database or ''
+    return database[len('file:'):] if database.startswith('file:') else database
+
+
+def sync(primary_url, replica_url):
+    """
+    Copy the primary database over the replica with the SQLite backup API.
+
+    The copy runs in one read transaction on the primary, which WAL keeps
+    from blocking writers, and replaces the replica in one write
+    transaction, so replica readers see either the old or the new copy.
+
+    Returns:
+        Number of pages copied
+    """
+    source = sqlite3.connect(_path(primary_url))
+    target = sqlite3.connect(_path(replica_url))
+    try:
+        target.execute('PRAGMA busy_timeout=5000')
+        source.backup(target)
+        target.execute('PRAGMA journal_mode=WAL')
+        return source.execute('PRAGMA page_count').fetchone()[0]
+    finally:
+        target.close()
+        source.close()
@@ -0,0 +1,99 @@
+"""
+Residuo services - Stock, reservations and waiting lists of the JWT API.
+
+Stock moves with conditional UPDATEs (`quantidade_disponivel > 0`) in the
+caller's transaction, so concurrent reservations and promotions never
+hand out more units than there are. Callers commit.
+"""
+from sqlalchemy import and_, func, or_, update
+from extensions import db
+from models.residuo import FilaEsperaResiduo, ReservaResiduo, Residuo, StatusReserva, now
+
+
+def reserva_ativa(usuario_id, residuos_id):
+    """Whether an account holds an active reservation of a waste."""
+    return db.session.query(ReservaResiduo.id).filter_by(
+        usuario_id=usuario_id, residuos_id=residuos_id, status=StatusReserva.ATIVA.value
+    ).first() is not None
+
+
+def _take_unit(residuos_id):
+    """Take one available unit of a waste; False if none is left."""
+    result = db.session.execute(
+        update(Residuo)
+        .where(Residuo.id == residuos_id, Residuo.quantidade_disponivel > 0)
+        .values(quantidade_disponivel=Residuo.quantidade_disponivel - 1)
+    )
+    return result.rowcount == 1
+
+
+def devolver_unidade(residuos_id):
+    """Put one unit of a waste back in stock."""
+    db.session.execute(
+        update(Residuo)
+        .where(Residuo.id == residuos_id)
+        .values(quantidade_disponivel=Residuo.quantidade_disponivel + 1)
+    )
+
+
+def reservar(usuario_id, residuos_id):
+    """
+    Reserve one unit of a waste for an account.
+
+    Returns:
+        The new ReservaResiduo, or None if the waste is out of stock
+    """
+    if not _take_unit(residuos_id):
+        return None
+    reserva = ReservaResiduo(usuario_id=usuario_id, residuos_id=residuos_id,
+                             data_retirada=now(), status=StatusReserva.ATIVA.value)
+    db.session.add(reserva)
+    db.session.flush()
+    return reserva
+
+
+def promover_fila_espera(residuos_id):
+    """
+    Turn the head of a waste's waiting list into active reservations while
+    there is stock.
+
+    Must run in the transaction that put the stock back, so the return and
+    the promotion are committed together.
+
+    Returns:
+        Ids of the reservations created
+    """
+    promovidas = []
+    while True:
+        proximo = (FilaEsperaResiduo.query
+                   .filter_by(residuos_id=residuos_id)
+                   .order_by(FilaEsperaResiduo.enfileirado_em, FilaEsperaResiduo.id)
+                   .first())
+        if proximo is None:
+            break
+
+        # Whoever already got a reservation just leaves the queue
+        if not reserva_ativa(proximo.usuario_id, residuos_id):
+            reserva = reservar(proximo.usuario_id, residuos_id)
+            if reserva is None:
+                break
+            promovidas.append(reserva.id)
+        db.session.delete(proximo)
+        db.session.flush()
+    return promovidas
+
+
+def posicao_fila_espera(usuario_id, residuos_id):
+    """Position (1 = next) of an account in a waste's waiting list, or None."""
+    entrada = FilaEsperaResiduo.query.filter_by(usuario_id=usuario_id,
+                                                residuos_id=residuos_id).first()
+    if entrada is None:
+        return None
+
+    a_frente = db.session.query(func.count(FilaEsperaResiduo.id)).filter(
+        FilaEsperaResiduo.residuos_id == residuos_id,
+        or_(FilaEsperaResiduo.enfileirado_em < entrada.enfileirado_em,
+            and_(FilaEsperaResiduo.enfileirado_em == entrada.enfileirado_em,
+                 FilaEsperaResiduo.id < entrada.id))
+    ).scalar()
+    return a_frente + 1
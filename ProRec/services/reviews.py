@@ -0,0 +1,59 @@
+"""
+Review services - Side effects of curator reviews, run as background jobs.
+
+The review endpoints only change the material's status and enqueue these
+jobs; the producer's points, collection record and notification follow
+within seconds. Each job is enqueued with the material id as idempotency
+key, so a material is never rewarded twice.
+"""
+from extensions import db
+from models.material import Material, StatusMaterial
+from models.achievement import Collection
+from models.points import MotivoPontos
+from models.user import TipoNotificacao
+from services.jobs import enqueue, job_handler
+from services.notifications import notify
+from services.points import conceder_pontos
+
+MATERIAL_APPROVED = 'material_approved'
+MATERIAL_REJECTED = 'material_rejected'
+
+
+def enqueue_review_effects(material):
+    """Queue the side effects of a review, in the reviewing transaction."""
+    tipo = MATERIAL_APPROVED if material.status == StatusMaterial.APPROVED.value else MATERIAL_REJECTED
+    enqueue(tipo, {'material_id': material.id}, chave=f'{tipo}:{material.id}')
+
+
+@job_handler(MATERIAL_APPROVED)
+def reward_approved_material(material_id):
+    """Award the points, record the collection and notify the producer."""
+    material = db.session.get(Material, material_id)
+    if material is None or material.produtor is None:
+        return
+    producer = material.produtor
+    points = material.pontos_concedidos
+
+    conceder_pontos(producer, points, MotivoPontos.MATERIAL_APROVADO.value,
+                    referencia_id=material.id)
+    notify(producer.id, TipoNotificacao.INFO.value, 'Material aprovado',
+           f'Seu material "{material.nome}" foi aprovado e rendeu {points} pontos.')
+    db.session.add(Collection(
+        material_nome=material.nome,
+        categoria=material.categoria,
+        quantidade=material.quantidade,
+        pontos=points,
+        feedback=material.feedback,
+        produtor_id=producer.id,
+        material_id=material.id
+    ))
+
+
+@job_handler(MATERIAL_REJECTED)
+def notify_rejected_material(material_id):
+    """Tell the producer why the material was rejected."""
+    material = db.session.get(Material, material_id)
+    if material is None or material.produtor_id is None:
+        return
+    notify(material.produtor_id, TipoNotificacao.INFO.value, 'Material reprovado',
+           f'Seu material "{material.nome}" foi reprovado: {material.feedback}')
@@ -0,0 +1,260 @@
+"""
+Scheduling services - Space booking conflicts and free slot search.
+
+Bookings are read with an SQL range predicate on (espaco_id, data_inicio).
+Because event duration is capped at MAX_EVENT_DURATION, every booking that
+can overlap [start, end) starts inside [start - MAX_EVENT_DURATION, end), so
+the lookup is a bounded index range scan no matter how much history exists.
+"""
+import re
+from bisect import bisect_left
+from datetime import datetime, time, timedelta
+from models.event import Event, StatusEvento
+from models.opening_hours import day_mask, day_open_ranges
+from services.recurrence import Occurrence, expand, occurrences_between
+
+# Duration assumed for events without data_fim
+DEFAULT_EVENT_DURATION = timedelta(hours=1)
+
+# Longest event accepted; bounds the booking range scan
+MAX_EVENT_DURATION = timedelta(days=7)
+
+# How far ahead the occurrences of a new recurring event are checked
+RECURRING_CHECK_HORIZON = timedelta(days=366)
+
+ACTIVE_STATUSES = [s.value for s in StatusEvento if s != StatusEvento.CANCELADO]
+
+_TIME_RANGE_RE = re.compile(
+    r'(\d{1,2})(?:[:h](\d{2}))?h?\s*(?:-|–|às|as|a|até)\s*(\d{1,2})(?:[:h](\d{2}))?h?',
+    re.IGNORECASE
+)
+
+
+def parse_time_range(text):
+    """
+    Parse a free-text time range such as '9:00 - 16:00' or '8h às 12h'.
+
+    Returns:
+        Tuple (start_time, end_time), or None if text has no usable range
+    """
+    if not text:
+        return None
+
+    match = _TIME_RANGE_RE.search(text)
+    if not match:
+        return None
+
+    start_hour, start_minute, end_hour, end_minute = match.groups()
+    try:
+        start = time(int(start_hour), int(start_minute or 0))
+        end = time(int(end_hour), int(end_minute or 0))
+    except ValueError:
+        return None
+    return start, end
+
+
+def effective_end(start, end):
+    """Return the end of a booking, applying the default duration if unset."""
+    return end if end else start + DEFAULT_EVENT_DURATION
+
+
+class Booking:
+    """A time interval during which a space is occupied."""
+
+    __slots__ = ('start', 'end', 'occurrence')
+
+    def __init__(self, start, end, occurrence):
+        self.start = start
+        self.end = end
+        self.occurrence = occurrence
+
+    def overlaps(self, start, end):
+        return self.start < end and start < self.end
+
+
+def space_bookings(space_id, start, end, exclude_event_id=None):
+    """
+    List the bookings of a space overlapping [start, end), ordered by start.
+
+    Args:
+        space_id: Space to inspect
+        start: Inclusive window start
+        end: Exclusive window end
+        exclude_event_id: Event being edited, ignored in the result
+
+    Returns:
+        List of Booking
+    """
+    lower = start - MAX_EVENT_DURATION
+
+    query = Event.query.filter(
+        Event.espaco_id == space_id,
+        Event.data_inicio >= lower,
+        Event.data_inicio < end,
+        Event.status.in_(ACTIVE_STATUSES),
+        Event.recorrencia.is_(None)
+    )
+    if exclude_event_id is not None:
+        query = query.filter(Event.id != exclude_event_id)
+
+    bookings = []
+    for event in query:
+        booking = Booking(event.data_inicio, effective_end(event.data_inicio, event.data_fim),
+                          Occurrence(event, event.data_inicio))
+        if booking.overlaps(start, end):
+            bookings.append(booking)
+
+    for occurrence in occurrences_between(lower, end, space_id=space_id,
+                                          statuses=ACTIVE_STATUSES, include_single=False):
+        if occurrence.event.id == exclude_event_id:
+            continue
+        booking = Booking(occurrence.start, effective_end(occurrence.start, occurrence.end),
+                          occurrence)
+        if booking.overlaps(start, end):
+            bookings.append(booking)
+
+    bookings.sort(key=lambda b: (b.start, b.end))
+    return bookings
+
+
+def proposed_intervals(event):
+    """
+    Return the (start, end) intervals an event would occupy.
+
+    Recurring events are expanded up to RECURRING_CHECK_HORIZON ahead.
+    """
+    duration = effective_end(event.data_inicio, event.data_fim) - event.data_inicio
+
+    if not event.recorrencia:
+        return [(event.data_inicio, event.data_inicio + duration)]
+
+    horizon = event.data_inicio + RECURRING_CHECK_HORIZON
+    if event.recorrencia_fim and event.recorrencia_fim < horizon:
+        horizon = event.recorrencia_fim + timedelta(seconds=1)
+    starts = expand(event.recorrencia, event.data_inicio, event.data_inicio, horizon)
+    return [(start, start + duration) for start in starts]
+
+
+def find_conflicts(space_id, intervals, exclude_event_id=None):
+    """
+    Find existing bookings that overlap any of the proposed intervals.
+
+    All bookings for the span covered by intervals are loaded once and
+    matched with a bisect per proposed interval.
+
+    Returns:
+        List of conflicting Booking, ordered by start, without duplicates
+    """
+    if not intervals or space_id is None:
+        return []
+
+    intervals = sorted(intervals)
+    span_end = max(end for _, end in intervals)
+    bookings = space_bookings(space_id, intervals[0][0], span_end, exclude_event_id)
+    starts = [b.start for b in bookings]
+
+    conflicts = {}
+    for start, end in intervals:
+        index = bisect_left(starts, end)
+        while index > 0:
+            index -= 1
+            booking = bookings[index]
+            if booking.start < start - MAX_EVENT_DURATION:
+                break
+            if booking.overlaps(start, end):
+                conflicts[id(booking)] = booking
+
+    return sorted(conflicts.values(), key=lambda b: (b.start, b.end))
+
+
+def _bookable_windows(day, weekly_mask, day_start, day_end):
+    """Windows of a day in which a space can be booked."""
+    midnight = datetime.combine(day, time.min)
+    if weekly_mask is None:
+        return [(datetime.combine(day, day_start), datetime.combine(day, day_end))]
+    return [(midnight + timedelta(hours=start), midnight + timedelta(hours=end))
+            for start, end in day_open_ranges(day_mask(weekly_mask, day.weekday()))]
+
+
+def free_slots(space_id, week_start, day_start=time(8, 0), day_end=time(18, 0),
+               min_duration=timedelta(minutes=30), weekly_mask=None):
+    """
+    Compute the free slots of a space for the 7 days starting at week_start.
+
+    Args:
+        space_id: Space to inspect
+        week_start: Monday of the week (date)
+        day_start: Daily time the space becomes bookable
+        day_end: Daily time the space stops being bookable
+        min_duration: Gaps shorter than this are omitted
+        weekly_mask: Opening hours of the space; when given it replaces
+            day_start/day_end
+
+    Returns:
+        List of (start, end) datetimes
+    """
+    week_begin = datetime.combine(week_start, time.min)
+    bookings = space_bookings(space_id, week_begin, week_begin + timedelta(days=7))
+
+    slots = []
+    for offset in range(7):
+        day = week_start + timedelta(days=offset)
+        for cursor, close in _bookable_windows(day, weekly_mask, day_start, day_end):
+            for booking in bookings:
+                if booking.end <= cursor or booking.start >= close:
+                    continue
+                if booking.start - cursor >= min_duration:
+                    slots.append((cursor, booking.start))
+                cursor = max(cursor, booking.end)
+
+            if close - cursor >= min_duration:
+                slots.append((cursor, close))
+
+    return slots
+
+
+def apply_event_schedule(event, data):
+    """
+    Apply the date, end, time and recurrence fields of a request to an event.
+
+    When no explicit 'end' is sent, a free-text 'time' like '9:00 - 16:00'
+    fills in the structured start/end times.
+
+    Returns:
+        Error message, or None if the schedule is valid
+    """
+    date_value = data.get('date')
+    try:
+        if date_value:
+            event.data_inicio = datetime.fromisoformat(date_value)
+        if 'end' in data:
+            event.data_fim = datetime.fromisoformat(data['end']) if data['end'] else None
+    except ValueError:
+        return 'Invalid date, use ISO format'
+
+    if event.data_inicio is None:
+        return 'Field date is required'
+
+    if 'time' in data:
+        event.horario = data['time']
+        times = parse_time_range(data['time']) if 'end' not in data else None
+        if times:
+            start_time, end_time = times
+            if date_value and len(date_value) == 10:
+                event.data_inicio = datetime.combine(event.data_inicio.date(), start_time)
+            event.data_fim = datetime.combine(event.data_inicio.date(), end_time)
+            if event.data_fim <= event.data_inicio:
+                event.data_fim += timedelta(days=1)
+
+    if event.data_fim is not None:
+        if event.data_fim <= event.data_inicio:
+            return 'Field end must be after date'
+        if event.data_fim - event.data_inicio > MAX_EVENT_DURATION:
+            return f'Events cannot last more than {MAX_EVENT_DURATION.days} days'
+
+    try:
+        event.set_recorrencia(data['recurrence'] if 'recurrence' in data else event.recorrencia)
+    except ValueError as e:
+        return f'Invalid recurrence: {e}'
+
+    return None
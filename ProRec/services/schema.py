@@ -0,0 +1,81 @@
+"""
+Schema services - In-place upgrade of databases made by earlier versions.
+
+db.create_all() creates missing tables, with their indexes, but never
+changes a table that already exists. Columns added to existing tables are
+listed in COLUMNS, each with the data step that fills it on old rows, and
+upgrade() adds the missing ones with ALTER TABLE ... ADD COLUMN. Every step
+checks what the database already has, so it can run any number of times.
+"""
+from sqlalchemy import inspect, text
+from extensions import db
+from services.notifications import recount_unread
+from services.opening_hours import parse_space_hours
+from services.quantities import backfill_quantities
+
+# (table, column, SQLite column definition, data step or None), oldest first.
+# SQLite needs a constant DEFAULT to add a NOT NULL column.
+COLUMNS = [
+    ('users', 'notificacoes_nao_lidas', 'INTEGER NOT NULL DEFAULT 0', recount_unread),
+    ('spaces', 'horario_semanal', 'BLOB', parse_space_hours),
+    ('events', 'recorrencia', 'VARCHAR(200)', None),  # NULL: existing events do not repeat
+    ('events', 'recorrencia_fim', 'DATETIME', None),
+    ('materials', 'quantidade_valor', 'FLOAT', backfill_quantities),
+    ('materials', 'unidade', 'VARCHAR(5)', backfill_quantities),
+    ('collections', 'quantidade_valor', 'FLOAT', backfill_quantities),
+    ('collections', 'unidade', 'VARCHAR(5)', backfill_quantities),
+    ('materials', 'foto_hash', 'VARCHAR(64)', None),
+    ('materials', 'foto_formato', 'VARCHAR(4)', None),
+    ('materials', 'foto_largura', 'INTEGER', None),
+    ('materials', 'foto_altura', 'INTEGER', None),
+    ('materials_archive', 'foto_hash', 'VARCHAR(64)', None),
+    ('materials_archive', 'foto_formato', 'VARCHAR(4)', None),
+    ('materials_archive', 'foto_largura', 'INTEGER', None),
+    ('materials_archive', 'foto_altura', 'INTEGER', None),
+    ('users', 'calendario_token', 'VARCHAR(64)', None),  # NULL: no feed token yet
+]
+
+
+def missing_columns():
+    """Listed columns the primary database does not have yet, as 'table.column'."""
+    inspector = inspect(db.engine)
+    tables = set(inspector.get_table_names())
+    missing = []
+    for table, column, _, _ in COLUMNS:
+        if table in tables and column not in {c['name'] for c in inspector.get_columns(table)}:
+            missing.append(f'{table}.{column}')
+    return missing
+
+
+def upgrade():
+    """
+    Bring the primary database up to the models and commit.
+
+    Creates missing tables, adds missing columns, creates missing indexes of
+    existing tables, then runs the data steps of the columns just added.
+
+    Returns:
+        List of the columns added, as 'table.column'
+    """
+    db.create_all(bind_key=None)  # Not the read-only replica bind
+
+    added = missing_columns()
+    steps = []
+    with db.engine.begin() as connection:
+        for table, column, definition, step in COLUMNS:
+            if f'{table}.{column}' in added:
+                connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {definition}'))
+                if step is not None and step not in steps:
+                    steps.append(step)
+        inspector = inspect(connection)
+        for table in db.metadata.sorted_tables:
+            columns = {c['name'] for c in inspector.get_columns(table.name)}
+            for index in table.indexes:
+                # An index on a column not listed in COLUMNS yet waits for it
+                if {c.name for c in index.columns} <= columns:
+                    index.create(connection, checkfirst=True)
+
+    for step in steps:
+        step()
+    db.session.commit()
+    return added
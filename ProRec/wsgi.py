@@ -0,0 +1,35 @@
+"""
+WSGI entry point for production: `gunicorn -c gunicorn.conf.py wsgi:application`.
+
+Serves the dashboard and the residuos JWT API, which is one of its
+blueprints.
+"""
+from flask.cli import load_dotenv
+
+load_dotenv()
+
+from app import create_app  # noqa: E402 - after .env is loaded
+from extensions import db  # noqa: E402
+
+application = create_app()
+
+
+def after_fork():
+    """
+    Drop the database connections inherited from the master process.
+
+    Pools are copied by fork; close=False leaves the parent's sockets and
+    file handles alone and lets each worker open its own.
+    """
+    with application.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def before_exit(timeout):
+    """Stop this worker's job threads, waiting up to `timeout` seconds for running jobs."""
+    from services.jobs import pool
+    from services.photos import render_pool
+    pool.stop()
+    pool.join(timeout)
+    render_pool.shutdown()